@@ -18,9 +18,12 @@ from startup.tests import test_list
 #	Display usage information in the command line.
 #  -v or --version
 #	Display Debreate version in the command line & exit
+#  -p or --profile-startup
+#	Print import & startup phase times after the main window is shown.
 solo_args = (
 	(u'h', u'help'),
 	(u'v', u'version'),
+	(u'p', u'profile-startup'),
 )
 
 ## Value args
@@ -30,9 +33,18 @@ solo_args = (
 #	or equivalent numeric values of 0-4. Default is 'error' (3).
 #  -i or --log-interval
 #	Set the refresh interval, in seconds, for updating the log window.
+#  -j or --log-json
+#	Also write log messages as JSON lines to a file.
+#  -p or --profile-startup
+#	Same as solo argument, & also write cProfile statistics to a file.
+#  -b or --startup-budget
+#	Maximum startup time, in seconds, before a warning is shown when profiling.
 value_args = (
 	(u'l', u'log-level'),
 	(u'i', u'log-interval'),
+	(u'j', u'log-json'),
+	(u'p', u'profile-startup'),
+	(u'b', u'startup-budget'),
 )
 
 cmds = (
@@ -17,6 +17,9 @@ COLOR_tooltip = Color(255, 255, 0)
 ## Color used for warnings (red-orange)
 COLOR_warn = Color(255, 143, 115)
 
+## Background color of files modified after they were added (light yellow)
+COLOR_changed = Color(255, 244, 179)
+
 ## Color used for errors (red)
 COLOR_error = Color(255, 0, 0)
 
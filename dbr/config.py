@@ -8,18 +8,17 @@
 # See: docs/LICENSE.txt
 
 
-import os, sys, wx
+import atexit, codecs, os, sys, threading, time, wx
 
 from dbr.functions		import GetBoolean
+from dbr.functions		import GetInteger
 from dbr.functions		import GetIntTuple
 from dbr.functions		import IsIntTuple
 from dbr.language		import GT
 from dbr.log			import Logger
 from fileio.fileio		import ReadFile
-from fileio.fileio		import WriteFile
 from globals.paths		import PATH_home
 from globals.strings	import GS
-from globals.strings	import TextIsEmpty
 
 
 ## Configuration codes
@@ -51,15 +50,269 @@ default_config = u'{}/config'.format(default_config_dir)
 
 # name = (function, default value)
 default_config_values = {
+	u'autosave': (GetInteger, 60),
 	u'center': (GetBoolean, True),
 	u'maximize': (GetBoolean, False),
 	u'position': (GetIntTuple, (0, 0)),
 	u'size': (GetIntTuple, (800, 640)),
 	u'workingdir': (GS, PATH_home),
 	u'tooltips': (GetBoolean, True),
+	u'watchfiles': (GetBoolean, True),
 }
 
 
+## Configuration file parsed once & kept in memory
+#
+#  Values are read from memory. The file is parsed again only if its
+#  modification time or size has changed, checked at most once per
+#  interval. Written values are kept in memory & saved to the file after
+#  a delay, so values written together are saved at once. The file is
+#  written to a temporary file & renamed, so it is never left partially
+#  written.
+class ConfigStore:
+	## Constructor
+	#
+	#  \param path
+	#	Absolute path of configuration file
+	#  \param writeDelay
+	#	Seconds to wait after a value is set before writing file
+	#  \param checkInterval
+	#	Minimum seconds between checks for changes to file
+	def __init__(self, path, writeDelay=0.5, checkInterval=1.0):
+		self.Path = path
+		self.WriteDelay = writeDelay
+		self.CheckInterval = checkInterval
+
+		## Lines of configuration text, including header & unknown lines
+		self.Lines = []
+
+		## Keys mapped to index of their line
+		self.Index = {}
+
+		## Keys mapped to values set but not yet written
+		self.Pending = {}
+
+		## Modification time & size of file when it was last parsed or written
+		self.FileState = None
+
+		## Time of last check for changes
+		self.CheckTime = None
+
+		self.Lock = threading.RLock()
+		self.Timer = None
+
+
+	## Checks if file has changed & parses it again if it has
+	def CheckFile(self):
+		now = time.time()
+
+		if self.CheckTime != None and now - self.CheckTime < self.CheckInterval:
+			return
+
+		self.CheckTime = now
+
+		if self.GetFileState() != self.FileState:
+			self.Load()
+
+
+	## Checks if configuration file exists or has values waiting to be written
+	def Exists(self):
+		with self.Lock:
+			self.CheckFile()
+
+			return self.FileState != None or bool(self.Pending)
+
+
+	## Writes values that have been set to file
+	#
+	#  \return
+	#	\b \e True if file was written or nothing needed to be written
+	def Flush(self):
+		with self.Lock:
+			if self.Timer:
+				self.Timer.cancel()
+				self.Timer = None
+
+			if not self.Pending:
+				return True
+
+			# Apply changes to file's current contents
+			if self.GetFileState() != self.FileState:
+				self.Load()
+
+			conf_dir = os.path.dirname(self.Path)
+			temp_path = u'{}.tmp'.format(self.Path)
+
+			try:
+				if not os.path.isdir(conf_dir):
+					os.makedirs(conf_dir)
+
+				FILE_BUFFER = codecs.open(temp_path, u'w', encoding=u'utf-8')
+
+				try:
+					FILE_BUFFER.write(u'\n'.join(self.Lines).strip(u' \t\n\r'))
+
+				finally:
+					FILE_BUFFER.close()
+
+				os.rename(temp_path, self.Path)
+
+			except (IOError, OSError) as e:
+				Logger.Error(__name__, u'{}: {}'.format(GT(u'Could not write configuration'), e))
+
+				if os.path.isfile(temp_path):
+					os.remove(temp_path)
+
+				return False
+
+			self.Pending = {}
+			self.FileState = self.GetFileState()
+			self.CheckTime = time.time()
+
+			Logger.Debug(__name__, u'Wrote configuration file: {}'.format(self.Path))
+
+			return True
+
+
+	## Retrieves raw value of a key
+	#
+	#  \param key
+	#	Key to retrieve
+	#  \return
+	#	\b \e Unicode value or \b \e None if key is not in configuration
+	def Get(self, key):
+		with self.Lock:
+			self.CheckFile()
+
+			if key not in self.Index:
+				return None
+
+			return self.Lines[self.Index[key]].split(u'=', 1)[1]
+
+
+	## Retrieves modification time & size of file
+	#
+	#  \return
+	#	\b \e Tuple or \b \e None if file does not exist
+	def GetFileState(self):
+		try:
+			f_stat = os.stat(self.Path)
+
+			return (f_stat.st_mtime, f_stat.st_size,)
+
+		except OSError:
+			return None
+
+
+	## Checks if configuration contains any text
+	def IsEmpty(self):
+		with self.Lock:
+			self.CheckFile()
+
+			return not [L for L in self.Lines if L.strip()]
+
+
+	## Parses configuration file
+	#
+	#  Values that have been set but not written are kept.
+	def Load(self):
+		with self.Lock:
+			self.FileState = self.GetFileState()
+			self.CheckTime = time.time()
+
+			self.Lines = []
+			self.Index = {}
+
+			if self.FileState != None:
+				Logger.Debug(__name__, u'Reading configuration file: {}'.format(self.Path))
+
+				conf_text = ReadFile(self.Path)
+				if conf_text:
+					self.Lines = conf_text.split(u'\n')
+
+			for INDEX, LINE in enumerate(self.Lines):
+				if u'=' in LINE:
+					key = LINE.split(u'=', 1)[0]
+
+					# First definition of a key is used
+					if key not in self.Index:
+						self.Index[key] = INDEX
+
+			for KEY in self.Pending:
+				self.SetLine(KEY, self.Pending[KEY])
+
+
+	## Sets a value & schedules writing file
+	#
+	#  \param key
+	#	Key to set
+	#  \param value
+	#	\b \e Unicode value
+	def Set(self, key, value):
+		with self.Lock:
+			self.CheckFile()
+
+			self.Pending[key] = value
+			self.SetLine(key, value)
+
+			# Values set in a row are written together
+			if self.Timer:
+				self.Timer.cancel()
+
+			self.Timer = threading.Timer(self.WriteDelay, self.Flush)
+			self.Timer.daemon = True
+			self.Timer.start()
+
+
+	## Sets line of a key in configuration text
+	def SetLine(self, key, value):
+		line = u'{}={}'.format(key, value)
+
+		if key in self.Index:
+			self.Lines[self.Index[key]] = line
+			return
+
+		if not self.Lines:
+			self.Lines.append(u'[CONFIG-{}.{}]'.format(GS(config_version[0]), GS(config_version[1])))
+
+		self.Index[key] = len(self.Lines)
+		self.Lines.append(line)
+
+
+## Configuration file paths mapped to dbr.config.ConfigStore instances
+config_stores = {}
+
+
+## Writes values that have not been written to all configuration files
+def FlushConfig():
+	success = True
+
+	for STORE in config_stores.values():
+		if not STORE.Flush():
+			success = False
+
+	return success
+
+
+# Values set shortly before exit are not lost
+atexit.register(FlushConfig)
+
+
+## Retrieves configuration store for a file
+#
+#  \param conf
+#	\b \e unicode|str : Path of configuration file
+#  \return
+#	dbr.config.ConfigStore instance
+def GetConfigStore(conf=default_config):
+	conf = os.path.abspath(conf)
+
+	if conf not in config_stores:
+		config_stores[conf] = ConfigStore(conf)
+
+	return config_stores[conf]
+
+
 ## TODO: Doxygen
 def SetDefaultConfigKey(key, value):
 	global default_config_values
@@ -76,16 +329,18 @@ def SetDefaultConfigKey(key, value):
 	default_config_values[key] = (func, value,)
 
 
-## Opens configuration & searches for key
+## Searches configuration for key
+#
+#  Configuration is read from memory, see dbr.config.ConfigStore.
 #
 #  \param k_name
 #		\b \e unicode|str : Key to search for
 #  \return
 #		Value of key if found, otherwise ConfCode
 def ReadConfig(k_name, conf=default_config):
-	Logger.Debug(__name__, GT(u'Reading configuration file: {}'.format(conf)), newline=True)
+	store = GetConfigStore(conf)
 
-	if not os.path.isfile(conf):
+	if not store.Exists():
 		#Logger.Warning(__name__, u'Configuration file does not exist: {}'.format(conf))
 		return ConfCode.FILE_NOT_FOUND
 
@@ -98,26 +353,15 @@ def ReadConfig(k_name, conf=default_config):
 		#Logger.Warning(__name__, u'Undefined key, not attempting to retrieve value: {}'.format(k_name))
 		return ConfCode.KEY_NOT_DEFINED
 
-	conf_lines = ReadFile(conf)
-	if conf_lines:
-		conf_lines = conf_lines.split(u'\n')
-
-		for L in conf_lines:
-			if u'=' in L:
-				key = L.split(u'=')
-				value = key[1]
-				key = key[0]
-
-				if k_name == key:
-					value = default_config_values[key][0](value)
+	if not store.IsEmpty():
+		value = store.Get(k_name)
 
-					#Logger.Debug(__name__, u'Retrieved key-value: {}={}, value type: {}'.format(key, value, type(value)))
-					return value
+		if value != None:
+			return default_config_values[k_name][0](value)
 
-		if k_name in default_config_values:
-			#Logger.Debug(__name__, u'Configuration does not contain key, retrieving default value: {}'.format(k_name))
+		#Logger.Debug(__name__, u'Configuration does not contain key, retrieving default value: {}'.format(k_name))
 
-			return GetDefaultConfigValue(k_name)
+		return GetDefaultConfigValue(k_name)
 
 	return ConfCode.KEY_NO_EXIST
 
@@ -159,52 +403,14 @@ def WriteConfig(k_name, k_value, conf=default_config, sectLabel=None):
 	else:
 		k_value = GS(k_value)
 
-	conf_text = wx.EmptyString
-
-	# Save current config to buffer
-	if os.path.exists(conf):
-		if not os.path.isfile(conf):
-			print(u'{}: {}: {}'.format(GT(u'Error'), GT(u'Cannot open config for writing, directory exists'), conf))
-			return ConfCode.ERR_WRITE
-
-		conf_text = ReadFile(conf)
-
-		# FIXME: ReadFile returns None type if config file exists but is empty
-		if conf_text == None:
-			conf_text = u''
-
-	else:
-		conf_text = u'[CONFIG-{}.{}]'.format(GS(config_version[0]), GS(config_version[1]))
-
-	conf_lines = conf_text.split(u'\n')
-
-	key_exists = False
-	for L in conf_lines:
-		l_index = conf_lines.index(L)
-		if u'=' in L:
-			key = L.split(u'=')[0]
-
-			if k_name == key:
-				key_exists = True
-
-				conf_lines[l_index] = u'{}={}'.format(k_name, k_value)
-
-	if not key_exists:
-		conf_lines.append(u'{}={}'.format(k_name, k_value))
-
-	conf_text = u'\n'.join(conf_lines)
-
-	if TextIsEmpty(conf_text):
-		print(u'{}: {}'.format(GT(u'Warning'), GT(u'Not writing empty text to configuration')))
+	if os.path.exists(conf) and not os.path.isfile(conf):
+		print(u'{}: {}: {}'.format(GT(u'Error'), GT(u'Cannot open config for writing, directory exists'), conf))
 		return ConfCode.ERR_WRITE
 
-	# Actual writing to configuration
-	WriteFile(conf, conf_text)
-
-	if os.path.isfile(conf):
-		return ConfCode.SUCCESS
+	# Value is written to file after a short delay, together with other values set meanwhile
+	GetConfigStore(conf).Set(k_name, k_value)
 
-	return ConfCode.ERR_WRITE
+	return ConfCode.SUCCESS
 
 
 ## Function used to create the inital configuration file
@@ -220,6 +426,9 @@ def InitializeConfig(conf=default_config):
 		if exit_code != ConfCode.SUCCESS:
 			return exit_code
 
+	if not GetConfigStore(conf).Flush():
+		return ConfCode.ERR_WRITE
+
 	return ConfCode.SUCCESS
 
 
@@ -230,7 +439,7 @@ def InitializeConfig(conf=default_config):
 #  \return
 #		Default value for the key or ConfCode.KEY_NO_EXIST
 def GetDefaultConfigValue(key):
-	if key in default_config:
+	if key in default_config_values:
 		return default_config_values[key][1]
 
 	return ConfCode.KEY_NO_EXIST
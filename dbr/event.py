@@ -16,6 +16,11 @@ ChangePageEvent = NewCommandEvent()
 EVT_CHANGE_PAGE = ChangePageEvent[1]
 ChangePageEvent = ChangePageEvent[0]
 
+## Event to process when wiz.wizard.PageProxy has constructed its page
+PageConstructedEvent = NewCommandEvent()
+EVT_PAGE_CONSTRUCTED = PageConstructedEvent[1]
+PageConstructedEvent = PageConstructedEvent[0]
+
 ## Event to post when dbr.timer.DebreateTimer.Stop is called
 TimerStopEvent = NewCommandEvent()
 EVT_TIMER_STOP = TimerStopEvent[1]
@@ -25,3 +30,43 @@ TimerStopEvent = TimerStopEvent[0]
 RefreshLogEvent = NewCommandEvent()
 EVT_REFRESH_LOG = RefreshLogEvent[1]
 RefreshLogEvent = RefreshLogEvent[0]
+
+## Event to post when input.filelist.FileList background refresh has new file status
+RefreshFileListEvent = NewCommandEvent()
+EVT_REFRESH_FILE_LIST = RefreshFileListEvent[1]
+RefreshFileListEvent = RefreshFileListEvent[0]
+
+## Event to post when input.filelist.FileList directory watcher detects changed files
+FileStatusChangedEvent = NewCommandEvent()
+EVT_FILE_STATUS_CHANGED = FileStatusChangedEvent[1]
+FileStatusChangedEvent = FileStatusChangedEvent[0]
+
+## Event to post when ui.tree.DirectoryTree has listed a directory in background
+DirectoryListedEvent = NewCommandEvent()
+EVT_DIRECTORY_LISTED = DirectoryListedEvent[1]
+DirectoryListedEvent = DirectoryListedEvent[0]
+
+## Event to post when ui.tree.DirectoryTree has retrieved file types in background
+TreeItemTypesEvent = NewCommandEvent()
+EVT_TREE_ITEM_TYPES = TreeItemTypesEvent[1]
+TreeItemTypesEvent = TreeItemTypesEvent[0]
+
+## Event to post when globals.search.FilenameIndex has finished building in background
+SearchIndexReadyEvent = NewCommandEvent()
+EVT_SEARCH_INDEX_READY = SearchIndexReadyEvent[1]
+SearchIndexReadyEvent = SearchIndexReadyEvent[0]
+
+## Event to post when input.filelist.FileList finds colliding install paths in background
+InstallCollisionsEvent = NewCommandEvent()
+EVT_INSTALL_COLLISIONS = InstallCollisionsEvent[1]
+InstallCollisionsEvent = InstallCollisionsEvent[0]
+
+## Event to post when input.filelist.FileList has read a batch of files to load in background
+FileRecordsReadEvent = NewCommandEvent()
+EVT_FILE_RECORDS_READ = FileRecordsReadEvent[1]
+FileRecordsReadEvent = FileRecordsReadEvent[0]
+
+## Event to post when wizbin.files.Page has collected a batch of files to add in background
+FilesCollectedEvent = NewCommandEvent()
+EVT_FILES_COLLECTED = FilesCollectedEvent[1]
+FilesCollectedEvent = FilesCollectedEvent[0]
@@ -6,9 +6,9 @@
 # See: docs/LICENSE.txt
 
 
-import os, sys
+import atexit, gzip, json, os, shutil, sys, threading, time
+from collections import deque
 
-from fileio.fileio		import AppendFile
 from globals.dateinfo	import GetDate
 from globals.dateinfo	import GetTime
 from globals.dateinfo	import dtfmt
@@ -23,12 +23,73 @@ class LogLevel:
 	INFO, WARN, ERROR, DEBUG, TEST = range(5)
 
 
+## A logged message
+#
+#  Records of recent messages are kept in memory by dbr.log.DebreateLogger,
+#  so they can be displayed & filtered without reading the log file.
+class LogRecord:
+	## Constructor
+	#
+	#  \param level
+	#	\b \e Integer message level (see dbr.log.LogLevel)
+	#  \param module
+	#	Name of module where message originates
+	#  \param message
+	#	Formatted message text
+	#  \param details
+	#	\b \e Tuple of detail lines
+	def __init__(self, level, module, message, details=()):
+		self.Time = time.time()
+		self.Level = level
+		self.Module = module
+		self.Message = message
+		self.Details = details
+
+		## Sequence number of record in logging session
+		self.Index = None
+
+
+	## Formats record as text written to log file & terminal
+	def Format(self):
+		text = u'{}: [{}] {}'.format(DebreateLogger.LogLevelList[self.Level].upper(), self.Module,
+				self.Message)
+
+		for ITEM in self.Details:
+			text += u'\n  • {}'.format(ITEM)
+
+		return text
+
+
+	## Formats record as a JSON object on a single line
+	def FormatJSON(self):
+		return json.dumps({
+			u'time': self.Time,
+			u'level': DebreateLogger.LogLevelList[self.Level],
+			u'module': self.Module,
+			u'message': self.Message,
+			u'details': list(self.Details),
+			}, sort_keys=True)
+
+
 ## A log class for outputting messages
 #
 #  TODO: Add 'quiet' (0) log level.
 #
 #  A log that will output messages to the terminal &
 #	a log text file.
+#
+#  The log file is kept open for appending. Messages are buffered in
+#  memory & written by a background thread when the buffer grows past
+#  a size threshold or after a time interval. Errors & closing the log
+#  write the buffer immediately.
+#
+#  When the log file grows past a size limit it is compressed to a
+#  numbered archive & a new file is started. Old logs & archives are
+#  deleted at startup by count & age.
+#
+#  The most recent messages are also kept as dbr.log.LogRecord instances
+#  in a fixed-size buffer & can optionally be written as JSON lines to a
+#  second file.
 class DebreateLogger:
 	LogLevelList = {
 		LogLevel.INFO: u'info',
@@ -44,18 +105,78 @@ class DebreateLogger:
 	#	\b \e int|str : The level at which messages will be output (default is 2 (ERROR))
 	#  \param logsPath
 	#	\b \e str : The file to which messages will be written
-	def __init__(self, level=LogLevel.ERROR, logsPath=PATH_logs):
+	#  \param flushSize
+	#	Number of buffered characters at which the buffer is written
+	#  \param flushInterval
+	#	Maximum seconds that messages stay in the buffer
+	#  \param maxSize
+	#	Size in bytes at which log file is rotated, 0 disables rotation
+	#  \param maxArchives
+	#	Number of compressed archives kept for each log file
+	#  \param maxLogs
+	#	Number of log files & archives kept in logs directory
+	#  \param maxAge
+	#	Days after which log files & archives are deleted
+	#  \param recordCount
+	#	Number of recent records kept in memory
+	def __init__(self, level=LogLevel.ERROR, logsPath=PATH_logs, flushSize=32768, flushInterval=1.0,
+			maxSize=10485760, maxArchives=5, maxLogs=30, maxAge=30, recordCount=1000):
 		## The level at which to output messages
 		self.LogLevel = level
 
+		## Levels (int & string) mapped to whether messages are output at that level
+		self.EnabledLevels = {}
+		self.UpdateEnabledLevels()
+
 		## Directory where logs are located
 		self.LogsDir = logsPath
 
 		## Log file path
 		self.LogFile = u'{}/{}.log'.format(self.LogsDir, GetDate(dtfmt.LOG))
 
-		## Forces space between header & first log entry (changed to None after first entry)
-		self.NoStrip = u'\n'
+		## Log file opened for appending
+		self.Stream = None
+
+		## Size of log file, updated as it is written
+		self.LogSize = 0
+
+		self.MaxSize = maxSize
+		self.MaxArchives = maxArchives
+		self.MaxLogs = maxLogs
+		self.MaxAge = maxAge
+
+		## Messages waiting to be written
+		self.Buffer = []
+		self.BufferLength = 0
+
+		## Recent records, oldest are discarded when full
+		self.Records = deque(maxlen=recordCount)
+
+		## Number of records logged in session
+		self.RecordCount = 0
+
+		## Functions called with each new record
+		self.Listeners = []
+
+		## Path of file where records are written as JSON lines, or None
+		self.JSONFile = None
+		self.JSONStream = None
+		self.JSONBuffer = []
+
+		self.FlushSize = flushSize
+		self.FlushInterval = flushInterval
+
+		## Protects buffer from concurrent messages
+		self.BufferLock = threading.Lock()
+
+		## Keeps buffered text in order when written from multiple threads
+		self.WriteLock = threading.Lock()
+
+		## Wakes flush thread before interval has passed
+		self.FlushEvent = threading.Event()
+		self.FlushThread = None
+
+		self.Closed = False
 
 		self.OnInit()
 
@@ -65,6 +186,8 @@ class DebreateLogger:
 		if not os.path.isdir(self.LogsDir):
 			os.makedirs(self.LogsDir)
 
+		self.PruneLogs()
+
 		# Initialize the log with date & time
 		date_time = u'{} {}'.format(GetDate(dtfmt.LOG), GetTime(dtfmt.LOG))
 
@@ -77,7 +200,15 @@ class DebreateLogger:
 		'''
 
 		# Write header to log file
-		AppendFile(self.LogFile, log_header, noStrip=u'\n')
+		self.Write(log_header)
+		self.Flush()
+
+		self.FlushThread = threading.Thread(target=self.FlushLoop)
+		self.FlushThread.daemon = True
+		self.FlushThread.start()
+
+		# Messages are not lost if application exits without closing log
+		atexit.register(self.StopFlushing)
 
 
 	## Adds footer with timestamp to log file
@@ -89,7 +220,264 @@ class DebreateLogger:
 
 			log_footer = u'\n--------------- Log End:   {} ---------------\n\n'.format(date_time)
 
-			AppendFile(self.LogFile, log_footer, noStrip=u'\n')
+			self.Write(log_footer)
+
+		self.StopFlushing()
+
+		with self.WriteLock:
+			if self.Stream:
+				self.Stream.close()
+				self.Stream = None
+
+			if self.JSONStream:
+				self.JSONStream.close()
+				self.JSONStream = None
+
+
+	## Writes buffered messages to log file
+	#
+	#  The log file is opened again if it was deleted or has not been opened.
+	def Flush(self):
+		with self.WriteLock:
+			with self.BufferLock:
+				text = u''.join(self.Buffer)
+				json_text = u''.join(self.JSONBuffer)
+
+				self.Buffer = []
+				self.BufferLength = 0
+				self.JSONBuffer = []
+
+			if json_text:
+				self.WriteJSON(json_text)
+
+			if not text:
+				return
+
+			try:
+				if self.Stream and not os.path.isfile(self.LogFile):
+					self.Stream.close()
+					self.Stream = None
+
+				if not self.Stream:
+					self.Stream = open(self.LogFile, u'ab')
+					self.LogSize = os.fstat(self.Stream.fileno()).st_size
+
+				data = text.encode(u'utf-8')
+
+				self.Stream.write(data)
+				self.Stream.flush()
+
+				self.LogSize += len(data)
+				if self.MaxSize and self.LogSize >= self.MaxSize:
+					self.RotateLog()
+
+			except (IOError, OSError) as e:
+				# Logger cannot log its own errors
+				sys.stderr.write(u'Could not write to log file {}: {}\n'.format(self.LogFile, e))
+
+
+	## Adds a record to buffer of recent records & notifies listeners
+	#
+	#  \param record
+	#	dbr.log.LogRecord instance
+	def AddRecord(self, record):
+		with self.BufferLock:
+			record.Index = self.RecordCount
+			self.RecordCount += 1
+
+			self.Records.append(record)
+
+		for LISTENER in tuple(self.Listeners):
+			LISTENER(record)
+
+
+	## Adds a function to be called with each new record
+	#
+	#  Listeners are called from the thread that logged the message.
+	#
+	#  \param listener
+	#	Function that takes a dbr.log.LogRecord instance
+	def AddListener(self, listener):
+		if listener not in self.Listeners:
+			self.Listeners.append(listener)
+
+
+	## Retrieves path of a compressed archive of the log file
+	#
+	#  \param index
+	#	Number of archive, 1 is the newest
+	def GetArchivePath(self, index):
+		return u'{}.{}.gz'.format(self.LogFile, index)
+
+
+	## Deletes old log files & archives
+	#
+	#  Files older than the maximum age are deleted, then the oldest files
+	#  over the maximum count. The current log file is always kept.
+	def PruneLogs(self):
+		try:
+			names = os.listdir(self.LogsDir)
+
+		except OSError:
+			return
+
+		logs = []
+
+		for NAME in names:
+			if not (NAME.endswith(u'.log') or (u'.log.' in NAME and NAME.endswith(u'.gz'))):
+				continue
+
+			log_path = u'{}/{}'.format(self.LogsDir, NAME)
+			if log_path == self.LogFile:
+				continue
+
+			try:
+				logs.append((os.stat(log_path).st_mtime, log_path,))
+
+			except OSError:
+				pass
+
+		# Newest first
+		logs.sort(reverse=True)
+
+		oldest = time.time() - self.MaxAge * 86400
+
+		for INDEX, (MTIME, PATH) in enumerate(logs):
+			# Current log file counts towards maximum
+			if INDEX + 1 >= self.MaxLogs or MTIME < oldest:
+				try:
+					os.remove(PATH)
+
+				except OSError as e:
+					sys.stderr.write(u'Could not delete old log file {}: {}\n'.format(PATH, e))
+
+
+	## Removes a function added with AddListener
+	def RemoveListener(self, listener):
+		if listener in self.Listeners:
+			self.Listeners.remove(listener)
+
+
+	## Compresses log file to a numbered archive & starts a new log file
+	#
+	#  Must be called while holding write lock. Archives are numbered from
+	#  newest to oldest & archives over the maximum are deleted.
+	def RotateLog(self):
+		self.Stream.close()
+		self.Stream = None
+		self.LogSize = 0
+
+		try:
+			oldest = self.GetArchivePath(self.MaxArchives)
+			if os.path.isfile(oldest):
+				os.remove(oldest)
+
+			for INDEX in range(self.MaxArchives - 1, 0, -1):
+				archive = self.GetArchivePath(INDEX)
+
+				if os.path.isfile(archive):
+					os.rename(archive, self.GetArchivePath(INDEX + 1))
+
+			if self.MaxArchives > 0:
+				# Log is moved before compressing so messages are not written to it meanwhile
+				temp_path = u'{}.rotate'.format(self.LogFile)
+				os.rename(self.LogFile, temp_path)
+
+				FILE_IN = open(temp_path, u'rb')
+				FILE_OUT = gzip.open(self.GetArchivePath(1), u'wb')
+
+				try:
+					shutil.copyfileobj(FILE_IN, FILE_OUT)
+
+				finally:
+					FILE_OUT.close()
+					FILE_IN.close()
+
+				os.remove(temp_path)
+
+			else:
+				os.remove(self.LogFile)
+
+		except (IOError, OSError) as e:
+			sys.stderr.write(u'Could not rotate log file {}: {}\n'.format(self.LogFile, e))
+
+
+	## Sets file where records are written as JSON lines
+	#
+	#  \param path
+	#	Path of file, or \b \e None to disable JSON output
+	def SetJSONFile(self, path):
+		with self.WriteLock:
+			if self.JSONStream:
+				self.JSONStream.close()
+				self.JSONStream = None
+
+			if path:
+				path = os.path.abspath(path)
+
+			self.JSONFile = path
+
+
+	## Stops flush thread & writes remaining buffer
+	#
+	#  Messages logged afterwards are only written by calling Flush.
+	def StopFlushing(self):
+		self.Closed = True
+		self.FlushEvent.set()
+
+		if self.FlushThread and self.FlushThread.is_alive():
+			self.FlushThread.join(self.FlushInterval * 2)
+
+		self.Flush()
+
+
+	## Writes JSON lines to JSON file
+	#
+	#  Must be called while holding write lock.
+	#
+	#  \param text
+	#	\b \e Unicode JSON lines
+	def WriteJSON(self, text):
+		try:
+			if not self.JSONStream:
+				self.JSONStream = open(self.JSONFile, u'ab')
+
+			self.JSONStream.write(text.encode(u'utf-8'))
+			self.JSONStream.flush()
+
+		except (IOError, OSError, TypeError) as e:
+			sys.stderr.write(u'Could not write to JSON log file {}: {}\n'.format(self.JSONFile, e))
+
+
+	## Writes buffer from background thread at intervals or when woken
+	def FlushLoop(self):
+		while not self.Closed:
+			self.FlushEvent.wait(self.FlushInterval)
+			self.FlushEvent.clear()
+
+			self.Flush()
+
+
+	## Adds text to buffer
+	#
+	#  Flush thread is woken if buffer has reached size threshold.
+	#
+	#  \param text
+	#	\b \e Unicode text to be written to log file
+	#  \param record
+	#	dbr.log.LogRecord instance to be written to JSON file, if enabled
+	def Write(self, text, record=None):
+		with self.BufferLock:
+			self.Buffer.append(text)
+			self.BufferLength += len(text)
+
+			if record and self.JSONFile:
+				self.JSONBuffer.append(u'{}\n'.format(record.FormatJSON()))
+
+			full = self.BufferLength >= self.FlushSize
+
+		if full:
+			self.FlushEvent.set()
 
 
 	## Checks if log can be written at supplied level
@@ -122,29 +510,33 @@ class DebreateLogger:
 	#	Name of the script/module or the globals.moduleaccess.ModuleAccessCtrl
 	#	instance where the message originates
 	#  \param message
-	#	Message to display
+	#	Message to display, format string or function that returns message
 	#  \param newline
 	#	If <b><i>True</i></b>, prepends an empty line to beginning of message
 	#  \param pout
 	#	Stream to which message should be output (stdout/stderr)
-	def LogMessage(self, level, module, message, details=[], newline=False, pout=sys.stdout):
+	#  \param args
+	#	Arguments used to format message, which is only formatted if level is enabled
+	def LogMessage(self, level, module, message, details=[], newline=False, pout=sys.stdout, args=None):
+		if not self.IsEnabledFor(level):
+			return
+
 		level = self.CheckLogLevel(level)
 
 		# Use the object to retrieve module string
 		if not IsString(module):
 			module = GetModuleString(module)
 
-		if (level in self.LogLevelList) and (level <= self.LogLevel):
-			l_string = self.LogLevelList[level].upper()
-			message = u'{}: [{}] {}'.format(l_string, module, message)
+		if level in self.LogLevelList:
+			if IsString(details):
+				details = (details,)
+
+			details = tuple([u'{}'.format(D) for D in details])
 
-			if details:
-				if IsString(details):
-					message += u'\n  • {}'.format(details)
+			record = LogRecord(level, module, FormatMessage(message, args), details)
+			message = record.Format()
 
-				else:
-					for ITEM in details:
-						message += u'\n  • {}'.format(ITEM)
+			self.AddRecord(record)
 
 			if newline:
 				message = u'\n{}'.format(message)
@@ -157,12 +549,11 @@ class DebreateLogger:
 				# Need to manually add newline when using sys.stdout/sys.stderr
 				pout.write(u'{}\n'.format(message))
 
-			# Open log for writing
-			AppendFile(self.LogFile, u'{}\n'.format(message), self.NoStrip)
+			self.Write(u'{}\n'.format(message), record)
 
-			# Allow stripping leading & trailing newlines from opened log file
-			if self.NoStrip:
-				self.NoStrip = None
+			# Errors are written immediately in case application cannot continue
+			if level == LogLevel.ERROR:
+				self.Flush()
 
 
 	## Show a log message at 'info' level
@@ -170,11 +561,14 @@ class DebreateLogger:
 	#  \param module
 	#	Name of the script/module where the message originates
 	#  \param message
-	#	Message to display
+	#	Message to display, format string or function that returns message
 	#  \param newline
 	#	If <b><i>True</i></b>, prepends an empty line to beginning of message
-	def Info(self, module, message, details=[], newline=False):
-		self.LogMessage(u'info', module, message, details=details, newline=newline)
+	#  \param args
+	#	Arguments used to format message
+	def Info(self, module, message, details=[], newline=False, args=None):
+		if self.EnabledLevels.get(LogLevel.INFO):
+			self.LogMessage(LogLevel.INFO, module, message, details=details, newline=newline, args=args)
 
 
 	## Show a log message at 'warn' level
@@ -182,11 +576,14 @@ class DebreateLogger:
 	#  \param module
 	#	Name of the script/module where the message originates
 	#  \param message
-	#	Message to display
+	#	Message to display, format string or function that returns message
 	#  \param newline
 	#	If <b><i>True</i></b>, prepends an empty line to beginning of message
-	def Warn(self, module, message, details=[], newline=False):
-		self.LogMessage(u'warn', module, message, details=details, newline=newline)
+	#  \param args
+	#	Arguments used to format message
+	def Warn(self, module, message, details=[], newline=False, args=None):
+		if self.EnabledLevels.get(LogLevel.WARN):
+			self.LogMessage(LogLevel.WARN, module, message, details=details, newline=newline, args=args)
 
 
 	## Show a log message at 'error' level
@@ -196,11 +593,14 @@ class DebreateLogger:
 	#  \param module
 	#	Name of the script/module where the message originates
 	#  \param message
-	#	Message to display
+	#	Message to display, format string or function that returns message
 	#  \param newline
 	#	If <b><i>True</i></b>, prepends an empty line to beginning of message
-	def Error(self, module, message, details=[], newline=False):
-		self.LogMessage(u'error', module, message, details=details, newline=newline, pout=sys.stderr)
+	#  \param args
+	#	Arguments used to format message
+	def Error(self, module, message, details=[], newline=False, args=None):
+		if self.EnabledLevels.get(LogLevel.ERROR):
+			self.LogMessage(LogLevel.ERROR, module, message, details=details, newline=newline, pout=sys.stderr, args=args)
 
 
 	## Show a log message at 'debug' level
@@ -208,11 +608,14 @@ class DebreateLogger:
 	#  \param module
 	#	Name of the script/module where the message originates
 	#  \param message
-	#	Message to display
+	#	Message to display, format string or function that returns message
 	#  \param newline
 	#	If <b><i>True</i></b>, prepends an empty line to beginning of message
-	def Debug(self, module, message, details=[], newline=False):
-		self.LogMessage(u'debug', module, message, details=details, newline=newline)
+	#  \param args
+	#	Arguments used to format message
+	def Debug(self, module, message, details=[], newline=False, args=None):
+		if self.EnabledLevels.get(LogLevel.DEBUG):
+			self.LogMessage(LogLevel.DEBUG, module, message, details=details, newline=newline, args=args)
 
 
 	## Show a log message at '' level
@@ -220,11 +623,14 @@ class DebreateLogger:
 	#  \param module
 	#	Name of the script/module where the message originates
 	#  \param message
-	#	Message to display
+	#	Message to display, format string or function that returns message
 	#  \param newline
 	#	If <b><i>True</i></b>, prepends an empty line to beginning of message
-	def Test(self, module, message, details=[], newline=False):
-		self.LogMessage(u'test', module, message, details=details, newline=newline)
+	#  \param args
+	#	Arguments used to format message
+	def Test(self, module, message, details=[], newline=False, args=None):
+		if self.EnabledLevels.get(LogLevel.TEST):
+			self.LogMessage(LogLevel.TEST, module, message, details=details, newline=newline, args=args)
 
 
 	## Sets the level at which messages will be output to terminal & log file
@@ -249,9 +655,68 @@ class DebreateLogger:
 					self.LogLevel = L
 					log_set = True
 
+		if log_set:
+			self.UpdateEnabledLevels()
+
 		return log_set
 
 
+	## Checks if messages are output at a level
+	#
+	#  Result is cached when logging level is set, so this can be called in loops.
+	#
+	#  \param level
+	#	\b \e int|str : Message level
+	def IsEnabledFor(self, level):
+		enabled = self.EnabledLevels.get(level)
+
+		if enabled == None:
+			level = self.CheckLogLevel(level)
+
+			return level != None and level <= self.LogLevel
+
+		return enabled
+
+
+	## Updates cache of levels at which messages are output
+	def UpdateEnabledLevels(self):
+		enabled = {}
+
+		for L in self.LogLevelList:
+			enabled[L] = L <= self.LogLevel
+			enabled[self.LogLevelList[L]] = enabled[L]
+
+		self.EnabledLevels = enabled
+
+
+	## Retrieves recent records
+	#
+	#  \param start
+	#	Index of first record to retrieve, records that have been discarded are skipped
+	#  \param levels
+	#	Iterable of levels to include, or \b \e None for all levels
+	#  \param module
+	#	Name of module to include (including sub-modules), or \b \e None for all modules
+	#  \return
+	#	\b \e List of dbr.log.LogRecord instances, oldest first
+	def GetRecords(self, start=0, levels=None, module=None):
+		with self.BufferLock:
+			records = list(self.Records)
+
+		if records and records[0].Index < start:
+			records = records[start - records[0].Index:]
+
+		if levels != None:
+			levels = [self.CheckLogLevel(L) for L in levels]
+			records = [R for R in records if R.Level in levels]
+
+		if module != None:
+			prefix = u'{}.'.format(module)
+			records = [R for R in records if R.Module == module or R.Module.startswith(prefix)]
+
+		return records
+
+
 	## Retrieves the current logging level
 	#
 	#  \return
@@ -268,6 +733,27 @@ class DebreateLogger:
 		return self.LogFile
 
 
+## Formats a log message
+#
+#  \param message
+#	Message text, format string, or function that returns message
+#  \param args
+#	Arguments for format string
+#  \return
+#	\b \e Unicode message
+def FormatMessage(message, args=None):
+	if callable(message):
+		message = message()
+
+	if args:
+		if not isinstance(args, tuple):
+			args = (args,)
+
+		message = message.format(*args)
+
+	return message
+
+
 ## Instantiated logger with default level & output path
 Logger = DebreateLogger()
 
@@ -276,4 +762,4 @@ Logger = DebreateLogger()
 #  \return
 #	<b><i>True</i></b> if logging level is 'debug'
 def DebugEnabled():
-	return Logger.GetLogLevel() >= LogLevel.DEBUG
+	return Logger.IsEnabledFor(LogLevel.DEBUG)
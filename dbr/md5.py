@@ -66,7 +66,7 @@ def WriteMD5(stage_dir, parent=None):
 
 			md5 = GetCommandOutput(CMD_md5sum, (u'-t', F))
 
-			Logger.Debug(__name__, u'WriteMD5: GetCommandOutput: {}'.format(md5))
+			Logger.Debug(__name__, u'WriteMD5: GetCommandOutput: {}', args=(md5,))
 
 			temp_list.append(md5)
 
@@ -8,7 +8,7 @@
 # See: docs/LICENSE.txt
 
 
-import codecs, os
+import codecs, os, shutil
 
 from globals.paths		import ConcatPaths
 from globals.strings	import GS
@@ -79,16 +79,7 @@ def ReadFile(path, split=False, convert=tuple, noStrip=None):
 #  \param noStrip
 #	\b \e String of leading & trailing characters to not strip
 def WriteFile(path, contents, noStrip=None):
-	strip_chars = u' \t\n\r'
-	if noStrip:
-		for C in noStrip:
-			strip_chars = strip_chars.replace(C, u'')
-
-	# Ensure we are dealing with a string
-	if isinstance(contents, (tuple, list)):
-		contents = u'\n'.join(contents)
-
-	contents = contents.strip(strip_chars)
+	contents = _strip_contents(contents, noStrip)
 
 	if u'/' in path:
 		target_dir = os.path.dirname(path)
@@ -110,6 +101,68 @@ def WriteFile(path, contents, noStrip=None):
 	return True
 
 
+## Writes a text file without leaving it partially written
+#
+#  Contents are written to a temporary file that is synced to disk &
+#  renamed over the original. If 'path' is a symbolic link, its target is
+#  replaced & permissions of an existing file are kept.
+#
+#  \param path
+#	Absolute path of file to write
+#  \param contents
+#	Text to be written to file
+#  \param noStrip
+#	\b \e String of leading & trailing characters to not strip
+#  \throws IOError|OSError
+#	If file could not be written. Temporary file is removed.
+def WriteFileSafe(path, contents, noStrip=None):
+	contents = _strip_contents(contents, noStrip)
+
+	path = os.path.realpath(path)
+	temp_path = u'{}.tmp'.format(path)
+
+	try:
+		FILE_BUFFER = codecs.open(temp_path, u'w', encoding=u'utf-8')
+
+		try:
+			FILE_BUFFER.write(contents)
+			FILE_BUFFER.flush()
+			os.fsync(FILE_BUFFER.fileno())
+
+		finally:
+			FILE_BUFFER.close()
+
+		if os.path.isfile(path):
+			shutil.copymode(path, temp_path)
+
+		os.rename(temp_path, path)
+
+	except:
+		if os.path.isfile(temp_path):
+			os.remove(temp_path)
+
+		raise
+
+
+## Strips text to be written to a file
+#
+#  \param contents
+#	\b \e String or list of lines
+#  \param noStrip
+#	\b \e String of leading & trailing characters to not strip
+def _strip_contents(contents, noStrip=None):
+	strip_chars = u' \t\n\r'
+	if noStrip:
+		for C in noStrip:
+			strip_chars = strip_chars.replace(C, u'')
+
+	# Ensure we are dealing with a string
+	if isinstance(contents, (tuple, list)):
+		contents = u'\n'.join(contents)
+
+	return contents.strip(strip_chars)
+
+
 ## Retrieves a list of all files from the given path
 #
 #  \param path
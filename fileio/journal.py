@@ -0,0 +1,341 @@
+# -*- coding: utf-8 -*-
+
+## \package fileio.journal
+#
+#  Append-only journal of named text entries
+
+# MIT licensing
+# See: docs/LICENSE.txt
+
+
+import errno, fcntl, hashlib, os
+
+
+## Retrieves fingerprint of text used to detect changes
+#
+#  \param text
+#	\b \e Unicode text
+#  \return
+#	\b \e String hex digest
+def GetFingerprint(text):
+	return hashlib.md5(text.encode(u'utf-8')).hexdigest()
+
+
+## Journal of changes to named text entries (e.g. project sections)
+#
+#  Entries are appended to the journal file as records only when their
+#  text differs from the last record or from the base state (the last
+#  saved project). Reading the journal returns the latest text of each
+#  changed entry, so changes can be recovered after a crash.
+#
+#  Each record is a header line of the entry name & the byte length of its
+#  UTF-8 text, followed by the text & a newline. A truncated record at the
+#  end of the file (e.g. from a crash during writing) is ignored.
+#
+#  The process writing a journal holds a lock on a separate lock file, so
+#  other processes can tell if its owner is still running. The system
+#  releases the lock when the process exits, even if it crashes.
+class Journal:
+	## Constructor
+	#
+	#  \param path
+	#	Absolute path of journal file
+	#  \param compactRatio
+	#	The journal is compacted when it has this many times more records than entries
+	def __init__(self, path, compactRatio=4):
+		self.Path = path
+		self.CompactRatio = compactRatio
+
+		## Entry names mapped to fingerprints of base state
+		self.Base = {}
+
+		## Entry names mapped to latest text written to journal
+		self.Entries = {}
+
+		## Number of records in journal file
+		self.Records = 0
+
+		## Open lock file while this process owns the journal
+		self.LockFile = None
+
+
+	## Appends entries that have changed to the journal
+	#
+	#  \param entries
+	#	\b \e Dictionary of entry names mapped to text
+	#  \return
+	#	\b \e List of names of entries that were written
+	def Append(self, entries):
+		records = []
+		written = []
+
+		for NAME in sorted(entries):
+			text = entries[NAME]
+
+			if NAME in self.Entries:
+				if self.Entries[NAME] == text:
+					continue
+
+			elif self.Base.get(NAME) == GetFingerprint(text):
+				continue
+
+			records.append(self.FormatRecord(NAME, text))
+			written.append(NAME)
+
+			self.Entries[NAME] = text
+
+		if records:
+			self.MakeDirectory()
+
+			FILE_BUFFER = open(self.Path, u'ab')
+
+			try:
+				FILE_BUFFER.write(b''.join(records))
+				FILE_BUFFER.flush()
+				os.fsync(FILE_BUFFER.fileno())
+
+			finally:
+				FILE_BUFFER.close()
+
+			self.Records += len(records)
+
+			if self.Records > max(1, len(self.Entries)) * self.CompactRatio:
+				self.Compact()
+
+		return written
+
+
+	## Rewrites journal with a single record for each entry that differs from base state
+	#
+	#  The new journal is written to a temporary file & renamed over the old
+	#  one, so the journal is never left partially written.
+	def Compact(self):
+		for NAME in list(self.Entries):
+			# Entries that were changed back to base state are dropped
+			if self.Base.get(NAME) == GetFingerprint(self.Entries[NAME]):
+				self.Entries.pop(NAME)
+
+		if not self.Entries:
+			self.Remove()
+
+			return
+
+		self.MakeDirectory()
+
+		temp_path = u'{}.tmp'.format(self.Path)
+
+		FILE_BUFFER = open(temp_path, u'wb')
+
+		try:
+			for NAME in sorted(self.Entries):
+				FILE_BUFFER.write(self.FormatRecord(NAME, self.Entries[NAME]))
+
+			FILE_BUFFER.flush()
+			os.fsync(FILE_BUFFER.fileno())
+
+		finally:
+			FILE_BUFFER.close()
+
+		os.rename(temp_path, self.Path)
+
+		self.Records = len(self.Entries)
+
+
+	## Deletes journal file & lock file & releases lock
+	#
+	#  Only called by the owner of the journal.
+	def Discard(self):
+		self.Remove()
+
+		if self.LockFile:
+			try:
+				os.remove(self.GetLockPath())
+
+			except OSError as e:
+				if e.errno != errno.ENOENT:
+					raise
+
+			self.Unlock()
+
+
+	## Checks if journal file exists & is not empty
+	def Exists(self):
+		return os.path.isfile(self.Path) and os.path.getsize(self.Path) > 0
+
+
+	## Formats an entry as a record
+	#
+	#  \return
+	#	UTF-8 encoded \b \e string
+	def FormatRecord(self, name, text):
+		data = text.encode(u'utf-8')
+
+		return u'{} {}\n'.format(name, len(data)).encode(u'utf-8') + data + b'\n'
+
+
+	## Retrieves path of file locked by owner of journal
+	def GetLockPath(self):
+		return u'{}.lock'.format(self.Path)
+
+
+	## Checks if this process owns the journal
+	def IsLocked(self):
+		return self.LockFile != None
+
+
+	## Locks journal to mark it as owned by this process
+	#
+	#  \return
+	#	\b \e True if lock was acquired, \b \e False if journal is owned by
+	#	another process
+	def Lock(self):
+		if self.LockFile:
+			return True
+
+		self.MakeDirectory()
+
+		lock_file = open(self.GetLockPath(), u'a')
+
+		try:
+			fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX|fcntl.LOCK_NB)
+
+		except IOError as e:
+			lock_file.close()
+
+			if e.errno in (errno.EACCES, errno.EAGAIN):
+				return False
+
+			raise
+
+		self.LockFile = lock_file
+
+		return True
+
+
+	## Creates directory of journal file if it does not exist
+	def MakeDirectory(self):
+		journal_dir = os.path.dirname(self.Path)
+
+		if not os.path.isdir(journal_dir):
+			os.makedirs(journal_dir)
+
+
+	## Reads latest text of each entry from journal file
+	#
+	#  \return
+	#	\b \e Dictionary of entry names mapped to text
+	def Read(self):
+		entries = {}
+
+		if not os.path.isfile(self.Path):
+			return entries
+
+		FILE_BUFFER = open(self.Path, u'rb')
+		data = FILE_BUFFER.read()
+		FILE_BUFFER.close()
+
+		records = 0
+		offset = 0
+
+		while offset < len(data):
+			header_end = data.find(b'\n', offset)
+			if header_end < 0:
+				break
+
+			header = data[offset:header_end].decode(u'utf-8').rsplit(u' ', 1)
+			if len(header) != 2 or not header[1].isdigit():
+				break
+
+			text_end = header_end + 1 + int(header[1])
+
+			# Record was not completely written
+			if text_end + 1 > len(data) or data[text_end:text_end+1] != b'\n':
+				break
+
+			entries[header[0]] = data[header_end+1:text_end].decode(u'utf-8')
+			records += 1
+			offset = text_end + 1
+
+		self.Entries = dict(entries)
+		self.Records = records
+
+		return entries
+
+
+	## Deletes journal file & forgets written entries
+	def Remove(self):
+		self.Entries = {}
+		self.Records = 0
+
+		try:
+			os.remove(self.Path)
+
+		except OSError as e:
+			if e.errno != errno.ENOENT:
+				raise
+
+
+	## Releases lock so that journal can be recovered by another process
+	def Unlock(self):
+		if self.LockFile:
+			self.LockFile.close()
+			self.LockFile = None
+
+
+	## Sets base state & empties journal
+	#
+	#  Called after project is opened or saved, so only later changes are journalled.
+	#
+	#  \param fingerprints
+	#	\b \e Dictionary of entry names mapped to fingerprints of their text
+	#  \param clear
+	#	If \b \e False, journal file & entries that were read are kept (e.g. after recovery)
+	def SetBase(self, fingerprints, clear=True):
+		self.Base = dict(fingerprints)
+
+		if clear:
+			self.Remove()
+
+
+## Finds journals whose owner process has exited
+#
+#  Journals of running processes are locked by them & skipped. Journals
+#  that are found are locked by this process, so they are not recovered
+#  by more than one process. Empty journals & lock files left behind are
+#  deleted.
+#
+#  \param journalDir
+#	Directory where journals are kept
+#  \param prefix
+#	Basename prefix of journal files
+#  \return
+#	\b \e List of fileio.journal.Journal instances, most recently modified first
+def FindOrphanedJournals(journalDir, prefix):
+	orphans = []
+
+	if not os.path.isdir(journalDir):
+		return orphans
+
+	names = set()
+
+	for NAME in os.listdir(journalDir):
+		if NAME.startswith(prefix):
+			for SUFFIX in (u'.lock', u'.tmp',):
+				if NAME.endswith(SUFFIX):
+					NAME = NAME[:-len(SUFFIX)]
+
+			names.add(NAME)
+
+	for NAME in sorted(names):
+		journal = Journal(os.path.join(journalDir, NAME))
+
+		if not journal.Lock():
+			continue
+
+		if journal.Exists():
+			orphans.append(journal)
+
+		else:
+			journal.Discard()
+
+	return sorted(orphans, key=lambda J: os.path.getmtime(J.Path), reverse=True)
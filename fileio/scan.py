@@ -0,0 +1,488 @@
+# -*- coding: utf-8 -*-
+
+## \package fileio.scan
+#
+#  Retrieving status of many files with as few system calls as possible
+
+# MIT licensing
+# See: docs/LICENSE.txt
+
+
+import errno, os, stat, threading
+from collections import OrderedDict
+
+# Python 3.5+ provides os.scandir, older versions can use the 'scandir' module if installed
+try:
+	from os import scandir
+
+except ImportError:
+	try:
+		from scandir import scandir
+
+	except ImportError:
+		scandir = None
+
+
+## Status values of a file on the filesystem
+class FileStatus:
+	MISSING, NORMAL, DIRECTORY, SYMLINK, EXECUTABLE = range(5)
+
+
+## Permission bits that mark a file as executable
+MODE_executable = stat.S_IXUSR|stat.S_IXGRP|stat.S_IXOTH
+
+
+## Converts a file's status result to a FileStatus value
+#
+#  \param l_stat
+#	\b \e posix.stat_result from os.lstat
+#  \param path
+#	Path of file, only used to follow symbolic links
+#  \return
+#	\b \e Integer FileStatus value
+def GetStatusFromStat(l_stat, path):
+	if stat.S_ISDIR(l_stat.st_mode):
+		return FileStatus.DIRECTORY
+
+	if stat.S_ISLNK(l_stat.st_mode):
+		try:
+			# Links to directories are treated as directories
+			if stat.S_ISDIR(os.stat(path).st_mode):
+				return FileStatus.DIRECTORY
+
+		except OSError:
+			# Broken link
+			return FileStatus.MISSING
+
+		return FileStatus.SYMLINK
+
+	if l_stat.st_mode & MODE_executable:
+		return FileStatus.EXECUTABLE
+
+	return FileStatus.NORMAL
+
+
+## Retrieves status of a single file
+#
+#  \param path
+#	Absolute path of file
+#  \return
+#	\b \e Integer FileStatus value
+def GetFileStatus(path):
+	return _read_status(path)[0]
+
+
+## Retrieves modification time from a file's status
+#
+#  Symbolic links are followed, like globals.fileitem.FileItem.GetTimestamp.
+#
+#  \param l_stat
+#	\b \e posix.stat_result from os.lstat
+#  \param path
+#	Path of file, only used to follow symbolic links
+#  \param status
+#	FileStatus value converted from 'l_stat'
+#  \return
+#	Modification time, or \b \e None for directories & broken links
+def _get_time(l_stat, path, status):
+	if status in (FileStatus.MISSING, FileStatus.DIRECTORY,):
+		return None
+
+	if status == FileStatus.SYMLINK:
+		try:
+			return os.stat(path).st_mtime
+
+		except OSError:
+			return None
+
+	return l_stat.st_mtime
+
+
+## Retrieves status & modification time of a single file
+#
+#  \param path
+#	Absolute path of file
+#  \param readTime
+#	If \b \e True, modification time is also retrieved
+#  \return
+#	\b \e Tuple of FileStatus value & modification time or \b \e None
+def _read_status(path, readTime=False):
+	try:
+		l_stat = os.lstat(path)
+
+	except OSError:
+		return FileStatus.MISSING, None
+
+	status = GetStatusFromStat(l_stat, path)
+
+	if readTime:
+		return status, _get_time(l_stat, path, status)
+
+	return status, None
+
+
+## Retrieves status of files located in a single directory
+#
+#  The directory is listed once so that missing files don't require
+#  individual system calls.
+#
+#  \param dirPath
+#	Directory where files are located
+#  \param names
+#	\b \e Set of file basenames to check
+#  \param times
+#	\b \e Dictionary where modification times of files (not directories)
+#	are added by basename, or \b \e None
+#  \return
+#	\b \e Dictionary of basenames mapped to FileStatus values
+def ScanDirectoryStatus(dirPath, names, times=None):
+	status = {}
+	read_time = times != None
+
+	def read_status(name):
+		status[name], mtime = _read_status(os.path.join(dirPath, name), read_time)
+
+		if mtime != None:
+			times[name] = mtime
+
+	# Listing a directory for a few files costs more than checking them individually
+	if len(names) <= 4:
+		for N in names:
+			read_status(N)
+
+		return status
+
+	for N in names:
+		status[N] = FileStatus.MISSING
+
+	try:
+		if scandir:
+			for ENTRY in scandir(dirPath):
+				if ENTRY.name in status:
+					try:
+						# Directory type is known from listing without calling stat
+						if ENTRY.is_dir(follow_symlinks=False):
+							status[ENTRY.name] = FileStatus.DIRECTORY
+
+						else:
+							l_stat = ENTRY.stat(follow_symlinks=False)
+							status[ENTRY.name] = GetStatusFromStat(l_stat, ENTRY.path)
+
+							if read_time:
+								mtime = _get_time(l_stat, ENTRY.path, status[ENTRY.name])
+								if mtime != None:
+									times[ENTRY.name] = mtime
+
+					except OSError:
+						# File was removed after directory was listed
+						status[ENTRY.name] = FileStatus.MISSING
+
+		else:
+			for N in set(os.listdir(dirPath)) & set(names):
+				read_status(N)
+
+	except OSError as e:
+		# Files may still be accessible if directory cannot be listed
+		if e.errno not in (errno.ENOENT, errno.ENOTDIR):
+			for N in names:
+				read_status(N)
+
+	return status
+
+
+## Groups a list of absolute paths by parent directory
+#
+#  \param paths
+#	\b \e List of absolute file paths
+#  \return
+#	\b \e Dictionary of directories mapped to sets of file basenames
+def GroupPathsByDirectory(paths):
+	groups = {}
+
+	for P in paths:
+		parent, name = os.path.split(P)
+
+		if parent not in groups:
+			groups[parent] = set()
+
+		groups[parent].add(name)
+
+	return groups
+
+
+## Retrieves status of many files, grouped by directory
+#
+#  \param paths
+#	\b \e List of absolute file paths
+#  \param callback
+#	Function called with \b \e dictionary of paths mapped to FileStatus
+#	values after each directory is scanned. If it returns \b \e False,
+#	scanning is aborted.
+#  \param times
+#	\b \e Dictionary where modification times of files (not directories)
+#	are added by path, or \b \e None
+#  \return
+#	\b \e Dictionary of paths mapped to FileStatus values
+def ScanFileStatus(paths, callback=None, times=None):
+	status = {}
+
+	for DIR, NAMES in sorted(GroupPathsByDirectory(paths).items()):
+		dir_status = {}
+		dir_times = None
+		if times != None:
+			dir_times = {}
+
+		for N, S in ScanDirectoryStatus(DIR, NAMES, dir_times).items():
+			dir_status[os.path.join(DIR, N)] = S
+
+		if dir_times:
+			for N, T in dir_times.items():
+				times[os.path.join(DIR, N)] = T
+
+		status.update(dir_status)
+
+		if callback and callback(dir_status) == False:
+			break
+
+	return status
+
+
+## Lists files in a directory tree
+#
+#  Like os.walk, symbolic links to directories are neither followed nor
+#  listed as files.
+#
+#  \param path
+#	Root directory of tree
+#  \return
+#	\b \e Generator of (directory, [file basenames]) tuples
+def WalkFiles(path):
+	if not scandir:
+		for ROOT, DIRS, FILES in os.walk(path):
+			yield ROOT, FILES
+
+		return
+
+	dirs = [path]
+
+	while dirs:
+		root = dirs.pop()
+		files = []
+		subdirs = []
+
+		try:
+			entries = list(scandir(root))
+
+		except OSError:
+			continue
+
+		for ENTRY in entries:
+			try:
+				if ENTRY.is_dir():
+					if not ENTRY.is_symlink():
+						subdirs.append(ENTRY.path)
+
+					continue
+
+			except OSError:
+				pass
+
+			files.append(ENTRY.name)
+
+		yield root, files
+
+		dirs += reversed(subdirs)
+
+
+## Collects files to be added to a file list
+#
+#  \param paths
+#	\b \e List of absolute paths to files & directories
+#  \param preserveTop
+#	If \b \e False, contents of directories in 'paths' are added instead of
+#	the directories themselves
+#  \param individually
+#	If \b \e True, files inside directories are added instead of directories
+#  \param callback
+#	Function called with a \b \e dictionary of newly found source directories
+#	mapped to sets of paths relative to them, after every 'batchSize' files.
+#	If it returns \b \e False, collecting is aborted.
+#  \param batchSize
+#	Number of files to collect before calling 'callback'
+#  \param aborted
+#	Function that returns \b \e True if collecting should be aborted,
+#	called for every directory & file
+#  \return
+#	\b \e Dictionary of source directories mapped to sets of relative paths,
+#	or \b \e None if aborted
+def CollectFiles(paths, preserveTop=True, individually=False, callback=None, batchSize=1000, aborted=None):
+	if aborted == None:
+		aborted = lambda: False
+
+	collected = {}
+	batch = {}
+	batch_count = [0]
+
+	def add_file(source_dir, rel_path):
+		if source_dir not in collected:
+			collected[source_dir] = set()
+
+		if rel_path not in collected[source_dir]:
+			collected[source_dir].add(rel_path)
+
+			if source_dir not in batch:
+				batch[source_dir] = set()
+
+			batch[source_dir].add(rel_path)
+			batch_count[0] += 1
+
+	def flush(force=False):
+		if batch and (force or batch_count[0] >= batchSize):
+			result = callback(dict(batch)) if callback else None
+
+			batch.clear()
+			batch_count[0] = 0
+
+			return result != False
+
+		return True
+
+	if not preserveTop:
+		top_paths = []
+
+		for P in paths:
+			if aborted():
+				return None
+
+			if os.path.isdir(P):
+				# Remove top-level directory from list
+				top_paths += [os.path.join(P, C) for C in sorted(os.listdir(P))]
+
+			else:
+				top_paths.append(P)
+
+		paths = top_paths
+
+	for P in paths:
+		if aborted():
+			return None
+
+		if not individually or os.path.isfile(P):
+			add_file(os.path.dirname(P), os.path.basename(P))
+
+			if not flush():
+				return None
+
+			continue
+
+		if not os.path.isdir(P):
+			continue
+
+		# Relative paths keep top level directory
+		parent_dir = os.path.dirname(P)
+
+		for ROOT, FILES in WalkFiles(P):
+			if aborted():
+				return None
+
+			rel_root = ROOT[len(parent_dir):].strip(u'/')
+
+			for F in FILES:
+				if aborted():
+					return None
+
+				add_file(parent_dir, u'{}/{}'.format(rel_root, F))
+
+			if not flush():
+				return None
+
+	if not flush(True):
+		return None
+
+	return collected
+
+
+## Cache of directory listings
+#
+#  Listings are validated by the directory's modification time & inode,
+#  so only directories that changed are listed again. Least recently used
+#  listings are removed when total number of cached entries exceeds limit.
+#
+#  Instances can be shared between threads.
+class DirectoryCache:
+	## Constructor
+	#
+	#  \param maxEntries
+	#	Maximum number of entries from all listings kept in memory
+	def __init__(self, maxEntries=100000):
+		self.MaxEntries = maxEntries
+
+		## Directory paths mapped to ((mtime, inode), entries) in order of use
+		self.Listings = OrderedDict()
+
+		## Total number of entries in all listings
+		self.EntryCount = 0
+
+		self.Lock = threading.Lock()
+
+
+	## Removes all listings
+	def Clear(self):
+		with self.Lock:
+			self.Listings = OrderedDict()
+			self.EntryCount = 0
+
+
+	## Retrieves listing of a directory
+	#
+	#  \param dirPath
+	#	Directory to list
+	#  \param readFunction
+	#	Function called with 'dirPath' to list directory if cached listing is
+	#	missing or out of date
+	#  \return
+	#	\b \e Tuple of entries returned by 'readFunction'
+	#  \throws OSError
+	#	If directory cannot be accessed
+	def Get(self, dirPath, readFunction):
+		d_stat = os.stat(dirPath)
+		state = (d_stat.st_mtime, d_stat.st_ino,)
+
+		with self.Lock:
+			cached = self.Listings.pop(dirPath, None)
+
+			if cached:
+				if cached[0] == state:
+					# Move to end as most recently used
+					self.Listings[dirPath] = cached
+
+					return cached[1]
+
+				self.EntryCount -= len(cached[1])
+
+		entries = tuple(readFunction(dirPath))
+
+		with self.Lock:
+			replaced = self.Listings.pop(dirPath, None)
+			if replaced:
+				self.EntryCount -= len(replaced[1])
+
+			self.Listings[dirPath] = (state, entries,)
+			self.EntryCount += len(entries)
+
+			while self.EntryCount > self.MaxEntries and len(self.Listings) > 1:
+				evicted = self.Listings.popitem(last=False)[1]
+				self.EntryCount -= len(evicted[1])
+
+		return entries
+
+
+	## Removes a directory's listing
+	#
+	#  \param dirPath
+	#	Directory that was listed
+	def Remove(self, dirPath):
+		with self.Lock:
+			removed = self.Listings.pop(dirPath, None)
+			if removed:
+				self.EntryCount -= len(removed[1])
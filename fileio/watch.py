@@ -0,0 +1,380 @@
+# -*- coding: utf-8 -*-
+
+## \package fileio.watch
+#
+#  Watching directories for changes using inotify, or polling if unavailable
+
+# MIT licensing
+# See: docs/LICENSE.txt
+
+
+import ctypes, ctypes.util, errno, os, select, struct, sys, threading, time
+
+from dbr.log			import Logger
+from globals.threads	import Thread
+
+
+## inotify event masks (see: linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_NONBLOCK = 0x00000800
+IN_CLOEXEC = 0x00080000
+
+## Events that can change status of files inside a watched directory
+IN_WATCH_MASK = IN_MODIFY|IN_ATTRIB|IN_CLOSE_WRITE|IN_MOVED_FROM|IN_MOVED_TO|IN_CREATE \
+		|IN_DELETE|IN_DELETE_SELF|IN_MOVE_SELF|IN_ONLYDIR
+
+## Header of inotify_event struct: wd, mask, cookie, len
+INOTIFY_EVENT = struct.Struct(u'iIII'.encode(u'ascii'))
+
+
+## Loads inotify functions from the C library
+#
+#  \return
+#	\b \e ctypes.CDLL instance or \b \e None if inotify is not available
+def _load_inotify():
+	try:
+		libc = ctypes.CDLL(ctypes.util.find_library(u'c'), use_errno=True)
+
+		libc.inotify_init1.argtypes = (ctypes.c_int,)
+		libc.inotify_add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32,)
+		libc.inotify_rm_watch.argtypes = (ctypes.c_int, ctypes.c_int,)
+
+		return libc
+
+	except (AttributeError, OSError, TypeError):
+		return None
+
+
+libc = _load_inotify()
+
+
+## Watches a set of directories in a background thread
+#
+#  Changed directories are collected & passed to a callback at most once
+#  per interval so that bursts of filesystem events cause a single update.
+#  inotify is used when available, otherwise directory modification times
+#  are polled (attribute changes of files are only detected with inotify).
+#  Directories that inotify cannot watch, like missing directories or ones
+#  beyond the watch limit, are polled less often the longer they stay
+#  unchanged.
+class DirectoryWatcher:
+	## Constructor
+	#
+	#  \param callback
+	#	Function called from the watcher thread with a \b \e set of changed directories
+	#  \param interval
+	#	Minimum time in seconds between callbacks
+	#  \param pollInterval
+	#	Time in seconds between checks when inotify is not available
+	#  \param maxPollInterval
+	#	Maximum time in seconds between checks of directories that inotify
+	#	cannot watch
+	def __init__(self, callback, interval=0.3, pollInterval=2.0, maxPollInterval=60.0):
+		self.Callback = callback
+		self.Interval = interval
+		self.PollInterval = pollInterval
+		self.MaxPollInterval = maxPollInterval
+
+		## Directories requested to be watched
+		self.Directories = frozenset()
+
+		## Set to stop current watcher thread
+		self.StopEvent = threading.Event()
+		self.Thread = None
+
+
+	## Adds an inotify watch for a directory
+	#
+	#  \param fd
+	#	inotify file descriptor
+	#  \param watches
+	#	\b \e Dictionary of watch descriptors mapped to directories
+	#  \param path
+	#	Directory to watch
+	#  \return
+	#	\b \e True if directory is watched
+	def _add_watch(self, fd, watches, path):
+		c_path = path
+		if not isinstance(c_path, bytes):
+			c_path = c_path.encode(sys.getfilesystemencoding())
+
+		wd = libc.inotify_add_watch(fd, c_path, IN_WATCH_MASK)
+		if wd < 0:
+			return False
+
+		watches[wd] = path
+
+		return True
+
+
+	## Retrieves directory modification time & inode for polling
+	#
+	#  \return
+	#	\b \e Tuple of (mtime, inode) or \b \e None if directory does not exist
+	def _get_dir_state(self, path):
+		try:
+			d_stat = os.stat(path)
+
+			return (d_stat.st_mtime, d_stat.st_ino,)
+
+		except OSError:
+			return None
+
+
+	## Adds inotify watches for new directories & removes watches for old ones
+	#
+	#  \param fd
+	#	inotify file descriptor
+	#  \param watches
+	#	\b \e Dictionary of watch descriptors mapped to directories
+	#  \return
+	#	\b \e Set of directories that could not be watched
+	def _sync_watches(self, fd, watches):
+		wanted = self.Directories
+		watched = {}
+
+		for WD, DIR in list(watches.items()):
+			if DIR in wanted:
+				watched[DIR] = WD
+
+			else:
+				libc.inotify_rm_watch(fd, WD)
+				watches.pop(WD)
+
+		unwatched = set()
+
+		for DIR in wanted:
+			if DIR not in watched and not self._add_watch(fd, watches, DIR):
+				unwatched.add(DIR)
+
+		return unwatched
+
+
+	## Checks polled directories that are due & schedules their next check
+	#
+	#  The delay before the next check doubles each time a directory is
+	#  found unchanged, up to 'maxDelay', & is reset when it changes.
+	#
+	#  \param polled
+	#	\b \e Dictionary of directories mapped to [state, delay, next check time] lists
+	#  \param maxDelay
+	#	Maximum time in seconds between checks
+	#  \return
+	#	\b \e Set of directories that changed
+	def _poll_directories(self, polled, maxDelay):
+		now = time.time()
+		changed = set()
+
+		for DIR, POLL in polled.items():
+			if POLL[2] > now:
+				continue
+
+			state = self._get_dir_state(DIR)
+
+			if state != POLL[0]:
+				changed.add(DIR)
+
+				POLL[0] = state
+				POLL[1] = self.PollInterval
+
+			else:
+				POLL[1] = min(POLL[1] * 2, maxDelay)
+
+			POLL[2] = now + POLL[1]
+
+		return changed
+
+
+	## Starts polling a directory
+	#
+	#  \param polled
+	#	\b \e Dictionary of directories mapped to [state, delay, next check time] lists
+	#  \param path
+	#	Directory to poll
+	def _start_polling(self, polled, path):
+		polled[path] = [self._get_dir_state(path), self.PollInterval, time.time() + self.PollInterval]
+
+
+	## Tests if watcher thread is running & has not been told to stop
+	def IsRunning(self):
+		return self.Thread != None and self.Thread.is_alive() and not self.StopEvent.is_set()
+
+
+	## Watches directories using inotify
+	#
+	#  \param stopEvent
+	#	<b><i>threading.Event</i></b> that stops this thread when set
+	#  \return
+	#	\b \e False if inotify could not be initialized
+	def RunInotify(self, stopEvent):
+		if not libc:
+			return False
+
+		fd = libc.inotify_init1(IN_NONBLOCK|IN_CLOEXEC)
+		if fd < 0:
+			Logger.Warn(__name__, u'Could not initialize inotify: {}'.format(os.strerror(ctypes.get_errno())))
+
+			return False
+
+		Logger.Debug(__name__, u'Watching directories with inotify')
+
+		watches = {}
+		current = None
+
+		## Directories that could not be watched, polled instead
+		polled = {}
+
+		pending = set()
+		pending_since = None
+
+		try:
+			while not stopEvent.is_set():
+				if current is not self.Directories:
+					current = self.Directories
+					unwatched = self._sync_watches(fd, watches)
+
+					for DIR in set(polled) - unwatched:
+						polled.pop(DIR)
+
+					for DIR in unwatched - set(polled):
+						self._start_polling(polled, DIR)
+
+				elif polled:
+					for DIR in self._poll_directories(polled, self.MaxPollInterval):
+						pending.add(DIR)
+
+						# Directory may have been created or become accessible
+						if self._add_watch(fd, watches, DIR):
+							polled.pop(DIR)
+
+				try:
+					ready = select.select((fd,), (), (), self.Interval)[0]
+
+				except select.error as e:
+					if e.args[0] == errno.EINTR:
+						continue
+
+					raise
+
+				if ready:
+					try:
+						data = os.read(fd, 65536)
+
+					except OSError as e:
+						if e.errno in (errno.EAGAIN, errno.EINTR):
+							continue
+
+						raise
+
+					offset = 0
+					while offset + INOTIFY_EVENT.size <= len(data):
+						wd, mask, cookie, name_len = INOTIFY_EVENT.unpack_from(data, offset)
+						offset += INOTIFY_EVENT.size + name_len
+
+						if mask & IN_Q_OVERFLOW:
+							# Events were dropped, check everything
+							pending.update(current)
+
+						elif wd in watches:
+							pending.add(watches[wd])
+
+							if mask & IN_IGNORED:
+								# Directory was removed or unmounted
+								self._start_polling(polled, watches.pop(wd))
+
+				if pending and pending_since == None:
+					pending_since = time.time()
+
+				if pending and (not ready or time.time() - pending_since >= self.Interval):
+					self.Callback(pending)
+
+					pending = set()
+					pending_since = None
+
+		finally:
+			os.close(fd)
+
+		return True
+
+
+	## Watches directories by polling modification times
+	#
+	#  \param stopEvent
+	#	<b><i>threading.Event</i></b> that stops this thread when set
+	def RunPolling(self, stopEvent):
+		Logger.Debug(__name__, u'Watching directories by polling')
+
+		polled = {}
+
+		while not stopEvent.is_set():
+			current = self.Directories
+
+			for DIR in set(polled) - current:
+				polled.pop(DIR)
+
+			for DIR in current - set(polled):
+				self._start_polling(polled, DIR)
+
+			# Without inotify every directory is checked at the same interval
+			changed = self._poll_directories(polled, self.PollInterval)
+
+			if changed:
+				self.Callback(changed)
+
+			stopEvent.wait(self.PollInterval)
+
+
+	## Watcher thread target
+	#
+	#  \param stopEvent
+	#	<b><i>threading.Event</i></b> that stops this thread when set
+	def Run(self, stopEvent):
+		try:
+			if not self.RunInotify(stopEvent):
+				self.RunPolling(stopEvent)
+
+		except:
+			Logger.Error(__name__, u'Directory watcher stopped unexpectedly: {}'.format(sys.exc_info()[1]))
+
+
+	## Sets the directories to watch
+	#
+	#  Can be called from any thread.
+	#
+	#  \param dirs
+	#	Iterable of absolute directory paths
+	def SetDirectories(self, dirs):
+		self.Directories = frozenset(dirs)
+
+
+	## Starts watcher thread
+	def Start(self):
+		if self.IsRunning():
+			return True
+
+		# A thread that is still stopping exits on its own, so new one gets its own stop event
+		self.StopEvent = threading.Event()
+		self.Thread = Thread(self.Run, self.StopEvent)
+
+		# Do not keep application running
+		self.Thread.daemon = True
+
+		return self.Thread.Start()
+
+
+	## Stops watcher thread
+	#
+	#  The thread exits after its current wait interval.
+	def Stop(self):
+		self.StopEvent.set()
@@ -6,33 +6,45 @@
 # See: docs/LICENSE.txt
 
 
-import os
+import os, re, select
 
 from dbr.log		import Logger
 from fileio.fileio	import ReadFile
 from globals.paths	import ConcatPaths
 
 
+## Prefixes of device nodes that are listed as storage devices
+# FIXME: Identify labels for different systems & drive types
+device_labels = (
+	u'/dev/sd',
+	)
+
+## Device node prefixes mapped to types used for icons
+device_types = {
+	u'/dev/sd': u'drive-fixed',
+	u'/dev/hd': u'drive-fixed',
+	u'/dev/pd': u'drive-fixed',
+	u'/dev/fd': u'drive-floppy',
+	}
+
+
 ## Class that represents a mounted storage device
 class StorageDevice:
-	def __init__(self, node, mount_point):
+	## Constructor
+	#
+	#  \param node
+	#	Device node (e.g. /dev/sda1)
+	#  \param mount_point
+	#	Directory where device is mounted
+	#  \param label
+	#	Filesystem label, or \b \e None to use mount point basename
+	#  \param dev_paths
+	#	Names of links in /dev/disk/by-path that point to node
+	def __init__(self, node, mount_point, label=None, dev_paths=()):
 		self.Node = node
 		self.MountPoint = mount_point
 
-		self.Label = None
-
-		label_dir = u'/dev/disk/by-label'
-		if os.path.isdir(label_dir):
-			for LABEL in os.listdir(label_dir):
-				link = ConcatPaths((label_dir, LABEL))
-
-				if os.path.islink(link):
-					link_node = os.path.realpath(link)
-					if link_node == self.Node:
-						Logger.Debug(__name__, u'Found label for {}: {}'.format(self.Node, LABEL))
-
-						self.Label = LABEL
-						break
+		self.Label = label
 
 		# As last resort just use mount point basename
 		if not self.Label:
@@ -42,13 +54,6 @@ class StorageDevice:
 			else:
 				self.Label = os.path.basename(mount_point)
 
-		device_types = {
-			u'/dev/sd': u'drive-fixed',
-			u'/dev/hd': u'drive-fixed',
-			u'/dev/pd': u'drive-fixed',
-			u'/dev/fd': u'drive-floppy',
-			}
-
 		# The type string is used in ui.tree.DirectroyTree to set item icon
 		self.Type = None
 
@@ -59,23 +64,13 @@ class StorageDevice:
 
 		# Extended device type check
 		# ???: Better method?
-		type_dir = u'/dev/disk/by-path'
-		if os.path.isdir(type_dir):
-			node_types = os.listdir(type_dir)
-			for TYPE in node_types:
-				link = ConcatPaths((type_dir, TYPE))
+		for TYPE in dev_paths:
+			# Ensure we are only dealing with lowercase
+			if u'usb' in TYPE.lower().split(u'-'):
+				Logger.Debug(__name__, u'{} is a removable drive'.format(self.Node))
 
-				if os.path.islink(link):
-					link_node = os.path.realpath(link)
-
-					if link_node == self.Node:
-						# Ensure we are only dealing with lowercase
-						TYPE = TYPE.lower()
-
-						if u'usb' in TYPE.split(u'-'):
-							Logger.Debug(__name__, u'{} is a removable drive'.format(self.Node))
-
-							self.Type = u'removable'
+				self.Type = u'removable'
+				break
 
 
 	## Get the instances string mount point
@@ -83,54 +78,168 @@ class StorageDevice:
 		return self.MountPoint
 
 
-## Opens /etc/mtab file & parses attached storage devices
+## Decodes octal escapes (e.g. '\040' for space) in mount table fields
+def _unescape(field):
+	return re.sub(u'\\\\([0-7]{3})', lambda m: unichr(int(m.group(1), 8)), field)
+
+
+## Maps device nodes to names of links pointing to them in a /dev/disk sub-directory
 #
+#  \param link_dir
+#	Directory containing symbolic links to device nodes
 #  \return
-#	\b \e Dictionary of device labels with mount points
-def ParseMountedDevices():
-	# FIXME: Identify labels for different systems & drive types
-	device_labels = (
-		u'/dev/sd',
-		)
+#	\b \e Dictionary of device nodes mapped to lists of link names
+def _map_links(link_dir):
+	links = {}
 
-	# Empty the device list
-	mounted_devices = {}
+	try:
+		names = os.listdir(link_dir)
 
-	if os.path.isfile(u'/etc/mtab'):
-		mtab = ReadFile(u'/etc/mtab', split=True, convert=list)
+	except OSError:
+		return links
 
-		# Only keep lines referring to devices directory
-		for X in reversed(range(len(mtab))):
-			if not mtab[X].startswith(u'/dev'):
-				mtab.pop(X)
+	for NAME in names:
+		link = ConcatPaths((link_dir, NAME))
 
-		mtab.sort()
+		if os.path.islink(link):
+			links.setdefault(os.path.realpath(link), []).append(NAME)
 
-		for LINE in mtab:
-			LINE = LINE.split(u' ')
+	return links
 
-			device = LINE[0]
-			mount_point = LINE[1]
 
-			for LABEL in device_labels:
-				if device.startswith(LABEL):
-					mounted_devices[device] = mount_point
+## Opens /proc/self/mountinfo, or /etc/mtab if unavailable, & parses attached storage devices
+#
+#  \return
+#	\b \e Dictionary of device nodes with mount points
+def ParseMountedDevices():
+	mounted_devices = {}
+	entries = []
+
+	if os.path.isfile(u'/proc/self/mountinfo'):
+		for LINE in ReadFile(u'/proc/self/mountinfo', split=True, convert=list):
+			# Fields after separator are filesystem type, source & super options
+			fields = LINE.split(u' ')
+			if u'-' not in fields:
+				continue
+
+			sep = fields.index(u'-')
+			if len(fields) > sep + 2:
+				entries.append((_unescape(fields[sep + 2]), _unescape(fields[4]),))
+
+	elif os.path.isfile(u'/etc/mtab'):
+		for LINE in ReadFile(u'/etc/mtab', split=True, convert=list):
+			fields = LINE.split(u' ')
+			if len(fields) > 1:
+				entries.append((_unescape(fields[0]), _unescape(fields[1]),))
 
 	else:
-		Logger.Warn(__name__, u'/etc/mtab file does not exist. Mounted devices list will be empty')
+		Logger.Warn(__name__, u'Mount table not found. Mounted devices list will be empty')
+
+	for DEVICE, MOUNT_POINT in sorted(entries):
+		for LABEL in device_labels:
+			if DEVICE.startswith(LABEL):
+				mounted_devices[DEVICE] = MOUNT_POINT
 
 	return mounted_devices
 
 
-## Retrieves a list of globals.devices.StorageDevice instances
-def GetMountedStorageDevices():
-	mounted_devices = ParseMountedDevices()
+## Cached list of mounted storage devices
+#
+#  The mount table & /dev/disk links are read once & re-read only when
+#  the kernel signals that /proc/self/mounts has changed.
+class DeviceInventory:
+	def __init__(self):
+		## Cached tuple of StorageDevice instances
+		self.Devices = None
+
+		## Device nodes mapped to filesystem labels
+		self.Labels = {}
 
-	device_list = []
+		## Device nodes mapped to /dev/disk/by-path link names
+		self.Paths = {}
 
-	for DEV in sorted(mounted_devices):
-		device_list.append(StorageDevice(DEV, mounted_devices[DEV]))
+		self.MountsFile = None
+		self.Poller = None
 
-	#device_list.sort(key=StorageDevice.GetMountPoint)
+		try:
+			self.MountsFile = open(u'/proc/self/mounts', u'rb')
+			self.Poller = select.poll()
+			self.Poller.register(self.MountsFile, select.POLLPRI|select.POLLERR)
 
-	return tuple(sorted(device_list, key=StorageDevice.GetMountPoint))
+		except (AttributeError, IOError, OSError):
+			Logger.Debug(__name__, u'Cannot poll /proc/self/mounts, devices will be re-read on every request')
+
+			if self.MountsFile:
+				self.MountsFile.close()
+
+			self.MountsFile = None
+			self.Poller = None
+
+
+	## Retrieves mounted storage devices
+	#
+	#  \param force
+	#	If \b \e True, devices are re-read even if mount table has not changed
+	#  \return
+	#	\b \e Tuple of StorageDevice instances sorted by mount point
+	def GetDevices(self, force=False):
+		if force or self.Devices == None or self.HasChanged():
+			self.Refresh()
+
+		return self.Devices
+
+
+	## Checks if mount table has changed since last check
+	#
+	#  \return
+	#	\b \e True if changed or if changes cannot be detected
+	def HasChanged(self):
+		if not self.Poller:
+			return True
+
+		# Kernel resets the event after it has been reported
+		changed = bool(self.Poller.poll(0))
+		if changed:
+			Logger.Debug(__name__, u'Mount table changed')
+
+		return changed
+
+
+	## Re-reads mounted devices, labels & device paths
+	def Refresh(self):
+		mounted_devices = ParseMountedDevices()
+
+		self.Labels = {}
+		if mounted_devices:
+			for NODE, NAMES in _map_links(u'/dev/disk/by-label').items():
+				self.Labels[NODE] = NAMES[0]
+
+			self.Paths = _map_links(u'/dev/disk/by-path')
+
+		else:
+			self.Paths = {}
+
+		device_list = []
+
+		for DEV in sorted(mounted_devices):
+			node = os.path.realpath(DEV)
+
+			label = self.Labels.get(node)
+			if label:
+				Logger.Debug(__name__, u'Found label for {}: {}'.format(DEV, label))
+
+			device_list.append(StorageDevice(DEV, mounted_devices[DEV], label, self.Paths.get(node, ())))
+
+		self.Devices = tuple(sorted(device_list, key=StorageDevice.GetMountPoint))
+
+
+## Shared device inventory
+inventory = DeviceInventory()
+
+
+## Retrieves a list of globals.devices.StorageDevice instances
+#
+#  \param force
+#	If \b \e True, devices are re-read even if mount table has not changed
+def GetMountedStorageDevices(force=False):
+	return inventory.GetDevices(force)
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+## \package globals.fileindex
+#
+#  Maps of file list items to their indexes
+#
+#  Kept separate from input.filelist so it can be used & tested without wx.
+
+# MIT licensing
+# See: docs/LICENSE.txt
+
+
+## Updates path & item index maps after list of items has changed
+#
+#  Only entries at or after 'start' are re-mapped, so appending to
+#  end of list is cheap. Paths are mapped to the index of their first
+#  item, so duplicates do not replace earlier entries.
+#
+#  \param items
+#	\b \e List of items with a 'GetPath' method (e.g. globals.fileitem.FileItem)
+#  \param pathIndexes
+#	\b \e Dictionary of paths mapped to indexes, updated in place
+#  \param itemIndexes
+#	\b \e Dictionary of items mapped to indexes, updated in place
+#  \param start
+#	\b \e Integer index of first item that was inserted, removed, or shifted
+#  \param removed
+#	\b \e List of items that were removed from list
+def UpdateIndexes(items, pathIndexes, itemIndexes, start=0, removed=()):
+	if not start:
+		pathIndexes.clear()
+		itemIndexes.clear()
+
+	for ITEM in removed:
+		itemIndexes.pop(ITEM, None)
+
+	# Paths whose entries were re-mapped during this pass
+	mapped = set()
+
+	for INDEX in range(start, len(items)):
+		ITEM = items[INDEX]
+		path = ITEM.GetPath()
+
+		itemIndexes[ITEM] = INDEX
+
+		# Preserve mappings to earlier duplicates
+		if path not in mapped and pathIndexes.get(path, start) >= start:
+			pathIndexes[path] = INDEX
+			mapped.add(path)
+
+	# Drop stale entries for paths that are no longer in list
+	for ITEM in removed:
+		path = ITEM.GetPath()
+
+		if path not in mapped and pathIndexes.get(path, -1) >= start:
+			del pathIndexes[path]
@@ -6,12 +6,11 @@
 # See: docs/LICENSE.txt
 
 
-import os
+import os, stat
 
 from dbr.colors			import COLOR_dir
 from dbr.colors			import COLOR_executable
 from dbr.colors			import COLOR_link
-from fileio.fileio		import GetTimestamp
 from fileio.fileio		import ReadFile
 from globals.strings	import IsString
 from globals.strings	import TextIsEmpty
@@ -26,25 +25,40 @@ class FileType:
 
 
 ## An object that represents a file
-class FileItem:
+#
+#  File information is read with a single \b \e os.lstat call the first
+#  time it is needed & cached. Call globals.fileitem.FileItem.Refresh to
+#  re-read it.
+class FileItem(object):
+	__slots__ = (
+		u'Path',
+		u'Target',
+		u'IgnoreTimestamp',
+		u'Stat',
+		u'TargetStat',
+		u'Timestamp',
+		)
+
 	def __init__(self, path, target=None, ignore_timestamp=False):
 		self.Path = path
 		self.Target = target
+		self.IgnoreTimestamp = ignore_timestamp
 
-		# Timestamp is set at construction
-		self.Timestamp = None
-		if not ignore_timestamp:
-			self.Timestamp = GetTimestamp(self.Path)
+		## Cached result of os.lstat (None if not read, False if path does not exist)
+		self.Stat = None
 
-		# Defaults to normal file
-		self.Type = FileType.NORM
+		## Cached result of os.stat for symbolic links
+		self.TargetStat = None
 
-		self.SetType()
+		## Timestamp last retrieved with globals.fileitem.FileItem.GetTimestamp
+		#
+		#  \b \e None if not read, \b \e False if file did not exist.
+		self.Timestamp = None
 
 
 	## Checks if the file exists on the filesystem
 	def Exists(self):
-		return os.path.isfile(self.Path)
+		return self.IsFile()
 
 
 	## Retrieves file's basename
@@ -57,6 +71,34 @@ class FileItem:
 		return self.Path
 
 
+	## Retrieves cached status of the file
+	#
+	#  \param follow
+	#	If \b \e True, retrieves status of symbolic link target
+	#  \return
+	#	\b \e posix.stat_result or \b \e False if file does not exist
+	def GetStat(self, follow=False):
+		if self.Stat == None:
+			try:
+				self.Stat = os.lstat(self.Path)
+
+			except OSError:
+				self.Stat = False
+
+		if not follow or not self.Stat or not stat.S_ISLNK(self.Stat.st_mode):
+			return self.Stat
+
+		# Only symbolic links need a second syscall
+		if self.TargetStat == None:
+			try:
+				self.TargetStat = os.stat(self.Path)
+
+			except OSError:
+				self.TargetStat = False
+
+		return self.TargetStat
+
+
 	## Retrieves file's target directory
 	def GetTarget(self):
 		return self.Target
@@ -66,13 +108,29 @@ class FileItem:
 	#
 	#  NOTE: May differ from actual timestamp
 	#		Call 'TimestampChanged' to update
+	#
+	#  \return
+	#	Modification time, \b \e False if file did not exist, or \b \e None
+	#	if timestamp is ignored
 	def GetTimestamp(self):
+		if self.Timestamp == None and not self.IgnoreTimestamp:
+			self.Timestamp = self.ReadTimestamp()
+
 		return self.Timestamp
 
 
 	## Retrieves the file type (normal file, directory, symbolic link, or executable)
 	def GetType(self):
-		return self.Type
+		if self.IsDirectory():
+			return FileType.DIR
+
+		if self.IsSymlink():
+			return FileType.LINK
+
+		if self.IsExecutable():
+			return FileType.EXEC
+
+		return FileType.NORM
 
 
 	## Checks if the file has a target installation directory
@@ -82,22 +140,35 @@ class FileItem:
 
 	## Checks if the item represented is a directory
 	def IsDirectory(self):
-		return os.path.isdir(self.Path)
+		f_stat = self.GetStat(True)
+
+		return bool(f_stat) and stat.S_ISDIR(f_stat.st_mode)
 
 
 	## Checks if the item represented is a regular file
 	def IsFile(self):
-		return os.path.isfile(self.Path)
+		f_stat = self.GetStat(True)
+
+		return bool(f_stat) and stat.S_ISREG(f_stat.st_mode)
 
 
 	## Checks if file is executable
+	#
+	#  Uses permission bits from cached status instead of os.access.
 	def IsExecutable(self):
 		if self.IsFile():
-			return os.access(self.Path, os.X_OK)
+			return bool(self.GetStat(True).st_mode & (stat.S_IXUSR|stat.S_IXGRP|stat.S_IXOTH))
 
 		return False
 
 
+	## Checks if the item represented is a symbolic link
+	def IsSymlink(self):
+		f_stat = self.GetStat()
+
+		return bool(f_stat) and stat.S_ISLNK(f_stat.st_mode)
+
+
 	## Reads file's contents into memory
 	#
 	#  \param split
@@ -111,38 +182,70 @@ class FileItem:
 		return ReadFile(self.Path, split, convert, noStrip)
 
 
+	## Retrieves modification time from cached status
+	#
+	#  \return
+	#	Modification time or \b \e False if file does not exist
+	def ReadTimestamp(self):
+		f_stat = self.GetStat(True)
+
+		if f_stat:
+			return f_stat.st_mtime
+
+		return False
+
+
+	## Discards cached file status so it is read again when needed
+	def Refresh(self):
+		self.Stat = None
+		self.TargetStat = None
+
+
 	## Sets file's path & basename
 	def SetPath(self, path):
 		self.Path = path
 
+		self.Refresh()
+		self.Timestamp = None
+
+
+	## Sets timestamp used to detect changes
+	#
+	#  Avoids reading status of file when its timestamp is already known
+	#  (e.g. from fileio.scan.ScanFileStatus).
+	#
+	#  \param timestamp
+	#	Modification time or \b \e False if file does not exist
+	def SetTimestamp(self, timestamp):
+		if not self.IgnoreTimestamp:
+			self.Timestamp = timestamp
+
 
 	## Sets file's target directory
 	def SetTarget(self, target):
 		self.Target = target
 
 
-	## Sets file type
+	## Re-reads file type from filesystem
 	def SetType(self):
-		if os.path.isdir(self.Path):
-			self.Type = FileType.DIR
-
-		elif os.path.islink(self.Path):
-			self.Type = FileType.LINK
-
-		elif os.access(self.Path, os.X_OK):
-			self.Type = FileType.EXEC
+		self.Refresh()
 
 
 	## Checks if timestamp has been modified & updates
+	#
+	#  A file that is created or deleted is also reported as changed.
 	def TimestampChanged(self):
+		# Status is always read again, so files that were missing are noticed when created
+		self.Refresh()
+
+		current_stamp = self.ReadTimestamp()
+
 		# Set file's timestamp if not already done
-		if not self.Timestamp:
-			self.Timestamp = GetTimestamp(self.Path)
+		if self.Timestamp == None:
+			self.Timestamp = current_stamp
 
 			return False
 
-		current_stamp = GetTimestamp(self.Path)
-
 		if current_stamp != self.Timestamp:
 			self.Timestamp = current_stamp
 
@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+
+## \package globals.installpaths
+#
+#  Index of paths where staged files will be installed
+
+# MIT licensing
+# See: docs/LICENSE.txt
+
+
+import os
+
+from fileio.scan		import WalkFiles
+from globals.paths		import ConcatPaths
+
+
+## Lists files inside a directory with their install paths
+#
+#  The whole directory tree is walked, so this should be called from a
+#  background thread for directories added from the interface.
+#
+#  \param sourcePath
+#	Absolute path of source directory
+#  \param targetDir
+#	Directory where source directory will be installed
+#  \return
+#	\b \e List of (source, install path, relative path) tuples
+def GetDirectoryEntries(sourcePath, targetDir):
+	entries = []
+
+	# Relative paths keep top level directory
+	parent_dir = os.path.dirname(sourcePath)
+
+	for ROOT, FILES in WalkFiles(sourcePath):
+		rel_root = ROOT[len(parent_dir):].strip(u'/')
+
+		for F in FILES:
+			rel_path = u'{}/{}'.format(rel_root, F)
+			entries.append((ConcatPaths((ROOT, F)), ConcatPaths((targetDir, rel_path)), rel_path))
+
+	return entries
+
+
+## Maps install paths of files to their sources
+#
+#  Files inside directories are indexed individually so that a file
+#  added on its own & a file inside an added directory that are
+#  installed to the same path are detected as a collision.
+#
+#  Contents of directories are not read when they are added. Directories
+#  are kept as pending until their entries are set with
+#  globals.installpaths.InstallPathIndex.SetEntries (e.g. from a
+#  background thread using globals.installpaths.GetDirectoryEntries), or
+#  read when their entries are requested.
+class InstallPathIndex:
+	def __init__(self):
+		## Install paths mapped to lists of source paths
+		self.Targets = {}
+
+		## Keys of added items mapped to lists of (source, install path, relative path) tuples
+		self.Items = {}
+
+		## Install paths that have more than one source
+		self.Collisions = set()
+
+		## Keys of directories whose contents are not indexed mapped to (source, target) tuples
+		self.Pending = {}
+
+
+	## Adds a file or directory to the index
+	#
+	#  If 'key' was already added, its previous entries are replaced.
+	#
+	#  \param key
+	#	Hashable object identifying the item (e.g. globals.fileitem.FileItem instance)
+	#  \param sourcePath
+	#	Absolute path of source file or directory
+	#  \param targetDir
+	#	Directory where item will be installed
+	#  \param isDir
+	#	If \b \e True, files inside 'sourcePath' are indexed
+	#  \param entries
+	#	\b \e List of entries of a directory from globals.installpaths.GetDirectoryEntries,
+	#	or \b \e None to add directory as pending
+	#  \return
+	#	\b \e List of install paths that collide with previously added files
+	def Add(self, key, sourcePath, targetDir, isDir=False, entries=None):
+		self.Remove(key)
+
+		if isDir:
+			if entries == None:
+				self.Pending[key] = (sourcePath, targetDir,)
+
+				return []
+
+		else:
+			filename = os.path.basename(sourcePath)
+			entries = [(sourcePath, ConcatPaths((targetDir, filename)), filename)]
+
+		self.Items[key] = entries
+
+		collisions = []
+
+		for SOURCE, INSTALL, REL in entries:
+			if INSTALL not in self.Targets:
+				self.Targets[INSTALL] = [SOURCE]
+				continue
+
+			self.Targets[INSTALL].append(SOURCE)
+			self.Collisions.add(INSTALL)
+			collisions.append(INSTALL)
+
+		return collisions
+
+
+	## Removes all items from the index
+	def Clear(self):
+		self.Targets = {}
+		self.Items = {}
+		self.Collisions = set()
+		self.Pending = {}
+
+
+	## Retrieves install paths that have more than one source
+	#
+	#  Files inside pending directories are not included.
+	#
+	#  \return
+	#	\b \e Set of install paths
+	def GetCollisions(self):
+		return set(self.Collisions)
+
+
+	## Retrieves files indexed for an item
+	#
+	#  Contents of a pending directory are read & indexed first.
+	#
+	#  \param key
+	#	Object used to add item
+	#  \return
+	#	\b \e List of (source, install path, relative path) tuples
+	def GetEntries(self, key):
+		if key in self.Pending:
+			source, target = self.Pending[key]
+			self.SetEntries(key, source, target, GetDirectoryEntries(source, target))
+
+		return list(self.Items.get(key, ()))
+
+
+	## Retrieves directories whose contents are not indexed
+	#
+	#  \return
+	#	\b \e List of (key, source, target) tuples
+	def GetPending(self):
+		return [(K, S, T) for K, (S, T) in self.Pending.items()]
+
+
+	## Retrieves source files that will be installed to a path
+	#
+	#  \param installPath
+	#	Absolute path on target system
+	#  \return
+	#	\b \e Tuple of source paths
+	def GetSources(self, installPath):
+		return tuple(self.Targets.get(installPath, ()))
+
+
+	## Checks if a file will be installed to a path
+	#
+	#  \param installPath
+	#	Absolute path on target system
+	def HasTarget(self, installPath):
+		return installPath in self.Targets
+
+
+	## Removes an item from the index
+	#
+	#  \param key
+	#	Object used to add item
+	def Remove(self, key):
+		self.Pending.pop(key, None)
+
+		for SOURCE, INSTALL, REL in self.Items.pop(key, ()):
+			sources = self.Targets[INSTALL]
+			sources.remove(SOURCE)
+
+			if not sources:
+				self.Targets.pop(INSTALL)
+
+			if len(sources) < 2:
+				self.Collisions.discard(INSTALL)
+
+
+	## Indexes contents of a pending directory
+	#
+	#  Entries are ignored if directory was removed, or added again with a
+	#  different source or target, since they were read.
+	#
+	#  \param key
+	#	Object used to add directory
+	#  \param sourcePath
+	#	Absolute path of source directory that entries were read from
+	#  \param targetDir
+	#	Install directory that entries were read for
+	#  \param entries
+	#	\b \e List of entries from globals.installpaths.GetDirectoryEntries
+	#  \return
+	#	\b \e List of install paths that collide with previously added files,
+	#	or \b \e None if entries are out of date
+	def SetEntries(self, key, sourcePath, targetDir, entries):
+		if self.Pending.get(key) != (sourcePath, targetDir,):
+			return None
+
+		return self.Add(key, sourcePath, targetDir, True, entries)
@@ -6,6 +6,8 @@
 # See: docs/LICENSE.txt
 
 
+import os
+
 from globals.execute import GetCommandOutput
 from globals.execute import GetExecutable
 
@@ -17,4 +19,134 @@ def GetFileMimeType(filename):
 	if not CMD_file:
 		return None
 
-	return GetCommandOutput(CMD_file, (u'--mime-type', u'--brief', filename,))
+	# Filenames beginning with '-' are not read as options
+	return GetCommandOutput(CMD_file, (u'--mime-type', u'--brief', u'--', filename,))
+
+
+## Retrieves MIME types of multiple files
+#
+#  Files are passed to the 'file' command in chunks so that a new process
+#  is not started for every file.
+#
+#  \param filenames
+#	\b \e List of absolute file paths
+#  \param chunkSize
+#	Maximum number of files passed to a single command
+#  \return
+#	\b \e List of MIME types in same order as 'filenames'
+def GetFileMimeTypes(filenames, chunkSize=500):
+	CMD_file = GetExecutable(u'file')
+
+	if not CMD_file:
+		return [None] * len(filenames)
+
+	mime_types = []
+
+	for INDEX in range(0, len(filenames), chunkSize):
+		chunk = list(filenames[INDEX:INDEX+chunkSize])
+		output = GetCommandOutput(CMD_file, [u'--mime-type', u'--brief', u'--',] + chunk).split(u'\n')
+
+		# Output is one line per file, unless a filename contains newline characters
+		if len(output) != len(chunk):
+			output = [GetFileMimeType(F) for F in chunk]
+
+		mime_types += output
+
+	return mime_types
+
+
+## Filename extensions mapped to ui.tree.DirectoryTree image types
+file_extensions = {
+	u'image': (u'bmp', u'gif', u'ico', u'jpeg', u'jpg', u'png', u'svg', u'tga', u'tif', u'tiff',
+			u'webp', u'xcf', u'xpm',),
+	u'audio': (u'aac', u'aif', u'aiff', u'flac', u'm4a', u'mid', u'midi', u'mp3', u'oga', u'ogg',
+			u'opus', u'wav', u'wma',),
+	u'video': (u'avi', u'flv', u'm4v', u'mkv', u'mov', u'mp4', u'mpeg', u'mpg', u'ogv', u'webm',
+			u'wmv',),
+	u'executable-script': (u'bash', u'py', u'pyw', u'sh',),
+	}
+
+## Extensions mapped to image types for faster lookup
+extension_types = {}
+
+for TYPE in file_extensions:
+	for EXT in file_extensions[TYPE]:
+		extension_types[EXT] = TYPE
+
+## Leading bytes of file formats mapped to image types
+magic_numbers = (
+	(b'\x7fELF', u'executable-binary'),
+	(b'\x89PNG', u'image'),
+	(b'\xff\xd8\xff', u'image'),
+	(b'GIF8', u'image'),
+	(b'ID3', u'audio'),
+	(b'fLaC', u'audio'),
+	(b'OggS', u'audio'),
+	(b'\x1aE\xdf\xa3', u'video'),
+	)
+
+## Interpreters of scripts shown as executable scripts
+script_interpreters = (
+	u'bash',
+	u'dash',
+	u'python',
+	u'sh',
+	u'zsh',
+	)
+
+
+## Retrieves image type of a file for ui.tree.DirectoryTree without starting a process
+#
+#  The filename extension is checked first. If it is not recognized, the
+#  first bytes of the file are read to detect executables, scripts, images,
+#  audio & video.
+#
+#  \param filename
+#	Absolute path of file
+#  \return
+#	Image type string (e.g. 'executable-binary', 'image', 'file')
+def GetFileImageType(filename):
+	ext = os.path.splitext(filename)[1][1:].lower()
+
+	if ext in extension_types:
+		return extension_types[ext]
+
+	try:
+		with open(filename, u'rb') as FILE:
+			header = FILE.read(64)
+
+	except (IOError, OSError):
+		return u'file'
+
+	for MAGIC, TYPE in magic_numbers:
+		if header.startswith(MAGIC):
+			return TYPE
+
+	# RIFF & ISO base media containers store format after the header
+	if header.startswith(b'RIFF'):
+		if header[8:12] == b'WAVE':
+			return u'audio'
+
+		if header[8:12] == b'AVI ':
+			return u'video'
+
+	if header[4:8] == b'ftyp':
+		if header[8:11] == b'M4A':
+			return u'audio'
+
+		return u'video'
+
+	if header.startswith(b'#!'):
+		interpreter = header[2:].split(b'\n')[0].strip().split(b' ')
+		command = os.path.basename(interpreter[0])
+
+		# E.g. "#!/usr/bin/env python"
+		if command == b'env' and len(interpreter) > 1:
+			command = interpreter[1]
+
+		command = command.decode(u'utf-8', u'replace').rstrip(u'0123456789.')
+
+		if command in script_interpreters:
+			return u'executable-script'
+
+	return u'file'
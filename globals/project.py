@@ -8,7 +8,8 @@
 
 import wx
 
-from dbr.language import GT
+from dbr.language	import GT
+from globals.ident	import pgid
 
 
 ID_PROJ_L = wx.NewId()
@@ -27,6 +28,17 @@ supported_suffixes = (
 
 PROJ_DEF_L = GT(u'Debreate project files')
 
+## IDs of pages that are saved to project files & their section names, in order
+project_sections = (
+	(pgid.CONTROL, u'CTRL'),
+	(pgid.FILES, u'FILES'),
+	(pgid.SCRIPTS, u'SCRIPTS'),
+	(pgid.CHANGELOG, u'CHANGELOG'),
+	(pgid.COPYRIGHT, u'COPYRIGHT'),
+	(pgid.MENU, u'MENU'),
+	(pgid.BUILD, u'BUILD'),
+	)
+
 project_wildcards = {
 	ID_PROJ_L: (PROJ_DEF_L, (PROJECT_ext, PROJECT_txt)),
 }
@@ -0,0 +1,726 @@
+# -*- coding: utf-8 -*-
+
+## \package globals.projectfile
+#
+#  Reading & writing project files
+#
+#  Projects were saved as text with sections delimited by '<<NAME>>' &
+#  '<</NAME>>' lines (see globals.projectfile.ProjectSections). The
+#  structured format stores sections in a JSON header line, followed by a
+#  manifest of project files in which source & target directories are
+#  stored once in tables & referenced by index. Text projects convert to
+#  the structured format without loss & sections read from either format
+#  are returned as text, so pages are set the same way for both.
+
+# MIT licensing
+# See: docs/LICENSE.txt
+
+
+import json
+from abc import ABCMeta
+from abc import abstractmethod
+
+from fileio.journal	import GetFingerprint
+
+
+## Version of structured project format written by this version of Debreate
+PROJECT_format = 1
+
+## Identifies structured project files
+PROJECT_id = u'debreate-project'
+
+## Number of files stored in each line of a structured manifest
+MANIFEST_chunk = 1000
+
+
+## Formats a file entry as a line of the text format FILES section
+#
+#  \param entry
+#	\b \e Tuple of (filename, source directory, target directory, executable),
+#	with absolute path appended if it does not end with filename
+def FormatFileLine(entry):
+	filename, source, target, executable = entry[:4]
+
+	if len(entry) > 4:
+		path = entry[4]
+
+	else:
+		path = source + filename
+
+	if executable:
+		path = u'{}*'.format(path)
+
+	return u'{} -> {} -> {}'.format(path, filename, target)
+
+
+## Parses a line of the text format FILES section
+#
+#  Source directory is the path without the filename, including the trailing
+#  separator. Missing fields are left empty.
+#
+#  \return
+#	\b \e Tuple of (filename, source directory, target directory, executable),
+#	with absolute path appended if it does not end with filename
+def ParseFileLine(line):
+	fields = line.split(u' -> ')
+	fields += [u''] * (3 - len(fields))
+
+	path = fields[0]
+	executable = path.endswith(u'*')
+	if executable:
+		path = path[:-1]
+
+	filename = fields[1]
+	source = path[:len(path) - len(filename)]
+
+	if not path.endswith(filename):
+		return (filename, source, fields[2], executable, path,)
+
+	return (filename, source, fields[2], executable,)
+
+
+## Abstract base class for lists of project files that are parsed in chunks when accessed
+#
+#  Files are retrieved as records of (filename, source directory, target
+#  directory, executable) as used by input.filelist.FileList, by index or
+#  slice. Only the chunks containing requested files are parsed, so a list
+#  can be read in batches from a background thread.
+#
+#  Inheriting classes define how a chunk is parsed (see ParseChunk) &
+#  cannot be instantiated without doing so.
+class FileManifest(object):
+	__metaclass__ = ABCMeta
+
+	## Constructor
+	#
+	#  \param flag
+	#	First line of text format FILES section, '1' if files are used
+	#  \param count
+	#	Number of files
+	#  \param chunkSize
+	#	Number of files parsed at once
+	def __init__(self, flag, count, chunkSize=MANIFEST_chunk):
+		self.Flag = flag
+		self.Count = count
+		self.ChunkSize = chunkSize
+
+		## Chunk indexes mapped to parsed entries
+		self.Chunks = {}
+
+
+	## Retrieves a record or list of records
+	#
+	#  Slices with steps are not supported.
+	def __getitem__(self, index):
+		if isinstance(index, slice):
+			start, end = index.indices(self.Count)[:2]
+
+			return [self.GetRecord(E) for E in self.GetEntries(start, end)]
+
+		if index < 0:
+			index += self.Count
+
+		if not 0 <= index < self.Count:
+			raise IndexError(u'File manifest index out of range')
+
+		return self.GetRecord(self.GetEntries(index, index + 1)[0])
+
+
+	## Retrieves number of files
+	def __len__(self):
+		return self.Count
+
+
+	## Formats body of text format FILES section
+	def FormatSection(self):
+		lines = [self.Flag]
+		lines += [FormatFileLine(E) for E in self.GetEntries(0, self.Count)]
+
+		return u'\n'.join(lines)
+
+
+	## Retrieves parsed entries of a chunk
+	#
+	#  \param index
+	#	Index of chunk
+	#  \return
+	#	\b \e List of entries (see globals.projectfile.ParseFileLine)
+	def GetChunk(self, index):
+		# Chunks may be parsed twice if read from two threads at once, but are
+		# never changed, so the result is the same
+		entries = self.Chunks.get(index)
+
+		if entries == None:
+			entries = self.ParseChunk(index)
+			self.Chunks[index] = entries
+
+		return entries
+
+
+	## Retrieves parsed entries in a range
+	#
+	#  \param start
+	#	Index of first file
+	#  \param end
+	#	Index after last file
+	def GetEntries(self, start, end):
+		entries = []
+
+		if start >= end:
+			return entries
+
+		for CHUNK in range(start // self.ChunkSize, (end - 1) // self.ChunkSize + 1):
+			offset = CHUNK * self.ChunkSize
+
+			entries += self.GetChunk(CHUNK)[max(0, start - offset):end - offset]
+
+		return entries
+
+
+	## Converts an entry to a file list record
+	def GetRecord(self, entry):
+		if len(entry) > 4:
+			return entry[:4]
+
+		return entry
+
+
+	## Checks if files are used by project
+	def IsEnabled(self):
+		return self.Flag.strip().isdigit() and int(self.Flag) != 0
+
+
+	## Parses entries of a chunk
+	#
+	#  \param index
+	#	Index of chunk
+	#  \return
+	#	\b \e List of entries (see globals.projectfile.ParseFileLine)
+	@abstractmethod
+	def ParseChunk(self, index):
+		pass
+
+
+	## Retrieves records in reverse order
+	#
+	#  \return
+	#	globals.projectfile.ReversedManifest instance
+	def Reversed(self):
+		return ReversedManifest(self)
+
+
+## Read-only view of a globals.projectfile.FileManifest in reverse order
+class ReversedManifest:
+	def __init__(self, manifest):
+		self.Manifest = manifest
+
+
+	## Retrieves a record or list of records
+	#
+	#  Slices with steps are not supported.
+	def __getitem__(self, index):
+		count = len(self.Manifest)
+
+		if isinstance(index, slice):
+			start, end = index.indices(count)[:2]
+
+			if start >= end:
+				return []
+
+			# Parse range from the manifest & reverse it
+			records = self.Manifest[count - end:count - start]
+			records.reverse()
+
+			return records
+
+		if index < 0:
+			index += count
+
+		return self.Manifest[count - 1 - index]
+
+
+	## Retrieves number of files
+	def __len__(self):
+		return len(self.Manifest)
+
+
+## List of project files from text format FILES section
+class TextManifest(FileManifest):
+	## Constructor
+	#
+	#  \param data
+	#	\b \e Unicode body of FILES section
+	def __init__(self, data, chunkSize=MANIFEST_chunk):
+		lines = data.split(u'\n')
+
+		self.Data = data
+		self.Lines = [L for L in lines[1:] if L.strip()]
+
+		## Number of lines after flag, including empty lines
+		self.LineCount = len(lines) - 1
+
+		FileManifest.__init__(self, lines[0], len(self.Lines), chunkSize)
+
+
+	## Formats body of text format FILES section
+	def FormatSection(self):
+		return self.Data
+
+
+	## Checks if section can be stored as a structured manifest without changes
+	#
+	#  Lines that are empty or do not have exactly three fields cannot be stored.
+	def IsLossless(self):
+		if self.LineCount != self.Count:
+			return False
+
+		for INDEX in range(0, self.Count, self.ChunkSize):
+			lines = self.Lines[INDEX:INDEX+self.ChunkSize]
+
+			for LINE, ENTRY in zip(lines, self.GetChunk(INDEX // self.ChunkSize)):
+				if FormatFileLine(ENTRY) != LINE:
+					return False
+
+		return True
+
+
+	## Parses lines of a chunk
+	def ParseChunk(self, index):
+		start = index * self.ChunkSize
+
+		return [ParseFileLine(L) for L in self.Lines[start:start+self.ChunkSize]]
+
+
+## List of project files from structured project manifest
+#
+#  The first line of the manifest contains tables of source & target
+#  directories. Each following line is a JSON object with lists of up to
+#  globals.projectfile.MANIFEST_chunk filenames & indexes of their source &
+#  target directories in the tables, indexes of executable files in the
+#  chunk & absolute paths of files whose path does not end with the filename.
+class StructuredManifest(FileManifest):
+	## Constructor
+	#
+	#  \param data
+	#	\b \e Unicode text of project file
+	#  \param offset
+	#	Index of first character of manifest in data
+	#  \param info
+	#	\b \e Dictionary of 'flag', 'count' & 'chunk' values from project header
+	def __init__(self, data, offset, info):
+		FileManifest.__init__(self, info.get(u'flag', u'0'), info.get(u'count', 0),
+				info.get(u'chunk', MANIFEST_chunk))
+
+		self.Data = data
+
+		## Directory tables, read when first chunk is parsed
+		self.Sources = None
+		self.Targets = None
+
+		## Offsets of manifest lines
+		#
+		#  Only line ends are searched for here, lines are decoded when needed.
+		self.Lines = []
+
+		data_len = len(data)
+		while offset < data_len:
+			line_end = data.find(u'\n', offset)
+			if line_end < 0:
+				line_end = data_len
+
+			self.Lines.append((offset, line_end,))
+			offset = line_end + 1
+
+
+	## Parses a manifest line
+	def LoadLine(self, index):
+		if index >= len(self.Lines):
+			raise ValueError(u'Project manifest is incomplete')
+
+		start, end = self.Lines[index]
+
+		return json.loads(self.Data[start:end])
+
+
+	## Parses entries of a chunk
+	def ParseChunk(self, index):
+		if self.Sources == None:
+			tables = self.LoadLine(0)
+
+			self.Targets = tables[u'targets']
+			self.Sources = tables[u'sources']
+
+		chunk = self.LoadLine(index + 1)
+		filenames = chunk[u'filenames']
+
+		executables = [False] * len(filenames)
+		for INDEX in chunk.get(u'executables', []):
+			executables[INDEX] = True
+
+		entries = list(zip(filenames, map(self.Sources.__getitem__, chunk[u'sources']),
+				map(self.Targets.__getitem__, chunk[u'targets']), executables))
+
+		for INDEX, PATH in chunk.get(u'paths', []):
+			entries[INDEX] += (PATH,)
+
+		return entries
+
+
+## Index of sections in project file text
+#
+#  Text is scanned once & the offsets of each top-level section are
+#  recorded, so that a section's contents are only copied when requested.
+#  Sections are delimited by lines '<<NAME>>' & '<</NAME>>'. Sections
+#  nested inside another section are not indexed, but the contents of a
+#  section can be indexed separately with a new instance.
+class ProjectSections:
+	## Constructor
+	#
+	#  \param data
+	#	\b \e Unicode text of project file or section
+	def __init__(self, data):
+		self.Data = data
+
+		## Section names mapped to (start, end) offsets of contents
+		self.Sections = {}
+
+		## Section names in the order they appear
+		self.Order = []
+
+		self.Scan()
+
+
+	## Retrieves contents of a section
+	#
+	#  \param name
+	#	Section name without delimiters (e.g. u'CTRL')
+	#  \param default
+	#	Value returned if section is not found
+	#  \return
+	#	\b \e Unicode text between section delimiters
+	def Get(self, name, default=None):
+		if name not in self.Sections:
+			return default
+
+		start, end = self.Sections[name]
+
+		return self.Data[start:end]
+
+
+	## Retrieves fingerprint of a section with its delimiters
+	#
+	#  \param name
+	#	Section name without delimiters
+	#  \return
+	#	\b \e String hex digest, or \b \e None if section is not found
+	def GetFingerprint(self, name):
+		if name not in self.Sections:
+			return None
+
+		return GetFingerprint(self.GetFormatted(name))
+
+
+	## Retrieves a section with its delimiters
+	#
+	#  \param name
+	#	Section name without delimiters
+	#  \return
+	#	\b \e Unicode text formatted as pages' save data, or \b \e None if not found
+	def GetFormatted(self, name):
+		if name not in self.Sections:
+			return None
+
+		return u'<<{0}>>\n{1}\n<</{0}>>'.format(name, self.Get(name))
+
+
+	## Retrieves first line of text
+	#
+	#  For project files this identifies the application & version that saved it
+	#  (e.g. '[DEBREATE-0.7.13]').
+	def GetHeader(self):
+		return self.Data.split(u'\n', 1)[0]
+
+
+	## Retrieves list of project files from FILES section
+	#
+	#  \return
+	#	globals.projectfile.TextManifest instance, or \b \e None if section is not found
+	def GetManifest(self):
+		if not self.HasSection(u'FILES'):
+			return None
+
+		return TextManifest(self.Get(u'FILES'))
+
+
+	## Retrieves names of indexed sections in the order they appear
+	def GetSectionNames(self):
+		return tuple(self.Order)
+
+
+	## Checks if a section was found
+	def HasSection(self, name):
+		return name in self.Sections
+
+
+	## Checks if text begins with a Debreate project header
+	def IsProject(self):
+		return self.GetHeader().lstrip(u'[').startswith(u'DEBREATE')
+
+
+	## Records offsets of top-level sections
+	#
+	#  Contents of a section are skipped by searching directly for its
+	#  closing delimiter, so text is only scanned once.
+	def Scan(self):
+		data = self.Data
+		data_len = len(data)
+		pos = 0
+
+		while pos < data_len:
+			if data.startswith(u'<<', pos) and (pos == 0 or data[pos-1] == u'\n'):
+				start = pos
+
+			else:
+				start = data.find(u'\n<<', pos)
+				if start < 0:
+					break
+
+				start += 1
+
+			line_end = data.find(u'\n', start)
+			if line_end < 0:
+				line_end = data_len
+
+			tag = data[start:line_end]
+
+			if tag.startswith(u'<</') or not tag.endswith(u'>>'):
+				pos = line_end
+				continue
+
+			name = tag[2:-2]
+			close = u'\n<</{}>>'.format(name)
+
+			# Searching from end of opening line also finds empty sections
+			end = data.find(close, line_end)
+			if end < 0:
+				# Section is not closed, contents run to end of text
+				end = data_len
+				pos = data_len
+
+			else:
+				pos = end + len(close)
+
+			if name not in self.Sections:
+				self.Sections[name] = (min(line_end + 1, end), end,)
+				self.Order.append(name)
+
+
+## Structured project file
+#
+#  Provides the same interface as globals.projectfile.ProjectSections. The
+#  header is parsed when the project is read, the file manifest only when
+#  files are requested.
+class StructuredProject(ProjectSections):
+	## Retrieves contents of a section
+	#
+	#  The FILES section is formatted from the manifest, so all files are parsed.
+	def Get(self, name, default=None):
+		if name not in self.Sections:
+			return default
+
+		if name == u'FILES' and self.Manifest:
+			return self.Manifest.FormatSection()
+
+		return self.Sections[name]
+
+
+	## Retrieves fingerprint of a section with its delimiters
+	#
+	#  The fingerprint of the FILES section is stored in the header, so the
+	#  manifest does not need to be parsed.
+	def GetFingerprint(self, name):
+		if name == u'FILES' and self.Manifest and self.FilesInfo.get(u'fingerprint'):
+			return self.FilesInfo[u'fingerprint']
+
+		return ProjectSections.GetFingerprint(self, name)
+
+
+	## Retrieves header in text format (e.g. '[DEBREATE-0.7.13]')
+	def GetHeader(self):
+		return u'[DEBREATE-{}]'.format(self.Header.get(u'application', u''))
+
+
+	## Retrieves list of project files
+	#
+	#  \return
+	#	globals.projectfile.FileManifest instance, or \b \e None if project has no FILES section
+	def GetManifest(self):
+		if self.Manifest:
+			return self.Manifest
+
+		return ProjectSections.GetManifest(self)
+
+
+	## Checks if header identifies a project of a supported version
+	def IsProject(self):
+		if self.Header.get(u'format') != PROJECT_id:
+			return False
+
+		version = self.Header.get(u'version')
+
+		return isinstance(version, int) and version <= PROJECT_format
+
+
+	## Parses header line
+	def Scan(self):
+		self.Header = {}
+		self.FilesInfo = {}
+		self.Manifest = None
+
+		header_end = self.Data.find(u'\n')
+		if header_end < 0:
+			header_end = len(self.Data)
+
+		try:
+			self.Header = json.loads(self.Data[:header_end])
+
+		except ValueError:
+			return
+
+		if not isinstance(self.Header, dict) or not self.IsProject():
+			return
+
+		for NAME, TEXT in self.Header.get(u'sections', []):
+			if NAME not in self.Sections:
+				self.Sections[NAME] = TEXT
+				self.Order.append(NAME)
+
+		self.FilesInfo = self.Header.get(u'files', {})
+
+		# Section text is stored in header if it could not be stored in manifest
+		if self.FilesInfo and u'FILES' not in self.Sections:
+			self.Manifest = StructuredManifest(self.Data, header_end + 1, self.FilesInfo)
+
+			self.Sections[u'FILES'] = None
+			self.Order.append(u'FILES')
+
+
+## Formats a project in the structured format
+#
+#  \param project
+#	globals.projectfile.ProjectSections instance
+#  \param application
+#	Version string of Debreate saving the project
+#  \return
+#	\b \e Unicode text of project file
+def FormatProject(project, application):
+	sections = []
+	manifest = None
+
+	for NAME in project.GetSectionNames():
+		if NAME == u'FILES':
+			manifest = project.GetManifest()
+
+			# Text is kept as is if it cannot be converted exactly
+			if isinstance(manifest, TextManifest) and not manifest.IsLossless():
+				manifest = None
+
+			if manifest:
+				continue
+
+		sections.append([NAME, project.Get(NAME)])
+
+	header = {
+		u'format': PROJECT_id,
+		u'version': PROJECT_format,
+		u'application': application,
+		u'sections': sections,
+		}
+
+	lines = []
+
+	if manifest:
+		header[u'files'] = {
+			u'flag': manifest.Flag,
+			u'count': manifest.Count,
+			u'chunk': MANIFEST_chunk,
+			u'fingerprint': project.GetFingerprint(u'FILES'),
+			}
+
+		lines = FormatManifest(manifest)
+
+	lines.insert(0, json.dumps(header, sort_keys=True, separators=(u',', u':')))
+
+	return u'\n'.join(lines)
+
+
+## Formats lines of a structured manifest
+#
+#  \param manifest
+#	globals.projectfile.FileManifest instance
+#  \return
+#	\b \e List of lines
+def FormatManifest(manifest):
+	sources = []
+	targets = []
+	source_index = {}
+	target_index = {}
+
+	chunks = []
+
+	for START in range(0, manifest.Count, MANIFEST_chunk):
+		chunk = {
+			u'filenames': [],
+			u'sources': [],
+			u'targets': [],
+			}
+
+		executables = []
+		paths = []
+
+		for INDEX, ENTRY in enumerate(manifest.GetEntries(START, START + MANIFEST_chunk)):
+			filename, source, target, executable = ENTRY[:4]
+
+			if source not in source_index:
+				source_index[source] = len(sources)
+				sources.append(source)
+
+			if target not in target_index:
+				target_index[target] = len(targets)
+				targets.append(target)
+
+			chunk[u'filenames'].append(filename)
+			chunk[u'sources'].append(source_index[source])
+			chunk[u'targets'].append(target_index[target])
+
+			if executable:
+				executables.append(INDEX)
+
+			# Path that does not end with filename is stored whole
+			if len(ENTRY) > 4:
+				paths.append([INDEX, ENTRY[4]])
+
+		if executables:
+			chunk[u'executables'] = executables
+
+		if paths:
+			chunk[u'paths'] = paths
+
+		chunks.append(json.dumps(chunk, sort_keys=True, separators=(u',', u':')))
+
+	tables = json.dumps({u'sources': sources, u'targets': targets,}, sort_keys=True, separators=(u',', u':'))
+
+	return [tables] + chunks
+
+
+## Reads a project file in text or structured format
+#
+#  \param data
+#	\b \e Unicode text of project file
+#  \return
+#	globals.projectfile.StructuredProject or globals.projectfile.ProjectSections instance
+def ReadProject(data):
+	if data.startswith(u'{'):
+		return StructuredProject(data)
+
+	return ProjectSections(data)
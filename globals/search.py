@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+
+## \package globals.search
+#
+#  Searching for files by name
+
+# MIT licensing
+# See: docs/LICENSE.txt
+
+
+import os, threading
+from bisect import bisect_left
+
+from fileio.scan		import scandir
+from globals.paths		import ConcatPaths
+from globals.threads	import Thread
+
+
+## Index of file & directory names under a root directory
+#
+#  The index is built in a background thread & kept sorted by lowercase
+#  name so that prefix searches are done with a binary search. Searches
+#  made while the index is being built scan the entries found so far.
+class FilenameIndex:
+	## Constructor
+	#
+	#  \param maxEntries
+	#	Maximum number of files & directories to index
+	def __init__(self, maxEntries=200000):
+		self.MaxEntries = maxEntries
+
+		## Directory being indexed
+		self.Root = None
+
+		## Whether hidden files & directories are indexed
+		self.ShowHidden = False
+
+		## List of (lowercase name, path) tuples
+		self.Entries = []
+
+		## Set when index is complete & sorted
+		self.Sorted = False
+
+		## Set if index was stopped at maximum number of entries
+		self.Truncated = False
+
+		## Stops current build when set & identifies it to its thread
+		self.StopEvent = threading.Event()
+		self.Thread = None
+
+		## Keeps threads of cancelled builds from replacing results of current build
+		self.Lock = threading.Lock()
+
+
+	## Starts building the index in a background thread
+	#
+	#  Any index currently being built is cancelled.
+	#
+	#  \param root
+	#	Directory to index
+	#  \param showHidden
+	#	If \b \e True, names beginning with '.' are indexed
+	#  \param callback
+	#	Function called from background thread with this instance & build's
+	#	<b><i>threading.Event</i></b> when index is complete
+	#	\see globals.search.FilenameIndex.IsCurrent
+	def Build(self, root, showHidden=False, callback=None):
+		with self.Lock:
+			self.Cancel()
+
+			self.Root = root
+			self.ShowHidden = showHidden
+			self.Entries = []
+			self.Sorted = False
+			self.Truncated = False
+
+			self.StopEvent = threading.Event()
+
+		self.Thread = Thread(self.Index, root, showHidden, self.StopEvent, callback)
+
+		# Do not keep application running
+		self.Thread.daemon = True
+
+		return self.Thread.Start()
+
+
+	## Stops building the index
+	def Cancel(self):
+		self.StopEvent.set()
+
+
+	## Builds the index
+	#
+	#  Called from background thread. Symbolic links to directories are not followed.
+	#  Results are discarded if another build was started in the meantime.
+	#
+	#  \param root
+	#	Directory to index
+	#  \param showHidden
+	#	If \b \e True, names beginning with '.' are indexed
+	#  \param stopEvent
+	#	<b><i>threading.Event</i></b> that stops indexing when set
+	#  \param callback
+	#	Function called with this instance when index is complete
+	def Index(self, root, showHidden, stopEvent, callback):
+		entries = []
+		truncated = False
+
+		# Searches made while building scan entries found so far
+		with self.Lock:
+			if not self.IsCurrent(stopEvent):
+				return
+
+			self.Entries = entries
+
+		dirs = [root]
+
+		while dirs and not stopEvent.is_set():
+			dir_path = dirs.pop()
+
+			try:
+				if scandir:
+					children = [(E.name, E.path, E.is_dir(follow_symlinks=False),) for E in scandir(dir_path)]
+
+				else:
+					children = []
+
+					for NAME in os.listdir(dir_path):
+						child_path = ConcatPaths((dir_path, NAME))
+						children.append((NAME, child_path,
+								os.path.isdir(child_path) and not os.path.islink(child_path),))
+
+			except OSError:
+				continue
+
+			for NAME, PATH, IS_DIR in children:
+				if not showHidden and NAME.startswith(u'.'):
+					continue
+
+				entries.append((NAME.lower(), PATH,))
+
+				if IS_DIR:
+					dirs.append(PATH)
+
+			if len(entries) >= self.MaxEntries:
+				truncated = True
+				break
+
+		entries = sorted(entries)
+
+		with self.Lock:
+			if not self.IsCurrent(stopEvent):
+				return
+
+			# Entries must be replaced before index is marked as sorted
+			self.Entries = entries
+			self.Truncated = truncated
+			self.Sorted = True
+
+		if callback:
+			callback(self, stopEvent)
+
+
+	## Checks if a build is the most recent one & was not cancelled
+	#
+	#  \param stopEvent
+	#	<b><i>threading.Event</i></b> of build passed to callback
+	def IsCurrent(self, stopEvent):
+		return stopEvent is self.StopEvent and not stopEvent.is_set()
+
+
+	## Checks if index is complete
+	def IsReady(self):
+		return self.Sorted
+
+
+	## Finds files & directories with names beginning with text
+	#
+	#  \param text
+	#	Case-insensitive beginning of name
+	#  \param limit
+	#	Maximum number of results
+	#  \return
+	#	\b \e List of paths
+	def Search(self, text, limit=100):
+		text = text.lower()
+		results = []
+
+		if not text:
+			return results
+
+		index_sorted = self.Sorted
+		entries = self.Entries
+
+		if index_sorted:
+			INDEX = bisect_left(entries, (text,))
+
+			while INDEX < len(entries) and len(results) < limit:
+				name, path = entries[INDEX]
+				if not name.startswith(text):
+					break
+
+				results.append(path)
+				INDEX += 1
+
+			return results
+
+		for NAME, PATH in list(entries):
+			if NAME.startswith(text):
+				results.append(PATH)
+
+				if len(results) >= limit:
+					break
+
+		return sorted(results)
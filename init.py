@@ -12,6 +12,11 @@
 
 import os, sys
 
+# Profiling must start before other local modules are imported
+from startup.profiler	import profiler
+
+profiler.StartFromArguments(sys.argv[1:])
+
 from command_line	import GetParsedPath
 from command_line	import ParseArguments
 from command_line	import parsed_commands
@@ -178,15 +183,30 @@ if u'help' in parsed_args_s:
 if u'log-level' in parsed_args_v:
 	Logger.SetLogLevel(parsed_args_v[u'log-level'])
 
+if u'log-json' in parsed_args_v:
+	Logger.SetJSONFile(parsed_args_v[u'log-json'])
+
+if u'startup-budget' in parsed_args_v:
+	try:
+		profiler.Budget = float(parsed_args_v[u'startup-budget'])
+
+	except ValueError:
+		print(u'ERROR: Startup budget must be a number of seconds: {}'.format(parsed_args_v[u'startup-budget']))
+		sys.exit(1)
+
 
 Logger.Info(script_name, u'Python version: {}'.format(PY_VER_STRING))
 Logger.Info(script_name, u'wx.Python version: {}'.format(WX_VER_STRING))
 Logger.Info(script_name, u'Debreate version: {}'.format(VERSION_string))
 Logger.Info(script_name, u'Logging level: {}'.format(Logger.GetLogLevel()))
 
+profiler.EndPhase(u'config load')
+
 # Check for & parse existing configuration
 conf_values = GetAllConfigKeys()
 
+profiler.EndPhase(u'first run check')
+
 if not conf_values:
 	Logger.Debug(script_name, u'Launching First Run dialog ...')
 
@@ -217,10 +237,22 @@ for V in conf_values:
 		break
 
 
+profiler.EndPhase(u'MainWindow construction')
+
 Debreate = MainWindow(conf_values[u'position'], conf_values[u'size'])
 debreate_app.SetMainWindow(Debreate)
+
+profiler.EndPhase(u'InitWizard')
+
 Debreate.InitWizard()
 
+profiler.EndPhase(u'autosave recovery')
+
+# Recover changes after a crash before any project is opened
+Debreate.InitAutosave()
+
+profiler.EndPhase(u'window setup')
+
 if conf_values[u'maximize']:
 	Debreate.Maximize()
 
@@ -233,12 +265,16 @@ elif conf_values[u'center']:
 working_dir = conf_values[u'workingdir']
 
 if parsed_path:
+	profiler.EndPhase(u'project open')
+
 	project_file = parsed_path
 	Logger.Debug(script_name, GT(u'Opening project from argument: {}').format(project_file))
 
 	if Debreate.OpenProject(project_file):
 		working_dir = os.path.dirname(project_file)
 
+	profiler.EndPhase(u'window setup')
+
 # Set working directory
 ChangeWorkingDirectory(working_dir)
 
@@ -250,6 +286,14 @@ wx.Yield()
 # Set initializaton state to 'True'
 SetAppInitialized()
 
+if profiler.Active:
+	profiler.Stop()
+
+	print(profiler.GetReport())
+
+	if profiler.IsOverBudget():
+		Logger.Warn(script_name, u'Startup took {:.3f} s, budget is {:.3f} s'.format(profiler.GetTotal(), profiler.Budget))
+
 debreate_app.MainLoop()
 
 Logger.OnClose()
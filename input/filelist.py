@@ -9,15 +9,35 @@
 import os, wx
 from wx.lib.mixins.listctrl import TextEditMixin
 
+from dbr.colors			import COLOR_changed
 from dbr.colors			import COLOR_executable
 from dbr.colors			import COLOR_link
 from dbr.colors			import COLOR_warn
+from dbr.event			import EVT_FILE_RECORDS_READ
+from dbr.event			import EVT_FILE_STATUS_CHANGED
+from dbr.event			import EVT_REFRESH_FILE_LIST
+from dbr.event			import FileRecordsReadEvent
+from dbr.event			import FileStatusChangedEvent
+from dbr.event			import InstallCollisionsEvent
+from dbr.config			import ConfCode
+from dbr.config			import GetDefaultConfigValue
+from dbr.config			import ReadConfig
+from dbr.event			import RefreshFileListEvent
 from dbr.language		import GT
 from dbr.log			import Logger
+from fileio.scan		import FileStatus
+from fileio.scan		import GroupPathsByDirectory
+from fileio.scan		import ScanDirectoryStatus
+from fileio.scan		import ScanFileStatus
+from fileio.watch		import DirectoryWatcher
+from globals.fileindex	import UpdateIndexes
 from globals.fileitem	import FileItem
-from globals.mime		import GetFileMimeType
+from globals.installpaths	import GetDirectoryEntries
+from globals.installpaths	import InstallPathIndex
+from globals.mime		import GetFileMimeTypes
 from globals.paths		import ConcatPaths
 from globals.strings	import IsString
+from globals.threads	import Thread
 from input.essential	import EssentialField
 from input.list			import ListCtrl
 
@@ -118,6 +138,14 @@ class BasicFileList(ListCtrl, TextEditMixin):
 		#        Check `BaseFileList.Delete`
 		self.FileItems = []
 
+		## Maps file paths to their index in self.FileItems
+		#
+		#  Only the first occurence of a path is mapped.
+		self.PathIndexes = {}
+
+		## Maps FileItem instances to their index in self.FileItems
+		self.ItemIndexes = {}
+
 
 	## Adds new globals.fileitem.FileItem instance to end of list
 	#
@@ -156,7 +184,8 @@ class BasicFileList(ListCtrl, TextEditMixin):
 		filename = self.GetPath(item)
 
 		if self.DeleteItem(item):
-			self.FileItems.pop(item)
+			removed = self.FileItems.pop(item)
+			self.UpdateIndexes(item, (removed,))
 
 			Logger.Debug(__name__, u'Deleted item from BasicFileList: {}'.format(filename))
 			return True
@@ -210,11 +239,8 @@ class BasicFileList(ListCtrl, TextEditMixin):
 	#	\b \e FileItem instance
 	def GetFileItem(self, item):
 		if IsString(item):
-			for FILE in self.FileItems:
-				if FILE.GetPath() == item:
-					item = FILE
-
-					break
+			if item in self.PathIndexes:
+				item = self.FileItems[self.PathIndexes[item]]
 
 		elif isinstance(item, int):
 			item = self.FileItems[item]
@@ -240,9 +266,17 @@ class BasicFileList(ListCtrl, TextEditMixin):
 	#  \return
 	#	\b \e Integer index of given item
 	def GetIndex(self, item):
-		item = self.GetFileItem(item)
+		if isinstance(item, int):
+			return item
 
-		return self.FileItems.index(item)
+		if IsString(item):
+			if item in self.PathIndexes:
+				return self.PathIndexes[item]
+
+		elif item in self.ItemIndexes:
+			return self.ItemIndexes[item]
+
+		raise ValueError(u'Item not in file list: {}'.format(item))
 
 
 	## Retrieves full path of file
@@ -301,12 +335,26 @@ class BasicFileList(ListCtrl, TextEditMixin):
 
 		self.InsertStringItem(index, item.GetPath())
 
-		self.FileItems.insert(index, item)
+		self.InsertFileItem(index, item)
 
 		if self.HLExe:
 			self.SetItemTextColour(index, wx.RED)
 
-		return item in self.FileItems
+		return item in self.ItemIndexes
+
+
+	## Inserts a globals.fileitem.FileItem instance into the item list & updates indexes
+	#
+	#  Does not add a row to the list control.
+	#
+	#  \param index
+	#	\b \e Integer index at which to insert item
+	#  \param item
+	#	\b \e FileItem instance
+	def InsertFileItem(self, index, item):
+		self.FileItems.insert(index, item)
+
+		self.UpdateIndexes(index)
 
 
 	## Removes an item from the file list
@@ -316,16 +364,41 @@ class BasicFileList(ListCtrl, TextEditMixin):
 		return self.Delete(item)
 
 
+	## Removes selected files from list
+	def RemoveSelected(self):
+		selected_indexes = self.GetSelectedIndexes()
+
+		if selected_indexes != None:
+			removed = []
+
+			for INDEX in reversed(selected_indexes):
+				if self.DeleteItem(INDEX):
+					removed.append(self.FileItems.pop(INDEX))
+
+				else:
+					Logger.Warn(__name__, u'Failed to delete item from BasicFileList: index: {}'.format(INDEX))
+
+			self.UpdateIndexes(selected_indexes[0], removed)
+
+
 	## Resets the list to default value (empty)
 	def Reset(self):
 		if ListCtrl.Reset(self):
 			self.FileItems = []
+			self.UpdateIndexes()
 
 			return True
 
 		return False
 
 
+	## Updates path & item index maps after items list has changed
+	#
+	#  \see globals.fileindex.UpdateIndexes
+	def UpdateIndexes(self, start=0, removed=()):
+		UpdateIndexes(self.FileItems, self.PathIndexes, self.ItemIndexes, start, removed)
+
+
 ## An editable list of files
 #
 # FIXME: use methods from BasicFileList
@@ -366,7 +439,61 @@ class FileList(BasicFileList, wx.FileDropTarget):
 
 		self.SetColumns(columns.GetAllLabels(), col_width)
 
+		## Last known FileStatus value of each path, used to only repaint changed rows
+		self.PathStatus = {}
+
+		## FileItem instances of files modified on disk after they were added
+		self.ChangedItems = set()
+
+		## FileItem instances of files marked executable by the user or project
+		#
+		#  Kept separate from status on disk so the flag is not lost when
+		#  permissions change.
+		self.ExecutableItems = set()
+
+		## Background thread for refreshing file status
+		self.RefreshThread = None
+
+		## Tells background refresh thread to stop
+		self.RefreshAborted = False
+
+		## Install paths of listed files & files inside listed directories
+		self.InstallIndex = InstallPathIndex()
+
+		## Background thread that reads contents of directories for install path index
+		self.IndexThread = None
+
+		## Install paths found colliding by background thread, posted when it finishes
+		self.IndexCollisions = set()
+
+		## State of files being loaded in background
+		self.LoadState = None
+
+		## Incremented whenever files, targets or executable flags change
+		self.Revision = 0
+
+		## Watches source directories for changes to listed files
+		self.Watcher = DirectoryWatcher(self.OnWatchedChange)
+
+		## Watching can be disabled with 'watchfiles' configuration key
+		self.WatchEnabled = ReadConfig(u'watchfiles')
+
+		if self.WatchEnabled in (ConfCode.FILE_NOT_FOUND, ConfCode.KEY_NOT_DEFINED, ConfCode.KEY_NO_EXIST,):
+			self.WatchEnabled = GetDefaultConfigValue(u'watchfiles')
+
+		## Listed file basenames grouped by source directory, read by watcher thread
+		self.WatchGroups = {}
+
+		## Set when watched directories need to be updated after list changes
+		self.WatchUpdatePending = False
+
 		self.Bind(wx.EVT_LEFT_DCLICK, self.OnLeftDown)
+		self.Bind(wx.EVT_LIST_END_LABEL_EDIT, self.OnEndEdit)
+		self.Bind(wx.EVT_WINDOW_DESTROY, self.OnDestroy)
+
+		EVT_FILE_RECORDS_READ(self, wx.ID_ANY, self.OnFileRecordsRead)
+		EVT_FILE_STATUS_CHANGED(self, wx.ID_ANY, self.OnFileStatusChanged)
+		EVT_REFRESH_FILE_LIST(self, wx.ID_ANY, self.OnRefreshStatus)
 
 		# Resize bug hack
 		if wx.MAJOR_VERSION == 3 and wx.MINOR_VERSION == 0:
@@ -386,49 +513,211 @@ class FileList(BasicFileList, wx.FileDropTarget):
 	#  \return
 	#		\b \e bool : True if file exists on the filesystem
 	def AddFile(self, filename, sourceDir, targetDir=None, executable=False):
-		list_index = self.GetItemCount()
-
 		# Method can be called with two argements: absolute filename & target directory
 		if targetDir == None:
 			targetDir = sourceDir
 			sourceDir = os.path.dirname(filename)
 			filename = os.path.basename(filename)
 
-		source_path = ConcatPaths((sourceDir, filename))
+		Logger.Debug(__name__, lambda: GT(u'Adding file: {}').format(ConcatPaths((sourceDir, filename))))
 
-		Logger.Debug(__name__, GT(u'Adding file: {}').format(source_path))
+		# File was added but does not exist on filesystem if listed as missing
+		return not self.AddFiles(((filename, sourceDir, targetDir, executable),))
 
-		self.InsertStringItem(list_index, filename)
-		self.SetStringItem(list_index, columns.SOURCE, sourceDir)
-		self.SetStringItem(list_index, columns.TARGET, targetDir)
-		self.SetStringItem(list_index, columns.TYPE, GetFileMimeType(source_path))
 
-		if os.path.islink(source_path):
-			self.SetItemTextColour(list_index, COLOR_link)
+	## Adds multiple files to the list
+	#
+	#  Rows are appended in one pass while the list is frozen. File status,
+	#  colors & types are then resolved in batches, grouped by directory.
+	#
+	#  \param records
+	#	\b \e List of (filename, sourceDir, targetDir, executable) tuples
+	#  \param progress
+	#	Function called with number of rows added after every 'progressInterval'
+	#	rows. If it returns \b \e False, remaining records are not added.
+	#  \param progressInterval
+	#	Number of rows to add between calls to 'progress'
+	#  \param status
+	#	\b \e Dictionary of paths mapped to fileio.scan.FileStatus values that were
+	#	already read (e.g. by a background thread), or \b \e None to read status
+	#  \param mimeTypes
+	#	\b \e List of MIME types in the same order as 'records', or \b \e None to
+	#	read types
+	#  \param times
+	#	\b \e Dictionary of paths mapped to modification times read with 'status'
+	#  \return
+	#	\b \e List of absolute paths of added files that do not exist on filesystem
+	def AddFiles(self, records, progress=None, progressInterval=100, status=None, mimeTypes=None,
+			times=None):
+		first_index = self.GetItemCount()
+		list_index = first_index
+		added = []
 
-		elif os.path.isdir(source_path):
-			self.SetItemTextColour(list_index, self.FOLDER_TEXT_COLOR)
+		self.Freeze()
 
-		else:
-			# TODO: Use 'GetFileMimeType' module to determine file type
-			if os.access(source_path, os.X_OK) or executable:
-				self.SetFileExecutable(list_index)
+		try:
+			for FILENAME, SOURCE, TARGET, EXECUTABLE in records:
+				source_path = ConcatPaths((SOURCE, FILENAME))
 
-			if not os.path.isfile(source_path):
-				self.SetItemBackgroundColour(list_index, COLOR_warn)
-				self.FileItems.insert(list_index, FileItem(source_path, targetDir))
+				self.InsertStringItem(list_index, FILENAME)
+				self.SetStringItem(list_index, columns.SOURCE, SOURCE)
+				self.SetStringItem(list_index, columns.TARGET, TARGET)
 
-				# File was added but does not exist on filesystem
-				return False
+				# File status is read once & cached by FileItem instance
+				self.FileItems.append(FileItem(source_path, TARGET))
+				added.append(source_path)
+
+				if EXECUTABLE:
+					self.ExecutableItems.add(self.FileItems[-1])
+
+				list_index += 1
+
+				if progress and not len(added) % progressInterval:
+					if progress(len(added)) == False:
+						break
+
+			if not added:
+				return []
+
+			self.UpdateIndexes(first_index)
+
+			missing_files = []
+			if status == None:
+				times = {}
+				status = ScanFileStatus(added, times=times)
+
+			for INDEX in range(len(added)):
+				source_path = added[INDEX]
+				row = first_index + INDEX
+				row_status = status[source_path]
+
+				# TODO: Use 'GetFileMimeType' module to determine file type
+				self.SetRowStatus(row, row_status)
+				self.PathStatus[source_path] = row_status
+
+				# Timestamp read with status is used to detect changes without reading it again
+				if times != None and row_status != FileStatus.DIRECTORY:
+					self.FileItems[row].SetTimestamp(times.get(source_path, False))
+
+				# Directory contents are indexed in background so nested files can collide
+				collisions = self.InstallIndex.Add(self.FileItems[row], source_path,
+						self.FileItems[row].GetTarget(), row_status == FileStatus.DIRECTORY)
+
+				self.WarnCollisions(collisions)
+
+				if row_status == FileStatus.MISSING:
+					missing_files.append(source_path)
+
+			if mimeTypes == None:
+				mime_types = GetFileMimeTypes(added)
+
+			else:
+				mime_types = mimeTypes
+
+			for INDEX in range(len(added)):
+				self.SetStringItem(first_index + INDEX, columns.TYPE, mime_types[INDEX])
+
+			self.IndexDirectoriesBackground()
+
+		finally:
+			self.Thaw()
+
+		return missing_files
 
-		self.FileItems.insert(list_index, FileItem(source_path, targetDir))
-		return True
+
+	## Updates rows whose file status differs from last known status
+	#
+	#  Only the status on disk is stored. Executable flags set by the user
+	#  are kept in input.filelist.FileList.ExecutableItems & combined with
+	#  it when rows are painted.
+	#
+	#  \param status
+	#	\b \e Dictionary of paths mapped to fileio.scan.FileStatus values
+	#  \return
+	#	\b \e Integer count of rows that were repainted
+	def ApplyFileStatus(self, status):
+		changed = []
+
+		for PATH in status:
+			if PATH not in self.PathIndexes:
+				continue
+
+			if self.PathStatus.get(PATH) != status[PATH]:
+				changed.append((self.PathIndexes[PATH], PATH, status[PATH],))
+
+		if changed:
+			self.Freeze()
+
+			for ROW, PATH, STATUS in changed:
+				executable = self.IsExecutable(ROW)
+
+				self.PathStatus[PATH] = STATUS
+				self.SetRowStatus(ROW, STATUS)
+
+				# Executable flag is saved with project
+				if executable != self.IsExecutable(ROW):
+					self.Revision += 1
+
+				# Cached status of item is out of date
+				self.FileItems[ROW].Refresh()
+
+			self.Thaw()
+
+		return len(changed)
+
+
+	## Marks rows of files that were modified after they were added
+	#
+	#  \param times
+	#	\b \e Dictionary of paths mapped to modification times
+	#  \return
+	#	\b \e Integer count of rows that were marked
+	def ApplyFileTimes(self, times):
+		changed = []
+
+		for PATH in times:
+			if PATH in self.PathIndexes:
+				row = self.PathIndexes[PATH]
+				file_item = self.FileItems[row]
+
+				if file_item in self.ChangedItems:
+					continue
+
+				timestamp = file_item.GetTimestamp()
+
+				if timestamp != None and timestamp != times[PATH]:
+					changed.append((row, PATH,))
+
+		if changed:
+			self.Freeze()
+
+			for ROW, PATH in changed:
+				self.ChangedItems.add(self.FileItems[ROW])
+				self.SetRowStatus(ROW, self.PathStatus.get(PATH, FileStatus.NORMAL))
+
+			self.Thaw()
+
+		return len(changed)
+
+
+	## Stops adding files that are being loaded in background
+	#
+	#  Files that have already been added remain in the list.
+	def CancelLoading(self):
+		if self.LoadState:
+			self.LoadState[u'cancelled'] = True
+			self.LoadState = None
 
 
 	## TODO: Doxygen
 	def DeleteAllItems(self):
+		self.RefreshAborted = True
+		self.CancelLoading()
+
 		if ListCtrl.DeleteAllItems(self):
 			self.FileItems = []
+			self.UpdateIndexes()
+			self.PathStatus = {}
 		else:
 			Logger.Warn(__name__, u'Failed to delete all items from FileList')
 
@@ -528,10 +817,18 @@ class FileList(BasicFileList, wx.FileDropTarget):
 
 	## Checks if an item is executable
 	#
+	#  Items are executable if marked by the user or if permission bits
+	#  on disk allow execution.
+	#
 	#  \param row
 	#	Row index of item
 	def IsExecutable(self, row):
-		return self.GetItemTextColour(row) == wx.RED
+		file_item = self.FileItems[row]
+
+		if file_item in self.ExecutableItems:
+			return True
+
+		return self.PathStatus.get(file_item.GetPath()) == FileStatus.EXECUTABLE
 
 
 	## Checks if an item is a symbolic link
@@ -547,11 +844,206 @@ class FileList(BasicFileList, wx.FileDropTarget):
 		return self.RefreshFileList()
 
 
+	## Finishes loading files in background immediately
+	#
+	#  Remaining files are added synchronously so that the list is complete
+	#  (e.g. before saving project).
+	def FinishLoading(self):
+		state = self.LoadState
+
+		if not state:
+			return
+
+		Logger.Debug(__name__, u'Finishing file list loading: {} of {} files added'.format(state[u'added'],
+				len(state[u'records'])))
+
+		# Worker thread stops & batches it already posted are ignored
+		state[u'cancelled'] = True
+		self.LoadState = None
+
+		remaining = state[u'records'][state[u'added']:]
+		if remaining:
+			state[u'missing'] += self.AddFiles(remaining)
+
+		if state[u'callback']:
+			state[u'callback'](state[u'missing'])
+
+
+	## Retrieves number of files waiting to be added by background loader
+	def GetPendingCount(self):
+		state = self.LoadState
+
+		if not state:
+			return 0
+
+		return len(state[u'records']) - state[u'added']
+
+
+	## Reads contents of directories & passes them to the list
+	#
+	#  Called from background thread, must not access the list control.
+	#
+	#  \param pending
+	#	\b \e List of (key, source, target) tuples
+	def IndexDirectories(self, pending):
+		for KEY, SOURCE, TARGET in pending:
+			wx.CallAfter(self.OnDirectoryIndexed, KEY, SOURCE, TARGET, GetDirectoryEntries(SOURCE, TARGET))
+
+		wx.CallAfter(self.OnDirectoriesIndexed)
+
+
+	## Reads contents of pending directories of install path index in background
+	#
+	#  \return
+	#	\b \e True if a new thread was started
+	def IndexDirectoriesBackground(self):
+		if self.IndexThread:
+			# Directories added while thread is running are read when it finishes
+			return False
+
+		pending = self.InstallIndex.GetPending()
+
+		if not pending:
+			return False
+
+		self.IndexThread = Thread(self.IndexDirectories, pending)
+
+		return self.IndexThread.Start()
+
+
+	## Checks if files are being loaded in background
+	def IsLoading(self):
+		return self.LoadState != None
+
+
+	## Adds files to the list from a background loader
+	#
+	#  Status & types of files are read in a background thread & posted
+	#  to the list in batches, so the interface is usable while files are
+	#  added.
+	#
+	#  \param records
+	#	\b \e List, or sequence that supports slicing (e.g. globals.projectfile.FileManifest),
+	#	of (filename, sourceDir, targetDir, executable) tuples
+	#  \param callback
+	#	Function called with \b \e list of missing files when all files have been added
+	#  \param batchSize
+	#	Number of files read & added at a time
+	#  \return
+	#	\b \e True if loader thread was started
+	def LoadFilesBackground(self, records, callback=None, batchSize=500):
+		self.CancelLoading()
+
+		# Sequences such as project manifests are read in batches without copying
+		if not hasattr(records, u'__getitem__'):
+			records = list(records)
+
+		state = {
+			u'cancelled': False,
+			u'records': records,
+			u'added': 0,
+			u'missing': [],
+			u'callback': callback,
+			}
+
+		self.LoadState = state
+
+		if not state[u'records']:
+			self.FinishLoading()
+
+			return False
+
+		return Thread(self.ReadFileRecords, state, batchSize).Start()
+
+
+	## Stops directory watcher when list is destroyed
+	def OnDestroy(self, event=None):
+		self.Watcher.Stop()
+		self.CancelLoading()
+
+		if event:
+			event.Skip()
+
+
+	## Starts reading directories that were added while background thread was running
+	#
+	#  When no directories remain, install paths found colliding are posted
+	#  with dbr.event.InstallCollisionsEvent.
+	def OnDirectoriesIndexed(self):
+		# List may have been destroyed before call
+		if not self:
+			return
+
+		self.IndexThread = None
+
+		# Collisions are posted once all directories are indexed
+		if not self.IndexDirectoriesBackground():
+			self.PostIndexCollisions()
+
+
+	## Adds contents of a directory read in background to install path index
+	#
+	#  \see globals.installpaths.InstallPathIndex.SetEntries
+	def OnDirectoryIndexed(self, key, sourcePath, targetDir, entries):
+		if not self:
+			return
+
+		collisions = self.InstallIndex.SetEntries(key, sourcePath, targetDir, entries)
+
+		if collisions:
+			self.WarnCollisions(collisions)
+			self.IndexCollisions.update(collisions)
+
+
 	## Action to take when a file/folder is dropped onto the list from a file manager
 	def OnDropFiles(self, x, y, filename):
 		self.GetParent().OnDropFiles(filename)
 
 
+	## Updates install path index when target of a file is edited
+	def OnEndEdit(self, event=None):
+		if event:
+			event.Skip()
+
+			if event.GetColumn() == columns.TARGET and event.IsAllowed():
+				file_item = self.FileItems[event.GetIndex()]
+				file_item.SetTarget(event.GetLabel())
+
+				self.Revision += 1
+
+				self.UpdateInstallIndex(file_item)
+
+
+	## Adds a batch of files posted from background loader
+	def OnFileRecordsRead(self, event=None):
+		if not event:
+			return
+
+		state = event.state
+
+		if state is not self.LoadState or state[u'cancelled']:
+			return
+
+		state[u'missing'] += self.AddFiles(event.records, status=event.status, mimeTypes=event.types,
+				times=event.times)
+		state[u'added'] += len(event.records)
+
+		if state[u'added'] >= len(state[u'records']):
+			Logger.Debug(__name__, u'Finished loading file list, missing files: {}'.format(len(state[u'missing'])))
+
+			self.LoadState = None
+
+			if state[u'callback']:
+				state[u'callback'](state[u'missing'])
+
+
+	## Updates rows with file status & modification times posted from directory watcher
+	def OnFileStatusChanged(self, event=None):
+		if event:
+			self.ApplyFileStatus(event.status)
+			self.ApplyFileTimes(event.times)
+
+
 	## Defines actions to take when left-click or left-double-click event occurs
 	#
 	#  The super method is overridden to ensure that 'event.Skip' is called.
@@ -563,6 +1055,16 @@ class FileList(BasicFileList, wx.FileDropTarget):
 			event.Skip()
 
 
+	## Updates rows with file status posted from background refresh thread
+	def OnRefreshStatus(self, event=None):
+		if event and not self.RefreshAborted:
+			if event.status:
+				self.ApplyFileStatus(event.status)
+
+			if event.finished:
+				Logger.Debug(__name__, u'Finished refreshing file list, missing files: {}'.format(event.missing))
+
+
 	## Works around resize bug in wx 3.0
 	#
 	#  Uses parent width & its children to determine
@@ -591,6 +1093,32 @@ class FileList(BasicFileList, wx.FileDropTarget):
 				self.SetSize(wx.Size(target_width, height))
 
 
+	## Retrieves status of listed files in changed directories
+	#
+	#  Called from directory watcher thread, must not access the list control.
+	#
+	#  \param dirs
+	#	\b \e Set of directories with changes
+	def OnWatchedChange(self, dirs):
+		groups = self.WatchGroups
+		status = {}
+		times = {}
+
+		for DIR in dirs:
+			if DIR in groups:
+				# Modification times of directories change with their contents & are not read
+				dir_times = {}
+
+				for NAME, STATUS in ScanDirectoryStatus(DIR, groups[DIR], dir_times).items():
+					status[os.path.join(DIR, NAME)] = STATUS
+
+				for NAME, MTIME in dir_times.items():
+					times[os.path.join(DIR, NAME)] = MTIME
+
+		if status:
+			wx.PostEvent(self, FileStatusChangedEvent(0, status=status, times=times))
+
+
 	## Opens an editor for target
 	#
 	#  The super method is overridden to only
@@ -605,39 +1133,99 @@ class FileList(BasicFileList, wx.FileDropTarget):
 		TextEditMixin.OpenEditor(self, columns.TARGET, row)
 
 
+	## Posts install paths found colliding while indexing directories
+	#
+	#  Paths that no longer collide (e.g. files were removed) are dropped.
+	def PostIndexCollisions(self):
+		collisions = sorted(self.IndexCollisions & self.InstallIndex.GetCollisions())
+		self.IndexCollisions = set()
+
+		if collisions:
+			wx.PostEvent(self, InstallCollisionsEvent(self.GetId(), collisions=collisions))
+
+
 	## Refresh file list
 	#
-	#  Missing files are marked with a distinct color.
-	#  TODO: Update executable status
+	#  Missing files are marked with a distinct color. Files are checked
+	#  grouped by directory & only rows with changed status are repainted.
 	#
 	#  \return
 	#		\b \e bool : True if files are missing, False if all okay
 	def RefreshFileList(self):
-		dirty = False
-		for row in range(self.GetItemCount()):
-			item_color = self.DEFAULT_BG_COLOR
-			text_color = self.DEFAULT_TEXT_COLOR
-			row_defs = self.GetRowDefs(row)
+		status = ScanFileStatus(self.GetPaths())
 
-			absolute_filename = u'{}/{}'.format(row_defs[u'source'], row_defs[u'filename'])
+		self.ApplyFileStatus(status)
 
-			if not os.path.exists(absolute_filename):
-				item_color = COLOR_warn
-				dirty = True
+		return FileStatus.MISSING in status.values()
 
-			elif os.path.isdir(absolute_filename):
-				text_color = self.FOLDER_TEXT_COLOR
 
-			elif self.IsSymlink(row):
-				text_color = COLOR_link
+	## Reads status & types of files to be loaded & posts them to the list
+	#
+	#  Called from background thread, must not access the list control.
+	#
+	#  \param state
+	#	\b \e Dictionary state of the loader
+	#  \param batchSize
+	#	Number of files to read before posting
+	def ReadFileRecords(self, state, batchSize):
+		records = state[u'records']
+
+		for INDEX in range(0, len(records), batchSize):
+			if state[u'cancelled']:
+				return
+
+			batch = records[INDEX:INDEX+batchSize]
+			paths = [ConcatPaths((SOURCE, FILENAME)) for FILENAME, SOURCE, TARGET, EXECUTABLE in batch]
+
+			times = {}
+			status = ScanFileStatus(paths, times=times)
+			mime_types = GetFileMimeTypes(paths)
+
+			if state[u'cancelled']:
+				return
 
-			elif os.access(absolute_filename, os.X_OK):
-				text_color = COLOR_executable
+			wx.PostEvent(self, FileRecordsReadEvent(0, state=state, records=batch, status=status,
+					types=mime_types, times=times))
 
-			self.SetItemTextColour(row, text_color)
-			self.SetItemBackgroundColour(row, item_color)
 
-		return dirty
+	## Refreshes file list from a background thread
+	#
+	#  Status of files is posted to the list in batches (one per source
+	#  directory) so the interface stays responsive.
+	#
+	#  \return
+	#	\b \e True if a new refresh was started
+	def RefreshFileListBackground(self):
+		if self.RefreshThread and self.RefreshThread.is_alive():
+			Logger.Debug(__name__, u'File list refresh is already in progress')
+
+			return False
+
+		self.RefreshAborted = False
+		self.RefreshThread = Thread(self.RefreshFileStatus, self.GetPaths())
+
+		return self.RefreshThread.Start()
+
+
+	## Retrieves file status & posts it to the list
+	#
+	#  Called from background thread, must not access the list control.
+	#
+	#  \param paths
+	#	\b \e Tuple list of file paths to check
+	def RefreshFileStatus(self, paths):
+		def post_status(dir_status):
+			if self.RefreshAborted:
+				return False
+
+			wx.PostEvent(self, RefreshFileListEvent(0, status=dir_status, finished=False))
+
+		status = ScanFileStatus(paths, post_status)
+
+		if not self.RefreshAborted:
+			missing = list(status.values()).count(FileStatus.MISSING)
+
+			wx.PostEvent(self, RefreshFileListEvent(0, status=None, finished=True, missing=missing))
 
 
 	## Removes selected files from list
@@ -645,6 +1233,10 @@ class FileList(BasicFileList, wx.FileDropTarget):
 		selected_total = self.GetSelectedItemCount()
 		selected_count = selected_total
 
+		# Indexes are only re-mapped once after all items are removed
+		first_removed = None
+		removed = []
+
 		while selected_count:
 			current_selected = self.GetFirstSelected()
 
@@ -657,13 +1249,32 @@ class FileList(BasicFileList, wx.FileDropTarget):
 			selected_count = self.GetSelectedItemCount()
 
 			if deleted:
-				self.FileItems.pop(current_selected)
+				removed.append(self.FileItems.pop(current_selected))
+
+				if first_removed == None or current_selected < first_removed:
+					first_removed = current_selected
 			else:
 				Logger.Warn(__name__, u'Failed to delete item from Filelist: index: {}'.format(current_selected))
 
 			Logger.Debug(__name__, u'Visual item count: {}'.format(self.GetItemCount()))
 			Logger.Debug(__name__, u'Actual item count: {}'.format(len(self.FileItems)))
 
+		if removed:
+			self.UpdateIndexes(first_removed, removed)
+
+
+	## Resets the list to default value (empty) & cancels background refresh & loading
+	def Reset(self):
+		self.RefreshAborted = True
+		self.CancelLoading()
+
+		if BasicFileList.Reset(self):
+			self.PathStatus = {}
+
+			return True
+
+		return False
+
 
 	## Selects all items in the list
 	def SelectAll(self):
@@ -673,17 +1284,92 @@ class FileList(BasicFileList, wx.FileDropTarget):
 			self.Select(x)
 
 
+	## Replaces indexed contents of a listed directory with contents read in background
+	#
+	#  Entries are ignored if directory was removed from list, or its source
+	#  or target changed, since they were read.
+	#
+	#  \param item
+	#	FileItem instance of directory
+	#  \param sourcePath
+	#	Absolute path of directory that entries were read from
+	#  \param targetDir
+	#	Install directory that entries were read for
+	#  \param entries
+	#	\b \e List of entries from globals.installpaths.GetDirectoryEntries
+	#  \return
+	#	\b \e List of install paths that collide with other files, or \b \e None
+	#	if entries are out of date
+	def SetDirectoryEntries(self, item, sourcePath, targetDir, entries):
+		if item not in self.ItemIndexes or (item.GetPath(), item.GetTarget(),) != (sourcePath, targetDir,):
+			return None
+
+		collisions = self.InstallIndex.Add(item, sourcePath, targetDir, True, entries)
+
+		self.WarnCollisions(collisions)
+		self.IndexCollisions.update(collisions)
+
+		# Background indexer posts collisions when it finishes
+		if not self.IndexThread:
+			self.PostIndexCollisions()
+
+		return collisions
+
+
 	## Marks a file as executable
 	#
 	#  \param row
 	#	Row index of item
+	#  \param executable
+	#	If \b \e False, clears user's executable flag
 	def SetFileExecutable(self, row, executable=True):
+		file_item = self.FileItems[row]
+		was_executable = self.IsExecutable(row)
+
 		if executable:
-			self.SetItemTextColour(row, wx.RED)
+			self.ExecutableItems.add(file_item)
 
-			return
+		else:
+			self.ExecutableItems.discard(file_item)
+
+		# Executable flag is saved with project
+		if was_executable != self.IsExecutable(row):
+			self.Revision += 1
+
+		self.SetRowStatus(row, self.PathStatus.get(file_item.GetPath(), FileStatus.NORMAL))
+
+
+	## Sets row colors to reflect file status
+	#
+	#  Files modified after they were added are marked with a distinct
+	#  background color.
+	#
+	#  \param row
+	#	Row index of item
+	#  \param status
+	#	fileio.scan.FileStatus value
+	def SetRowStatus(self, row, status):
+		item_color = self.DEFAULT_BG_COLOR
+		text_color = self.DEFAULT_TEXT_COLOR
+
+		if status == FileStatus.MISSING:
+			item_color = COLOR_warn
+
+		elif self.FileItems[row] in self.ChangedItems:
+			item_color = COLOR_changed
 
-		self.SetItemTextColour(row, self.DEFAULT_TEXT_COLOR)
+		if status == FileStatus.DIRECTORY:
+			text_color = self.FOLDER_TEXT_COLOR
+
+		elif status == FileStatus.SYMLINK:
+			text_color = COLOR_link
+
+		# Permission bits on disk do not clear user's executable flag
+		elif status == FileStatus.EXECUTABLE or self.FileItems[row] in self.ExecutableItems:
+			text_color = COLOR_executable
+
+		self.SetItemTextColour(row, text_color)
+		self.SetItemBackgroundColour(row, item_color)
 
 
 	## Sorts listed items in target column alphabetically
@@ -700,6 +1386,77 @@ class FileList(BasicFileList, wx.FileDropTarget):
 		pass
 
 
+	## Updates path & item index maps & schedules update of watched directories
+	#
+	#  \see input.filelist.BasicFileList.UpdateIndexes
+	def UpdateIndexes(self, start=0, removed=()):
+		BasicFileList.UpdateIndexes(self, start, removed)
+
+		self.Revision += 1
+
+		if not self.FileItems:
+			self.InstallIndex.Clear()
+			self.ChangedItems = set()
+			self.ExecutableItems = set()
+
+		for R in removed:
+			self.InstallIndex.Remove(R)
+			self.ChangedItems.discard(R)
+			self.ExecutableItems.discard(R)
+
+		# Many changes to list in same event only update watches once
+		if not self.WatchUpdatePending:
+			self.WatchUpdatePending = True
+
+			wx.CallAfter(self.UpdateWatches)
+
+
+	## Updates install paths of a file or files inside a directory
+	#
+	#  \param item
+	#	Row index, path, or FileItem instance
+	#  \return
+	#	\b \e List of install paths that collide with other files
+	def UpdateInstallIndex(self, item):
+		file_item = self.GetFileItem(item)
+
+		collisions = self.InstallIndex.Add(file_item, file_item.GetPath(), file_item.GetTarget(),
+				file_item.IsDirectory())
+
+		# Contents of directories are read in background
+		self.IndexDirectoriesBackground()
+
+		return collisions
+
+
+	## Updates directories watched for changes to match listed files
+	def UpdateWatches(self):
+		# List may have been destroyed before call
+		if not self:
+			return
+
+		self.WatchUpdatePending = False
+		self.WatchGroups = GroupPathsByDirectory(self.GetPaths())
+
+		self.Watcher.SetDirectories(self.WatchGroups)
+
+		if self.WatchGroups and self.WatchEnabled:
+			self.Watcher.Start()
+
+		else:
+			self.Watcher.Stop()
+
+
+	## Logs install paths that have more than one source
+	#
+	#  \param collisions
+	#	\b \e List of install paths
+	def WarnCollisions(self, collisions):
+		for INSTALL in collisions:
+			Logger.Warn(__name__, u'Multiple files will be installed to {}: {}'.format(INSTALL,
+					u', '.join(self.InstallIndex.GetSources(INSTALL))))
+
+
 ## FileList that notifies main window to mark project dirty
 #
 #  This is a dummy class to facilitate merging to & from unstable branch
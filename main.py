@@ -12,9 +12,13 @@ import os, shutil, subprocess, urllib, webbrowser, wx, wx.html
 from urllib2 import HTTPError
 from urllib2 import URLError
 
+from dbr.config				import ConfCode
+from dbr.config				import FlushConfig
 from dbr.config				import GetDefaultConfigValue
+from dbr.config				import ReadConfig
 from dbr.config				import WriteConfig
 from dbr.event				import EVT_CHANGE_PAGE
+from dbr.event				import EVT_PAGE_CONSTRUCTED
 from dbr.event				import EVT_TIMER_STOP
 from dbr.functions			import GetCurrentVersion
 from dbr.functions			import UsingDevelopmentVersion
@@ -25,7 +29,10 @@ from dbr.log				import DebugEnabled
 from dbr.log				import Logger
 from dbr.timer				import DebreateTimer
 from fileio.fileio			import ReadFile
-from fileio.fileio			import WriteFile
+from fileio.fileio			import WriteFileSafe
+from fileio.journal			import FindOrphanedJournals
+from fileio.journal			import GetFingerprint
+from fileio.journal			import Journal
 from globals.application	import APP_homepage
 from globals.application	import APP_project_gh
 from globals.application	import APP_project_sf
@@ -44,6 +51,11 @@ from globals.paths			import PATH_cache
 from globals.paths			import PATH_local
 from globals.project		import PROJECT_ext
 from globals.project		import PROJECT_txt
+from globals.project		import project_sections
+from globals.projectfile	import FormatProject
+from globals.projectfile	import ProjectSections
+from globals.projectfile	import ReadProject
+from globals.projectfile	import StructuredProject
 from globals.strings		import GS
 from globals.threads		import Thread
 from startup.tests			import GetTestList
@@ -111,6 +123,33 @@ class MainWindow(wx.Frame, ModuleAccessCtrl):
 		self.LoadedProject = None
 		self.ProjectDirty = False
 
+		## Project is saved in structured format instead of text format
+		#
+		#  Set when a structured project is opened or chosen as file type in 'Save As' dialog.
+		self.StructuredFormat = False
+
+		## Section names mapped to fingerprints of text in saved project
+		self.SavedFingerprints = {}
+
+		## Sections of pages whose saved state is set when they are constructed
+		self.DeferredSections = set()
+
+		## Path, modification time & size of project file when it was last opened or saved
+		self.SavedFile = None
+
+		## Checks for unsaved changes after fields stop changing
+		self.StatusTimer = wx.PyTimer(self.UpdateSavedStatus)
+
+		## Journal of unsaved changes to project, used to recover after a crash
+		#
+		#  Each running instance has its own journal, named with its process ID.
+		self.Journal = Journal(ConcatPaths((PATH_cache, u'autosave-{}'.format(os.getpid()))))
+
+		## Save revisions of pages when they were last written to journal
+		self.SaveRevisions = {}
+
+		self.AutosaveTimer = wx.PyTimer(self.OnAutosave)
+
 		# *** Event Handling *** #
 
 		wx.EVT_MENU(self, menuid.NEW, self.OnProjectNew)
@@ -128,6 +167,13 @@ class MainWindow(wx.Frame, ModuleAccessCtrl):
 		wx.EVT_MENU(self, menuid.ABOUT, self.OnAbout)
 
 		self.Bind(EVT_CHANGE_PAGE, self.OnWizardBtnPage)
+		self.Bind(EVT_PAGE_CONSTRUCTED, self.OnPageConstructed)
+
+		# Command events from fields on pages propagate to main window
+		for EVT in (wx.EVT_TEXT, wx.EVT_CHECKBOX, wx.EVT_CHOICE, wx.EVT_COMBOBOX, wx.EVT_RADIOBUTTON,
+				wx.EVT_LIST_INSERT_ITEM, wx.EVT_LIST_DELETE_ITEM, wx.EVT_LIST_DELETE_ALL_ITEMS,
+				wx.EVT_LIST_END_LABEL_EDIT,):
+			self.Bind(EVT, self.OnProjectChanged)
 
 		# Custom close event shows a dialog box to confirm quit
 		wx.EVT_CLOSE(self, self.OnQuit)
@@ -142,11 +188,168 @@ class MainWindow(wx.Frame, ModuleAccessCtrl):
 		self.Layout()
 
 
+	## Appends sections of pages that have changed to the autosave journal
+	#
+	#  Pages that track a save revision are only serialized when it has
+	#  changed, & pages that are still loading are skipped.
+	#
+	#  \return
+	#	\b \e List of section names that were written
+	def Autosave(self):
+		changed = self.UpdateSavedStatus()
+
+		# Nothing to journal until project differs from saved state
+		if not changed and not self.Journal.Entries:
+			return []
+
+		entries = {
+			u'PROJECT': self.GetProjectPath(),
+			}
+
+		for PGID, NAME in project_sections:
+			# Pages that have not been constructed have not changed
+			if not self.Wizard.IsPageConstructed(PGID):
+				continue
+
+			page = GetPage(PGID)
+
+			if page.IsLoading():
+				continue
+
+			revision = page.GetSaveRevision()
+			if revision != None and self.SaveRevisions.get(PGID) == revision:
+				continue
+
+			entries[NAME] = page.GetSaveData()
+			self.SaveRevisions[PGID] = revision
+
+		written = self.Journal.Append(entries)
+
+		if written:
+			Logger.Debug(__name__, u'Autosaved sections: {}'.format(u', '.join(written)))
+
+		return written
+
+
+	## Retrieves sections of pages whose save data differs from saved project
+	#
+	#  Pages that are still loading or have not been constructed are not checked.
+	#
+	#  \return
+	#	\b \e List of section names
+	def GetChangedSections(self):
+		changed = []
+
+		for PGID, NAME in project_sections:
+			if not self.Wizard.IsPageConstructed(PGID):
+				continue
+
+			page = GetPage(PGID)
+
+			if not page.IsLoading() and page.GetSaveFingerprint() != self.SavedFingerprints.get(NAME):
+				changed.append(NAME)
+
+		return changed
+
+
 	## Retrieves menu by ID
 	def GetMenu(self, menuId):
 		return self.GetMenuBar().GetMenuById(menuId)
 
 
+	## Retrieves sections of a project formatted as pages' save data
+	#
+	#  \param project
+	#	globals.projectfile.ProjectSections instance
+	#  \return
+	#	\b \e Dictionary of section names mapped to text
+	def GetProjectEntries(self, project):
+		entries = {}
+
+		for PGID, NAME in project_sections:
+			if project.HasSection(NAME):
+				entries[NAME] = project.GetFormatted(NAME)
+
+		return entries
+
+
+	## Retrieves fingerprints of sections of a project
+	#
+	#  \param project
+	#	globals.projectfile.ProjectSections instance
+	#  \return
+	#	\b \e Dictionary of section names mapped to fingerprints
+	def GetProjectFingerprints(self, project):
+		fingerprints = {}
+
+		for PGID, NAME in project_sections:
+			if project.HasSection(NAME):
+				fingerprints[NAME] = project.GetFingerprint(NAME)
+
+		return fingerprints
+
+
+	## Retrieves absolute path of loaded project
+	#
+	#  \return
+	#	\b \e Unicode path or empty string if project has not been saved
+	def GetProjectPath(self):
+		if not self.LoadedProject:
+			return u''
+
+		return os.path.abspath(self.LoadedProject)
+
+
+	## Retrieves text of each project section to save
+	#
+	#  Sections that have not changed since project was opened or saved are
+	#  copied from the project file, if it has not been modified since, instead
+	#  of being generated again.
+	#
+	#  \param path
+	#	Path of project file that will be written
+	#  \return
+	#	\b \e List of section text in order of globals.project.project_sections
+	def GetSaveSections(self, path):
+		saved = None
+
+		if self.SavedFile and self.SavedFile[0] == os.path.abspath(path):
+			try:
+				f_stat = os.stat(path)
+
+				if (f_stat.st_mtime, f_stat.st_size,) == self.SavedFile[1:]:
+					saved = ReadProject(ReadFile(path) or u'')
+
+			except OSError:
+				pass
+
+		data = []
+		reused = []
+
+		for PGID, NAME in project_sections:
+			page = GetPage(PGID)
+
+			if saved and saved.HasSection(NAME) and not page.IsLoading():
+				fingerprint = self.SavedFingerprints.get(NAME)
+
+				if page.GetSaveFingerprint() == fingerprint:
+					text = saved.GetFormatted(NAME)
+
+					# Text in file must be exactly what was saved
+					if GetFingerprint(text) == fingerprint:
+						data.append(text)
+						reused.append(NAME)
+
+						continue
+
+			data.append(page.GetSaveData())
+
+		if reused:
+			Logger.Debug(__name__, u'Unchanged sections copied from project file: {}'.format(u', '.join(reused)))
+
+		return data
+
+
 	## Retrieves the Wizard instance
 	#
 	#  \return
@@ -155,6 +358,28 @@ class MainWindow(wx.Frame, ModuleAccessCtrl):
 		return self.Wizard
 
 
+	## Recovers unsaved changes from a previous session & starts autosave timer
+	#
+	#  Interval is read from 'autosave' configuration key in seconds, 0 disables.
+	def InitAutosave(self):
+		# Lock marks journal as owned by a running instance
+		if not self.Journal.Lock():
+			Logger.Warn(__name__, u'Autosave journal is locked by another process: {}'.format(self.Journal.Path))
+
+		if not self.RecoverAutosave():
+			self.ResetAutosave()
+
+		interval = ReadConfig(u'autosave')
+
+		if interval in (None, ConfCode.FILE_NOT_FOUND, ConfCode.KEY_NOT_DEFINED, ConfCode.KEY_NO_EXIST,):
+			interval = GetDefaultConfigValue(u'autosave')
+
+		if interval > 0:
+			Logger.Debug(__name__, u'Autosaving project every {} seconds'.format(interval))
+
+			self.AutosaveTimer.Start(interval * 1000)
+
+
 	## Sets the pages in the wiz.wizard.Wizard instance
 	def InitWizard(self):
 		self.Wizard.AddPage(PageInit(self.Wizard))
@@ -163,7 +388,7 @@ class MainWindow(wx.Frame, ModuleAccessCtrl):
 
 	## TODO: Doxygen
 	def IsNewProject(self):
-		title = self.GetTitle()
+		title = self.GetTitle().rstrip(u'*')
 		if title == default_title:
 			return True
 
@@ -171,14 +396,9 @@ class MainWindow(wx.Frame, ModuleAccessCtrl):
 			return False
 
 
-	## TODO: Doxygen
+	## Checks if project has no unsaved changes
 	def IsSaved(self):
-		title = self.GetTitle()
-		if title[-1] == u'*':
-			return False
-
-		else:
-			return True
+		return not self.ProjectDirty
 
 
 	## Opens a dialog box with information about the program
@@ -231,6 +451,15 @@ class MainWindow(wx.Frame, ModuleAccessCtrl):
 		about.Destroy()
 
 
+	## Writes changes to autosave journal when timer fires
+	def OnAutosave(self):
+		try:
+			self.Autosave()
+
+		except (IOError, OSError) as e:
+			Logger.Error(__name__, u'Autosave failed: {}'.format(e))
+
+
 	## Checks for new release availability
 	def OnCheckUpdate(self, event=None): #@UnusedVariable
 		update_test = u'update-fail' in GetTestList()
@@ -372,6 +601,28 @@ class MainWindow(wx.Frame, ModuleAccessCtrl):
 		self.Wizard.ShowPage(page_id)
 
 
+	## Sets saved state of a page that was constructed after autosave was reset
+	#
+	#  \param event
+	#	\b \e dbr.event.PageConstructedEvent with ID of page
+	def OnPageConstructed(self, event=None):
+		if not event:
+			return
+
+		for PGID, NAME in project_sections:
+			if PGID == event.GetId() and NAME in self.DeferredSections:
+				page = GetPage(PGID)
+				fingerprint = page.GetSaveFingerprint()
+
+				self.SavedFingerprints[NAME] = fingerprint
+				self.Journal.Base[NAME] = fingerprint
+				self.SaveRevisions[PGID] = page.GetSaveRevision()
+
+				self.DeferredSections.discard(NAME)
+
+				break
+
+
 	## TODO: Doxygen
 	def OnProjectNew(self, event=None): #@UnusedVariable
 		self.ResetPages()
@@ -406,29 +657,25 @@ class MainWindow(wx.Frame, ModuleAccessCtrl):
 
 		def SaveIt(path):
 				# Gather data from different pages
-				data = (
-					GetPage(pgid.CONTROL).GetSaveData(),
-					GetPage(pgid.FILES).GetSaveData(),
-					GetPage(pgid.SCRIPTS).GetSaveData(),
-					GetPage(pgid.CHANGELOG).GetSaveData(),
-					GetPage(pgid.COPYRIGHT).GetSaveData(),
-					GetPage(pgid.MENU).GetSaveData(),
-					GetPage(pgid.BUILD).GetSaveData(),
-					)
-
-				# Create a backup of the project
-				overwrite = False
-				if os.path.isfile(path):
-					backup = u'{}.backup'.format(path)
-					shutil.copy(path, backup)
-					overwrite = True
+				data = self.GetSaveSections(path)
+
+				project_text = u'[DEBREATE-{}]\n{}'.format(VERSION_string, u'\n'.join(data))
+
+				# Structured format cannot be read by older versions, so it is only used when chosen
+				if self.StructuredFormat:
+					project_text = FormatProject(ProjectSections(project_text), VERSION_string)
 
 				# This try statement can be removed when unicode support is enabled
 				try:
-					WriteFile(path, u'[DEBREATE-{}]\n{}'.format(VERSION_string, u'\n'.join(data)))
+					# Project is never left partially written
+					WriteFileSafe(path, project_text)
 
-					if overwrite:
-						os.remove(backup)
+					# Saved project is new base for autosave journal
+					fingerprints = {}
+					for (PGID, NAME), TEXT in zip(project_sections, data):
+						fingerprints[NAME] = GetFingerprint(TEXT)
+
+					self.ResetAutosave(fingerprints, path)
 
 				except UnicodeEncodeError:
 					detail1 = GT(u'Unfortunately Debreate does not support unicode yet.')
@@ -436,17 +683,23 @@ class MainWindow(wx.Frame, ModuleAccessCtrl):
 
 					ShowErrorDialog(GT(u'Save failed'), u'{}\n{}'.format(detail1, detail2), title=GT(u'Unicode Error'))
 
-					if overwrite:
-						os.remove(path)
-						# Restore project backup
-						shutil.move(backup, path)
+				except (IOError, OSError) as e:
+					ShowErrorDialog(GT(u'Save failed'), u'{}\n{}'.format(path, e))
 
 		def OnSaveAs():
 			dbp = u'|*.dbp'
 			d = GT(u'Debreate project files')
-			dia = wx.FileDialog(self, GT(u'Save Debreate Project'), os.getcwd(), u'', u'{}{}'.format(d, dbp),
+			d_struct = GT(u'Debreate structured project files (not readable by older versions)')
+			dia = wx.FileDialog(self, GT(u'Save Debreate Project'), os.getcwd(), u'',
+									u'{0}{1}|{2}{1}'.format(d, dbp, d_struct),
 									wx.FD_SAVE|wx.FD_CHANGE_DIR|wx.FD_OVERWRITE_PROMPT)
+
+			# Second file type is structured format
+			dia.SetFilterIndex(int(self.StructuredFormat))
+
 			if dia.ShowModal() == wx.ID_OK:
+				self.StructuredFormat = dia.GetFilterIndex() == 1
+
 				filename = dia.GetFilename()
 				if filename.split(u'.')[-1] == u'dbp':
 					filename = u'.'.join(filename.split(u'.')[:-1])
@@ -458,7 +711,7 @@ class MainWindow(wx.Frame, ModuleAccessCtrl):
 		if event_id == wx.ID_SAVE:
 			# Define what to do if save is pressed
 			# If project already exists, don't show dialog
-			if not self.IsSaved() or not self.LoadedProject or not os.path.isfile(self.LoadedProject):
+			if not self.LoadedProject or not os.path.isfile(self.LoadedProject):
 				OnSaveAs()
 
 			else:
@@ -496,6 +749,13 @@ class MainWindow(wx.Frame, ModuleAccessCtrl):
 
 			WriteConfig(u'workingdir', os.getcwd())
 
+			# Window settings are written at once
+			FlushConfig()
+
+			# Unsaved changes are discarded on a clean exit, journals of other instances are kept
+			self.AutosaveTimer.Stop()
+			self.Journal.Discard()
+
 			self.Destroy()
 
 
@@ -568,63 +828,222 @@ class MainWindow(wx.Frame, ModuleAccessCtrl):
 					GT(u'File does not exist or is not a regular file: {}').format(project_file))
 			return False
 
-		data = ReadFile(project_file)
-
-		lines = data.split(u'\n')
+		# File is read into a single buffer & each section is sliced from it, or
+		# for structured projects, the file manifest is parsed when files are loaded
+		project = ReadProject(ReadFile(project_file) or u'')
 
 		# FIXME: Need a better way to determine valid project
-		app = lines[0].lstrip(u'[')
-		if not app.startswith(u'DEBREATE'):
+		if not project.IsProject():
 			ShowErrorDialog(GT(u'Could not open project file'),
 					GT(u'Not a valid Debreate project: {}').format(project_file))
 			return False
 
+		# Copyright section is not present in projects saved by older versions
+		missing = [S for S in (u'CTRL', u'FILES', u'SCRIPTS', u'CHANGELOG', u'MENU', u'BUILD',)
+				if not project.HasSection(S)]
+
+		if missing:
+			ShowErrorDialog(GT(u'Could not open project file'),
+					GT(u'Project is missing sections: {}').format(u', '.join(missing)))
+			return False
+
 		if self.LoadedProject and not self.ResetPages():
 			return False
 
+		opened = self.LoadProjectSections(project)
+
+		# Project is saved in the format it was opened in
+		self.StructuredFormat = isinstance(project, StructuredProject)
+
+		# Opened project is new base for autosave journal
+		self.ResetAutosave(self.GetProjectFingerprints(project), project_file)
+
+		return opened
+
+
+	## Sets pages' fields from project sections
+	#
+	#  Pages whose section is not present keep their current values.
+	#
+	#  \param project
+	#	globals.projectfile.ProjectSections instance
+	#  \return
+	#	Value of files page's Set method
+	def LoadProjectSections(self, project):
+		opened = True
+
 		# *** Get Control Data *** #
-		control_data = data.split(u'<<CTRL>>\n')[1].split(u'\n<</CTRL>>')[0]
-		depends_data = self.Wizard.GetPage(pgid.CONTROL).Set(control_data)
-		self.Wizard.GetPage(pgid.DEPENDS).Set(depends_data)
+		if project.HasSection(u'CTRL'):
+			depends_data = self.Wizard.GetPage(pgid.CONTROL).Set(project.Get(u'CTRL'))
+			self.Wizard.GetPage(pgid.DEPENDS).Set(depends_data)
 
 		# *** Get Files Data *** #
-		files_data = data.split(u'<<FILES>>\n')[1].split(u'\n<</FILES>>')[0]
-		opened = self.Wizard.GetPage(pgid.FILES).Set(files_data)
+		if project.HasSection(u'FILES'):
+			opened = self.Wizard.GetPage(pgid.FILES).SetManifest(project.GetManifest())
 
 		# *** Get Scripts Data *** #
-		scripts_data = data.split(u'<<SCRIPTS>>\n')[1].split(u'\n<</SCRIPTS>>')[0]
-		self.Wizard.GetPage(pgid.SCRIPTS).Set(scripts_data)
+		if project.HasSection(u'SCRIPTS'):
+			self.Wizard.GetPage(pgid.SCRIPTS).Set(project.Get(u'SCRIPTS'))
 
 		# *** Get Changelog Data *** #
-		clog_data = data.split(u'<<CHANGELOG>>\n')[1].split(u'\n<</CHANGELOG>>')[0]
-		self.Wizard.GetPage(pgid.CHANGELOG).Set(clog_data)
+		if project.HasSection(u'CHANGELOG'):
+			self.Wizard.GetPage(pgid.CHANGELOG).Set(project.Get(u'CHANGELOG'))
 
 		# *** Get Copyright Data *** #
-		try:
-			cpright_data = data.split(u'<<COPYRIGHT>>\n')[1].split(u'\n<</COPYRIGHT')[0]
-			self.Wizard.GetPage(pgid.COPYRIGHT).Set(cpright_data)
-
-		except IndexError:
-			pass
+		if project.HasSection(u'COPYRIGHT'):
+			self.Wizard.GetPage(pgid.COPYRIGHT).Set(project.Get(u'COPYRIGHT'))
 
 		# *** Get Menu Data *** #
-		m_data = data.split(u'<<MENU>>\n')[1].split(u'\n<</MENU>>')[0]
-		self.Wizard.GetPage(pgid.MENU).SetLauncherData(m_data, enabled=True)
+		if project.HasSection(u'MENU'):
+			self.Wizard.GetPage(pgid.MENU).SetLauncherData(project.Get(u'MENU'), enabled=True)
 
 		# Get Build Data
-		build_data = data.split(u'<<BUILD>>\n')[1].split(u'\n<</BUILD')[0]#.split(u'\n')
-		self.Wizard.GetPage(pgid.BUILD).Set(build_data)
+		if project.HasSection(u'BUILD'):
+			self.Wizard.GetPage(pgid.BUILD).Set(project.Get(u'BUILD'))
 
 		return opened
 
 
-	## TODO: Doxygen
-	def ProjectChanged(self, event=None):
-		if DebugEnabled():
-			Logger.Debug(__name__, u'MainWindow.OnProjectChanged:')
-			print(u'  Object: {}'.format(event.GetEventObject()))
+	## Schedules check for unsaved changes when a field changes
+	#
+	#  Fields often change many times in a row (e.g. typing or adding files),
+	#  so the check is done after they have stopped changing.
+	def OnProjectChanged(self, event=None):
+		if event:
+			event.Skip()
+
+		self.StatusTimer.Start(500, wx.TIMER_ONE_SHOT)
+
+
+	## Restores unsaved changes from autosave journal after a crash
+	#
+	#  Only journals of instances that are no longer running are offered for
+	#  recovery. Journals that are recovered or declined are deleted. If
+	#  there is more than one, the rest are kept for the next start.
+	#
+	#  \return
+	#	\b \e True if changes were recovered
+	def RecoverAutosave(self):
+		recovered = False
+
+		# This instance's journal is locked, so it is not found
+		for JOURNAL in FindOrphanedJournals(PATH_cache, u'autosave'):
+			if recovered:
+				# Only one session can be recovered into this window
+				JOURNAL.Unlock()
+
+				continue
+
+			entries = JOURNAL.Read()
+			project_file = entries.pop(u'PROJECT', u'')
+
+			if entries:
+				msg = GT(u'Debreate did not exit cleanly. Recover unsaved project changes?')
+
+				if ConfirmationDialog(self, GT(u'Recover Project'), msg).ShowModal() in (wx.ID_OK, wx.OK):
+					self.RecoverProject(entries, project_file)
 
-		self.ProjectDirty = True
+					recovered = True
+
+			JOURNAL.Discard()
+
+		return recovered
+
+
+	## Applies sections recovered from an autosave journal
+	#
+	#  Journalled sections are applied over the project file they were made to.
+	#
+	#  \param entries
+	#	\b \e Dictionary of section names mapped to recovered text
+	#  \param projectFile
+	#	Path of project file that changes were made to, or empty string
+	def RecoverProject(self, entries, projectFile):
+		base = None
+		if projectFile and os.path.isfile(projectFile):
+			base = ReadProject(ReadFile(projectFile) or u'')
+
+			if not base.IsProject():
+				base = None
+
+		base_entries = {}
+		if base:
+			base_entries = self.GetProjectEntries(base)
+
+		sections = []
+		for PGID, NAME in project_sections:
+			if NAME in entries:
+				sections.append(entries[NAME])
+
+			elif NAME in base_entries:
+				sections.append(base_entries[NAME])
+
+		Logger.Info(__name__, u'Recovering project sections: {}'.format(u', '.join(sorted(entries))))
+
+		self.LoadProjectSections(ProjectSections(u'[DEBREATE-{}]\n{}'.format(VERSION_string,
+				u'\n'.join(sections))))
+
+		if base:
+			self.LoadedProject = projectFile
+			self.StructuredFormat = isinstance(base, StructuredProject)
+
+		if base:
+			self.ResetAutosave(self.GetProjectFingerprints(base), projectFile)
+
+		else:
+			self.ResetAutosave({})
+
+		# Recovered changes are moved to this instance's journal & remain until project is saved
+		recovered = dict(entries)
+		recovered[u'PROJECT'] = projectFile
+
+		self.Journal.Append(recovered)
+
+
+	## Sets saved state of project used for autosave journal & unsaved changes
+	#
+	#  Sections of pages that have not been constructed & are not in
+	#  fingerprints are set when the pages are constructed.
+	#
+	#  \param fingerprints
+	#	\b \e Dictionary of section names mapped to fingerprints of saved text,
+	#	or \b \e None to use current save data of pages
+	#  \param projectFile
+	#	Path of project file that sections were read from or saved to
+	def ResetAutosave(self, fingerprints=None, projectFile=None):
+		if fingerprints == None:
+			fingerprints = {}
+
+			for PGID, NAME in project_sections:
+				if self.Wizard.IsPageConstructed(PGID):
+					fingerprints[NAME] = GetPage(PGID).GetSaveFingerprint()
+
+		self.SavedFingerprints = dict(fingerprints)
+
+		self.DeferredSections = set()
+		for PGID, NAME in project_sections:
+			if NAME not in fingerprints and not self.Wizard.IsPageConstructed(PGID):
+				self.DeferredSections.add(NAME)
+
+		self.SavedFile = None
+
+		if projectFile != None:
+			try:
+				f_stat = os.stat(projectFile)
+				self.SavedFile = (os.path.abspath(projectFile), f_stat.st_mtime, f_stat.st_size,)
+
+			except OSError:
+				pass
+
+		# Project path is not part of base, so it is the first record of a new journal
+		self.Journal.SetBase(self.SavedFingerprints)
+
+		self.SaveRevisions = {}
+		for PGID, NAME in project_sections:
+			if self.Wizard.IsPageConstructed(PGID):
+				self.SaveRevisions[PGID] = GetPage(PGID).GetSaveRevision()
+
+		self.UpdateSavedStatus()
 
 
 	## TODO: Doxygen
@@ -638,20 +1057,40 @@ class MainWindow(wx.Frame, ModuleAccessCtrl):
 		for page in self.Wizard.GetAllPages():
 			page.Reset()
 
-		self.SetTitle(default_title)
-
 		# Reset the saved project field so we know that a project file doesn't exists
 		self.LoadedProject = None
+		self.StructuredFormat = False
+
+		self.ResetAutosave()
 
 		return True
 
 
-	## TODO: Doxygen
+	## Marks title with an asterisk if project has unsaved changes
+	#
+	#  \param status
+	#	\b \e True if project has unsaved changes
 	def SetSavedStatus(self, status):
-		if status: # If status is changing to unsaved this is True
-			title = self.GetTitle()
-			if self.IsSaved() and title != default_title:
-				self.SetTitle(u'{}*'.format(title))
+		self.ProjectDirty = status
+
+		title = self.GetTitle().rstrip(u'*')
+		if status:
+			title = u'{}*'.format(title)
+
+		if title != self.GetTitle():
+			self.SetTitle(title)
+
+
+	## Compares pages with saved project & updates title
+	#
+	#  \return
+	#	\b \e List of sections that have changed
+	def UpdateSavedStatus(self):
+		changed = self.GetChangedSections()
+
+		self.SetSavedStatus(bool(changed))
+
+		return changed
 
 
 	## TODO: Doxygen
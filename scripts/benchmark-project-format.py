@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+## Compares size & parse time of text & structured project formats
+#
+#  A project with a large generated file list is saved in both formats,
+#  then read the way Debreate reads it when a project is opened.
+#
+#  Usage: benchmark-project-format.py [file count]
+
+# MIT licensing
+# See: docs/LICENSE.txt
+
+
+import os, sys, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+from globals.projectfile import FormatProject
+from globals.projectfile import ProjectSections
+from globals.projectfile import ReadProject
+
+
+file_count = 100000
+if len(sys.argv) > 1:
+	file_count = int(sys.argv[1])
+
+# Files per source directory
+dir_size = 40
+
+
+## Creates text of a project in text format
+def CreateTextProject(count):
+	lines = [u'1']
+
+	for INDEX in range(count):
+		source = u'/home/user/projects/application/build/share/data/dir{:05d}'.format(INDEX // dir_size)
+		filename = u'file{:06d}.dat'.format(INDEX)
+		target = u'/usr/share/application/data/dir{:05d}'.format(INDEX // dir_size)
+
+		if INDEX % 10 == 0:
+			lines.append(u'{}/{}* -> {} -> {}'.format(source, filename, filename, target))
+
+		else:
+			lines.append(u'{}/{} -> {} -> {}'.format(source, filename, filename, target))
+
+	sections = (
+		(u'CTRL', u'Package: application\nVersion: 1.0\nMaintainer: User <user@example.com>\nArchitecture: all'),
+		(u'FILES', u'\n'.join(lines)),
+		(u'SCRIPTS', u'<<PREINST>>\n0\n<</PREINST>>\n<<POSTINST>>\n0\n<</POSTINST>>'),
+		(u'CHANGELOG', u'<<DEST>>DEFAULT<</DEST>>\n'),
+		(u'COPYRIGHT', u''),
+		(u'MENU', u'0'),
+		(u'BUILD', u'1\n1\n0'),
+		)
+
+	return u'[DEBREATE-0.8]\n{}'.format(u'\n'.join([u'<<{0}>>\n{1}\n<</{0}>>'.format(N, T) for N, T in sections]))
+
+
+## Reads file records from text format as wizbin.files.Page.Set did
+def ParseTextRecords(data):
+	records = []
+	files_data = ProjectSections(data).Get(u'FILES').split(u'\n')
+
+	for LINE in reversed(files_data[1:]):
+		executable = False
+
+		file_info = LINE.split(u' -> ')
+		absolute_filename = file_info[0]
+
+		if absolute_filename[-1] == u'*':
+			executable = True
+			absolute_filename = absolute_filename[:-1]
+
+		filename = file_info[1]
+		records.append((filename, absolute_filename[:len(absolute_filename) - len(filename)], file_info[2],
+				executable))
+
+	return records
+
+
+## Calls a function repeatedly & returns its result & the best time
+def Measure(function, *args):
+	best = None
+
+	for X in range(5):
+		start = time.time()
+		result = function(*args)
+		elapsed = time.time() - start
+
+		if best == None or elapsed < best:
+			best = elapsed
+
+	return result, best
+
+
+text_data = CreateTextProject(file_count)
+struct_data, convert_time = Measure(FormatProject, ProjectSections(text_data), u'0.8')
+
+text_records, text_time = Measure(ParseTextRecords, text_data)
+project, open_time = Measure(ReadProject, struct_data)
+
+def ReadAllRecords(data):
+	return ReadProject(data).GetManifest().Reversed()[:]
+
+struct_records, struct_time = Measure(ReadAllRecords, struct_data)
+
+def ReadFirstBatch(data):
+	return ReadProject(data).GetManifest().Reversed()[:500]
+
+batch, batch_time = Measure(ReadFirstBatch, struct_data)
+
+# Conversion must not change any section or record
+source = ProjectSections(text_data)
+lossless = struct_records == text_records
+for NAME in source.GetSectionNames():
+	if project.Get(NAME) != source.Get(NAME):
+		lossless = False
+
+text_size = len(text_data.encode(u'utf-8'))
+struct_size = len(struct_data.encode(u'utf-8'))
+
+print(u'Files:                        {}'.format(file_count))
+print(u'Text format size:             {} bytes'.format(text_size))
+print(u'Structured format size:       {} bytes ({:.1f}%)'.format(struct_size, 100.0 * struct_size / text_size))
+print(u'Text format, parse all files: {:.3f} s'.format(text_time))
+print(u'Structured, open project:     {:.3f} s'.format(open_time))
+print(u'Structured, first 500 files:  {:.3f} s'.format(batch_time))
+print(u'Structured, parse all files:  {:.3f} s'.format(struct_time))
+print(u'Conversion from text format:  {:.3f} s'.format(convert_time))
+print(u'Lossless:                     {}'.format(lossless))
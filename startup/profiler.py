@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+
+## \package startup.profiler
+#
+#  Measures time spent importing modules & in each phase of startup
+#
+#  This module must not import other local modules, so that it can be
+#  imported & started before them.
+
+# MIT licensing
+# See: docs/LICENSE.txt
+
+
+import __builtin__, sys, thread, time
+
+
+## Finds nothing, but notes names of modules that the import system searches for
+#
+#  Modules are only searched for when they are not already loaded, so
+#  the names identify modules loaded by an import statement.
+class ImportFinder:
+	## Constructor
+	#
+	#  \param profiler
+	#	startup.profiler.StartupProfiler instance
+	def __init__(self, profiler):
+		self.Profiler = profiler
+
+
+	## Notes name of module being searched for
+	#
+	#  \return
+	#	\b \e None, so the default import system loads the module
+	def find_module(self, fullname, path=None):
+		self.Profiler.AddRequest(fullname)
+
+		return None
+
+
+## Records import times & startup phase timings
+#
+#  Import times are measured by wrapping the built-in __import__ function.
+#  The self time of a module excludes time spent importing other modules
+#  from it, like Python 3's '-X importtime' option.
+class StartupProfiler:
+	def __init__(self):
+		self.Active = False
+
+		## Maximum startup time in seconds, or \b \e None
+		self.Budget = None
+
+		## Module names mapped to lists of self & cumulative import time
+		self.Imports = {}
+
+		## List of phase names & times
+		self.Phases = []
+		self.Phase = None
+		self.PhaseStart = None
+
+		## Path of file where cProfile statistics are written
+		self.Output = None
+		self.Profile = None
+
+		## Import frames of modules being loaded, each a list of start time,
+		#  time spent in nested imports & names of modules searched for
+		self.Stack = []
+
+		self.StartTime = None
+		self.StopTime = None
+
+		self.Finder = ImportFinder(self)
+		self.Import = None
+		self.Thread = None
+
+
+	## Notes a module searched for by the current import
+	#
+	#  \param name
+	#	Full name of module
+	def AddRequest(self, name):
+		if self.Stack and thread.get_ident() == self.Thread:
+			self.Stack[-1][2].append(name)
+
+
+	## Ends the current phase & starts a new one
+	#
+	#  \param name
+	#	Name of the new phase, or \b \e None to only end the current phase
+	def EndPhase(self, name=None):
+		if not self.Active:
+			return
+
+		now = time.time()
+
+		if self.Phase != None:
+			self.Phases.append((self.Phase, now - self.PhaseStart,))
+
+		self.Phase = name
+		self.PhaseStart = now
+
+
+	## Retrieves the startup time report
+	#
+	#  \param limit
+	#	Maximum number of modules to list
+	#  \return
+	#	\b \e Unicode text of phases & modules sorted by time
+	def GetReport(self, limit=30):
+		total = self.GetTotal()
+
+		lines = [
+			u'Startup profile',
+			u'',
+			u'Total: {:.3f} s'.format(total),
+			]
+
+		if self.Budget != None:
+			if self.IsOverBudget():
+				lines.append(u'Budget: {:.3f} s (exceeded by {:.3f} s)'.format(self.Budget, total - self.Budget))
+
+			else:
+				lines.append(u'Budget: {:.3f} s (OK)'.format(self.Budget))
+
+		lines.append(u'')
+		lines.append(u'Phases:')
+
+		# Phases can be entered more than once
+		phases = {}
+		for NAME, ELAPSED in self.Phases:
+			phases[NAME] = phases.get(NAME, 0.0) + ELAPSED
+
+		for NAME, ELAPSED in sorted(phases.items(), key=lambda P: P[1], reverse=True):
+			lines.append(u'  {:8.3f} s {:6.1f}%  {}'.format(ELAPSED, 100.0 * ELAPSED / max(total, 0.000001), NAME))
+
+		import_total = sum([I[0] for I in self.Imports.values()])
+		imports = sorted(self.Imports.items(), key=lambda I: I[1][0], reverse=True)
+
+		lines.append(u'')
+		lines.append(u'Imports ({} modules, {:.3f} s, slowest {} by self time):'.format(len(imports), import_total,
+				min(limit, len(imports))))
+		lines.append(u'  {:>10} {:>10}  {}'.format(u'self', u'cumulative', u'module'))
+
+		for NAME, TIMES in imports[:limit]:
+			lines.append(u'  {:8.3f} s {:8.3f} s  {}'.format(TIMES[0], TIMES[1], NAME))
+
+		if self.Output:
+			lines.append(u'')
+			lines.append(u'cProfile statistics written to: {}'.format(self.Output))
+
+		return u'\n'.join(lines)
+
+
+	## Retrieves total time from start of profiling
+	#
+	#  \return
+	#	\b \e Float seconds
+	def GetTotal(self):
+		if self.StartTime == None:
+			return 0.0
+
+		if self.StopTime == None:
+			return time.time() - self.StartTime
+
+		return self.StopTime - self.StartTime
+
+
+	## Replacement for built-in __import__ that measures import time
+	def ImportModule(self, name, *args, **kwargs):
+		if thread.get_ident() != self.Thread:
+			return self.Import(name, *args, **kwargs)
+
+		frame = [time.time(), 0.0, []]
+		self.Stack.append(frame)
+
+		try:
+			return self.Import(name, *args, **kwargs)
+
+		finally:
+			self.Stack.pop()
+
+			elapsed = time.time() - frame[0]
+
+			if self.Stack:
+				self.Stack[-1][1] += elapsed
+
+			# Python 2 adds None to sys.modules for failed implicit relative imports
+			loaded = [N for N in frame[2] if sys.modules.get(N) != None]
+
+			# Parent packages are loaded first, so time is added to the last module
+			if loaded:
+				times = self.Imports.setdefault(loaded[-1], [0.0, 0.0])
+				times[0] += elapsed - frame[1]
+				times[1] += elapsed
+
+
+	## Checks if startup took longer than the budget
+	def IsOverBudget(self):
+		return self.Budget != None and self.GetTotal() > self.Budget
+
+
+	## Starts profiling
+	#
+	#  \param output
+	#	Path of file where cProfile statistics are written, or \b \e None
+	def Start(self, output=None):
+		if self.Active:
+			return
+
+		self.Active = True
+		self.Output = output
+		self.Thread = thread.get_ident()
+		self.StartTime = time.time()
+
+		self.Import = __builtin__.__import__
+		__builtin__.__import__ = self.ImportModule
+		sys.meta_path.insert(0, self.Finder)
+
+		if self.Output:
+			import cProfile
+
+			self.Profile = cProfile.Profile()
+			self.Profile.enable()
+
+		self.EndPhase(u'imports')
+
+
+	## Starts profiling if requested by command line arguments
+	#
+	#  Arguments are checked before command_line.ParseArguments is called, so
+	#  that modules imported by the command_line module are also measured.
+	#
+	#  \param args
+	#	\b \e List of command line arguments
+	def StartFromArguments(self, args):
+		for A in args:
+			key = A.split(u'=')[0]
+
+			if key in (u'-p', u'--profile-startup',):
+				output = None
+				if u'=' in A:
+					output = A.split(u'=', 1)[1]
+
+				self.Start(output)
+
+				return
+
+
+	## Stops profiling & writes cProfile statistics
+	def Stop(self):
+		if not self.Active:
+			return
+
+		self.EndPhase()
+
+		if self.Profile:
+			self.Profile.disable()
+
+			try:
+				self.Profile.dump_stats(self.Output)
+
+			except IOError as e:
+				print(u'ERROR: Could not write profile statistics: {}'.format(e))
+
+				self.Output = None
+
+			self.Profile = None
+
+		if __builtin__.__import__ == self.ImportModule:
+			__builtin__.__import__ = self.Import
+
+		if self.Finder in sys.meta_path:
+			sys.meta_path.remove(self.Finder)
+
+		self.StopTime = time.time()
+		self.Active = False
+
+
+## Shared startup profiler
+profiler = StartupProfiler()
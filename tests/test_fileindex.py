@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+
+## \package tests.test_fileindex
+#
+#  Tests for globals.fileindex
+
+# MIT licensing
+# See: docs/LICENSE.txt
+
+
+import unittest
+
+from globals.fileindex import UpdateIndexes
+
+
+## Stand-in for globals.fileitem.FileItem that only has a path
+class Item:
+	def __init__(self, path):
+		self.Path = path
+
+
+	def GetPath(self):
+		return self.Path
+
+
+	def __repr__(self):
+		return u'Item({})'.format(self.Path)
+
+
+## Index maps kept up to date with a list of items, like input.filelist.BasicFileList
+class IndexedList:
+	def __init__(self, paths=()):
+		self.Items = []
+		self.PathIndexes = {}
+		self.ItemIndexes = {}
+
+		self.Append(paths)
+
+
+	def Append(self, paths):
+		start = len(self.Items)
+
+		self.Items += [Item(P) for P in paths]
+		UpdateIndexes(self.Items, self.PathIndexes, self.ItemIndexes, start)
+
+
+	def Insert(self, index, path):
+		self.Items.insert(index, Item(path))
+		UpdateIndexes(self.Items, self.PathIndexes, self.ItemIndexes, index)
+
+
+	## Removes items in given order & updates indexes once
+	def Remove(self, indexes):
+		removed = []
+		first_removed = None
+
+		for INDEX in indexes:
+			removed.append(self.Items.pop(INDEX))
+
+			if first_removed == None or INDEX < first_removed:
+				first_removed = INDEX
+
+		UpdateIndexes(self.Items, self.PathIndexes, self.ItemIndexes, first_removed, removed)
+
+		return removed
+
+
+class UpdateIndexesTest(unittest.TestCase):
+	## Checks index maps against maps rebuilt from the list
+	def assertConsistent(self, indexed):
+		item_indexes = {}
+		path_indexes = {}
+
+		for INDEX, ITEM in enumerate(indexed.Items):
+			item_indexes[ITEM] = INDEX
+			path_indexes.setdefault(ITEM.GetPath(), INDEX)
+
+		self.assertEqual(indexed.ItemIndexes, item_indexes)
+		self.assertEqual(indexed.PathIndexes, path_indexes)
+
+
+	def testAppend(self):
+		indexed = IndexedList([u'/a', u'/b'])
+		indexed.Append([u'/c', u'/a'])
+
+		self.assertConsistent(indexed)
+		self.assertEqual(indexed.PathIndexes[u'/a'], 0)
+
+
+	def testInsert(self):
+		indexed = IndexedList([u'/a', u'/b', u'/c'])
+		indexed.Insert(1, u'/c')
+		indexed.Insert(0, u'/d')
+
+		self.assertConsistent(indexed)
+		self.assertEqual(indexed.PathIndexes[u'/c'], 2)
+
+
+	def testRemoveOne(self):
+		indexed = IndexedList([u'/a', u'/b', u'/c'])
+		removed = indexed.Remove([1])
+
+		self.assertConsistent(indexed)
+		self.assertNotIn(removed[0], indexed.ItemIndexes)
+		self.assertNotIn(u'/b', indexed.PathIndexes)
+
+
+	def testRemoveBulk(self):
+		paths = [u'/dir/{}'.format(N) for N in range(100)]
+		indexed = IndexedList(paths)
+
+		# Removed from end first, like input.filelist.BasicFileList.RemoveSelected
+		indexed.Remove(range(80, 10, -1))
+
+		self.assertConsistent(indexed)
+		self.assertEqual(len(indexed.ItemIndexes), 30)
+
+
+	def testRemoveOutOfOrder(self):
+		indexed = IndexedList([u'/a', u'/b', u'/c', u'/d', u'/e', u'/f'])
+
+		# Indexes of remaining items shift after each removal, like input.filelist.FileList.RemoveSelected
+		indexed.Remove([4, 1, 2, 0])
+
+		self.assertConsistent(indexed)
+		self.assertEqual([I.GetPath() for I in indexed.Items], [u'/c', u'/f'])
+
+
+	def testRemoveDuplicates(self):
+		indexed = IndexedList([u'/a', u'/b', u'/a', u'/c', u'/b'])
+
+		# First occurrence removed, path maps to later duplicate
+		indexed.Remove([0])
+		self.assertConsistent(indexed)
+		self.assertEqual(indexed.PathIndexes[u'/a'], 1)
+
+		# Later duplicate removed, earlier mapping kept
+		indexed.Remove([3])
+		self.assertConsistent(indexed)
+		self.assertEqual(indexed.PathIndexes[u'/b'], 0)
+
+		indexed.Remove([1, 0])
+		self.assertConsistent(indexed)
+		self.assertEqual(indexed.PathIndexes, {u'/c': 0})
+
+
+	def testRemoveAll(self):
+		indexed = IndexedList([u'/a', u'/b', u'/c'])
+		indexed.Remove([2, 0, 0])
+
+		self.assertConsistent(indexed)
+		self.assertEqual(indexed.PathIndexes, {})
+
+
+	def testReset(self):
+		indexed = IndexedList([u'/a', u'/b'])
+		indexed.Items = [Item(u'/c')]
+
+		UpdateIndexes(indexed.Items, indexed.PathIndexes, indexed.ItemIndexes)
+
+		self.assertConsistent(indexed)
+
+
+	def testRandomChanges(self):
+		import random
+
+		rand = random.Random(7)
+		indexed = IndexedList()
+
+		for CHANGE in range(300):
+			action = rand.randint(0, 2)
+			count = len(indexed.Items)
+
+			if action == 0 or not count:
+				indexed.Append([u'/{}'.format(rand.randint(0, 20)) for N in range(rand.randint(1, 5))])
+
+			elif action == 1:
+				indexed.Insert(rand.randint(0, count), u'/{}'.format(rand.randint(0, 20)))
+
+			else:
+				indexes = []
+				for N in range(rand.randint(1, count)):
+					indexes.append(rand.randint(0, count - N - 1))
+
+				indexed.Remove(indexes)
+
+			self.assertConsistent(indexed)
+
+
+if __name__ == u'__main__':
+	unittest.main()
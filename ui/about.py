@@ -56,19 +56,22 @@ class AboutDialog(wx.Dialog):
 		self.CenterOnParent()
 
 		# Create a tabbed interface
-		tabs = wx.Notebook(self, -1)
+		self.tabs = wx.Notebook(self, -1)
 
 		# Pages
-		self.t_about = wx.Panel(tabs, -1)
-		t_credits = wx.Panel(tabs, -1)
-		t_changelog = wx.Panel(tabs, -1)
-		t_license = wx.Panel(tabs, -1)
+		self.t_about = wx.Panel(self.tabs, -1)
+		t_credits = wx.Panel(self.tabs, -1)
+		self.t_changelog = wx.Panel(self.tabs, -1)
+		self.t_license = wx.Panel(self.tabs, -1)
 
 		# Add pages to tabbed interface
-		tabs.AddPage(self.t_about, GT(u'About'))
-		tabs.AddPage(t_credits, GT(u'Credits'))
-		tabs.AddPage(t_changelog, GT(u'Changelog'))
-		tabs.AddPage(t_license, GT(u'License'))
+		self.tabs.AddPage(self.t_about, GT(u'About'))
+		self.tabs.AddPage(t_credits, GT(u'Credits'))
+		self.tabs.AddPage(self.t_changelog, GT(u'Changelog'))
+		self.tabs.AddPage(self.t_license, GT(u'License'))
+
+		## IDs of tabs mapped to functions that load their content when first selected
+		self.TabLoaders = {}
 
 		# FIXME: Center verticall on about tab
 		self.about_layout_V1 = BoxSizer(wx.VERTICAL)
@@ -94,30 +97,30 @@ class AboutDialog(wx.Dialog):
 		t_credits.Layout()
 
 		## Changelog text area
-		self.changelog = TextAreaPanel(t_changelog, style=wx.TE_READONLY)
+		self.changelog = TextAreaPanel(self.t_changelog, style=wx.TE_READONLY)
 		self.changelog.SetFont(MONOSPACED_MD)
 
 		log_sizer = BoxSizer(wx.VERTICAL)
 		log_sizer.Add(self.changelog, 1, wx.EXPAND)
 
-		t_changelog.SetSizer(log_sizer)
-		t_changelog.Layout()
+		self.t_changelog.SetSizer(log_sizer)
+		self.t_changelog.Layout()
 
 
 		## Licensing information text area
-		self.license = TextAreaPanel(t_license, style=wx.TE_READONLY)
+		self.license = TextAreaPanel(self.t_license, style=wx.TE_READONLY)
 		self.license.SetFont(MONOSPACED_MD)
 
 		license_sizer = BoxSizer(wx.VERTICAL)
 		license_sizer.Add(self.license, 1, wx.EXPAND)
 
-		t_license.SetSizer(license_sizer)
-		t_license.Layout()
+		self.t_license.SetSizer(license_sizer)
+		self.t_license.Layout()
 
 
 		# System info
-		sys_info = wx.Panel(tabs, -1)
-		tabs.AddPage(sys_info, GT(u'System Information'))
+		sys_info = wx.Panel(self.tabs, -1)
+		self.tabs.AddPage(sys_info, GT(u'System Information'))
 
 		## System's <a href="https://www.python.org/">Python</a> version
 		self.py_info = wx.StaticText(sys_info, -1,
@@ -152,8 +155,12 @@ class AboutDialog(wx.Dialog):
 		# Button to close the dialog
 		btn_confirm = CreateButton(self, btnid.CONFIRM)
 
+		# *** Event Handling *** #
+
+		self.tabs.Bind(wx.EVT_NOTEBOOK_PAGE_CHANGED, self.OnTabChanged)
+
 		sizer = BoxSizer(wx.VERTICAL)
-		sizer.Add(tabs, 1, wx.EXPAND)
+		sizer.Add(self.tabs, 1, wx.EXPAND)
 		sizer.Add(btn_confirm, 0, wx.ALIGN_RIGHT|lyt.PAD_RTB, 5)
 
 		self.SetSizer(sizer)
@@ -367,12 +374,39 @@ class AboutDialog(wx.Dialog):
 			event.Veto()
 
 
+	## Loads content of a tab if it has not been loaded
+	#
+	#  \param tab
+	#		\b \e wx.Window : Page of tabbed interface
+	def LoadTab(self, tab):
+		loader = self.TabLoaders.pop(tab.GetId(), None)
+
+		if loader:
+			loader()
+
+
+	## Loads content of a tab when it is first selected
+	#
+	#  \param event
+	#		<b><em>(wx.EVT_NOTEBOOK_PAGE_CHANGED)</em></b>
+	def OnTabChanged(self, event=None):
+		if event:
+			event.Skip()
+
+			self.LoadTab(self.tabs.GetPage(event.GetSelection()))
+
+
 	## Sets text to be shown on the 'Changelog' tab
 	#
-	#  FIXME: Change to create in class constructor
-	#  \param log_file
-	#		\b \e str : Path to changelog file on filesystem
+	#  The changelog is read when the tab is first selected.
 	def SetChangelog(self):
+		self.SetTabLoader(self.t_changelog, self.LoadChangelog)
+
+
+	## Reads changelog into 'Changelog' tab
+	#
+	#  FIXME: Change to create in class constructor
+	def LoadChangelog(self):
 		## Defines where the changelog is located
 		#
 		#  By default it is located in the folder 'doc'
@@ -406,9 +440,13 @@ class AboutDialog(wx.Dialog):
 
 	## Sets text to be shown on the 'License' tab
 	#
-	#  \param lic_file
-	#		\b \e : Path to license file on the filesystem
+	#  The license is read when the tab is first selected.
 	def SetLicense(self):
+		self.SetTabLoader(self.t_license, self.LoadLicense)
+
+
+	## Reads license into 'License' tab
+	def LoadLicense(self):
 		## Defines where the LICENSE.txt is located
 		#
 		#  By default it is located in the folder 'doc'
@@ -429,6 +467,21 @@ class AboutDialog(wx.Dialog):
 		self.license.SetInsertionPoint(0)
 
 
+	## Sets function to load content of a tab when it is first selected
+	#
+	#  Content is loaded immediately if the tab is already selected.
+	#
+	#  \param tab
+	#		\b \e wx.Window : Page of tabbed interface
+	#  \param loader
+	#		Function that loads content of tab
+	def SetTabLoader(self, tab, loader):
+		self.TabLoaders[tab.GetId()] = loader
+
+		if self.tabs.GetCurrentPage() == tab:
+			self.LoadTab(tab)
+
+
 	## Defines action to take when 'Ok' button is press
 	#
 	#  Closes the dialog.
@@ -98,7 +98,7 @@ class CheckList(BorderedPanel):
 	#	Sets items as checked if True
 	def AddItems(self, labels, checked=False):
 		for l in labels:
-			Logger.Debug(__name__, u'Adding item: {} (checked={})'.format(l, checked))
+			Logger.Debug(__name__, u'Adding item: {} (checked={})', args=(l, checked))
 
 			self.AddItem(l, checked)
 
@@ -162,7 +162,7 @@ class CheckList(BorderedPanel):
 			if CHK.IsChecked():
 				label = CHK.GetLabel()
 
-				Logger.Debug(__name__, GT(u'Retrieving checked label: {}').format(label))
+				Logger.Debug(__name__, lambda: GT(u'Retrieving checked label: {}').format(label))
 
 				checked_list.append(label)
 
@@ -6,13 +6,15 @@
 # See: docs/LICENSE.txt
 
 
-import os, time, traceback, wx
+import os, threading, traceback, wx
 
 from dbr.event				import EVT_REFRESH_LOG
 from dbr.event				import RefreshLogEvent
 from dbr.font				import GetMonospacedFont
 from dbr.language			import GT
 from dbr.log				import Logger
+from fileio					import watch
+from fileio.watch			import DirectoryWatcher
 from globals.application	import APP_logo
 from globals.fileitem		import FileItem
 from globals.ident			import btnid
@@ -30,9 +32,12 @@ from wiz.helper				import GetMainWindow
 from wiz.helper				import GetMenu
 
 
-# How often the log window will be refreshed
+# How often the log window will be refreshed if log file cannot be watched with inotify
 LOG_WINDOW_REFRESH_INTERVAL = 1
 
+## Number of characters kept in log window, older lines are removed
+LOG_WINDOW_MAX_SIZE = 262144
+
 def SetLogWindowRefreshInterval(value):
 	global LOG_WINDOW_REFRESH_INTERVAL
 	LOG_WINDOW_REFRESH_INTERVAL = value
@@ -56,7 +61,34 @@ class LogWindow(wx.Dialog):
 		self.LogFile = FileItem(logFile)
 		self.SetTitle()
 
-		self.LogPollThread = Thread(self.PollLogFile)
+		## Byte offset in log file up to which text has been displayed
+		self.LogOffset = 0
+
+		## Inode of displayed log file, to detect if it was replaced
+		self.LogInode = None
+
+		## First line read is skipped if reading started in the middle of it
+		self.LogSkipLine = False
+
+		## Index of next record to display from logger's buffer of recent records
+		self.RecordIndex = 0
+
+		## Set when a refresh event for new records has been posted & not handled
+		self.RecordsPending = False
+
+		## Log is being displayed & updated
+		self.Active = False
+
+		# Log of current session is displayed from records kept in memory
+		Logger.AddListener(self.OnLogRecord)
+
+		## Watches log directory for changes if inotify is available
+		self.Watcher = None
+		if watch.libc:
+			self.Watcher = DirectoryWatcher(self.OnLogDirChanged)
+
+		self.LogPollThread = None
+		self.LogPollStop = threading.Event()
 
 		self.DspLog = TextAreaPanel(self, style=wx.TE_READONLY)
 		self.DspLog.font_size = 8
@@ -70,6 +102,7 @@ class LogWindow(wx.Dialog):
 		# *** Event Handling *** #
 
 		EVT_REFRESH_LOG(self, wx.ID_ANY, self.OnLogTimestampChanged)
+		wx.EVT_WINDOW_DESTROY(self, self.OnDestroy)
 
 		wx.EVT_BUTTON(self, btnid.BROWSE, self.OnOpenLogFile)
 		wx.EVT_BUTTON(self, btnid.ZOOM, self.OnChangeFont)
@@ -118,11 +151,48 @@ class LogWindow(wx.Dialog):
 		self.SetPosition(wx.Point(posX, posY))
 
 
+	## Adds text to end of log display
+	#
+	#  Oldest lines are removed when text exceeds LOG_WINDOW_MAX_SIZE.
+	#
+	#  \param text
+	#	\b \e Unicode text to append
+	def AppendLog(self, text):
+		text_ctrl = self.DspLog.GetTextCtrl()
+
+		try:
+			text_ctrl.AppendText(text)
+
+			last_pos = text_ctrl.GetLastPosition()
+			if last_pos > LOG_WINDOW_MAX_SIZE:
+				# Text is removed in large steps so lines are not removed on every update
+				cut_pos = last_pos - (LOG_WINDOW_MAX_SIZE * 3 // 4)
+
+				# Remove up to the end of a line
+				line_end = text_ctrl.GetRange(cut_pos, min(last_pos, cut_pos + 4096)).find(u'\n')
+				if line_end >= 0:
+					cut_pos += line_end + 1
+
+				text_ctrl.Remove(0, cut_pos)
+
+			text_ctrl.ShowPosition(text_ctrl.GetLastPosition())
+
+		except wx.PyDeadObjectError:
+			tb_error = GS(traceback.format_exc())
+
+			Logger.Warn(__name__, u'Error refreshing log window. Details below:\n\n{}'.format(tb_error))
+
+
 	## Hides the log window & clears contents
 	def HideLog(self):
 		self.Show(False)
+		self.StopPolling()
 		self.DspLog.Clear()
 
+		# Log is read again when shown
+		self.LogInode = None
+		self.RecordIndex = 0
+
 
 	## Changes the font size
 	def OnChangeFont(self, event=None):
@@ -149,9 +219,40 @@ class LogWindow(wx.Dialog):
 		self.HideLog()
 
 
+	## Stops watching log file when window is destroyed
+	def OnDestroy(self, event=None):
+		self.StopPolling()
+		Logger.RemoveListener(self.OnLogRecord)
+
+		if event:
+			event.Skip()
+
+
+	## Called from watcher thread when log directory has changed
+	#
+	#  \param dirs
+	#	\b \e Set of changed directories
+	def OnLogDirChanged(self, dirs):
+		if os.path.dirname(self.LogFile.GetPath()) in dirs:
+			wx.PostEvent(self, RefreshLogEvent(0))
+
+
+	## Called from logging thread when a message is logged
+	#
+	#  A single refresh event is posted for messages logged in a row.
+	#
+	#  \param record
+	#	dbr.log.LogRecord instance
+	def OnLogRecord(self, record):
+		if self.Active and not self.RecordsPending and self.IsSessionLog():
+			self.RecordsPending = True
+
+			wx.PostEvent(self, RefreshLogEvent(0))
+
+
 	## Called by refresh event to update the log display
 	def OnLogTimestampChanged(self, event=None):
-		self.RefreshLog()
+		self.UpdateLog()
 
 
 	## Opens a new log file
@@ -214,37 +315,33 @@ class LogWindow(wx.Dialog):
 			event.Skip(True)
 
 
-	## Creates a thread that polls for changes in log file
-	def PollLogFile(self, args=None):
-		while self and self.IsShown():
+	## Polls for changes in log file when inotify is not available
+	#
+	#  \param stopEvent
+	#	<b><i>threading.Event</i></b> that stops this thread when set
+	def PollLogFile(self, stopEvent):
+		while not stopEvent.is_set():
 			if self.LogFile.TimestampChanged():
-				print(u'Log timestamp changed, loading new log ...')
-
 				wx.PostEvent(self, RefreshLogEvent(0))
 
-			time.sleep(LOG_WINDOW_REFRESH_INTERVAL)
-
-
-	## Fills log with text file contents
-	def RefreshLog(self, event=None):
-		if self.LogFile.IsFile():
-			log_data = self.LogFile.Read()
+			stopEvent.wait(LOG_WINDOW_REFRESH_INTERVAL)
 
-			if not self.DspLog.IsEmpty():
-				self.DspLog.Clear()
 
-			self.DspLog.SetValue(log_data)
+	## Checks if displayed log is log of current session
+	def IsSessionLog(self):
+		return os.path.abspath(self.LogFile.GetPath()) == os.path.abspath(Logger.GetLogFile())
 
-			try:
-				# Yield here to make sure last line is displayed
-				# FIXME: Causes delay when debug enabled
-				wx.SafeYield()
-				self.DspLog.ShowPosition(self.DspLog.GetLastPosition())
 
-			except wx.PyDeadObjectError:
-				tb_error = GS(traceback.format_exc())
+	## Fills log with text file contents
+	#
+	#  Only the end of a large log file is read. Log of current session is
+	#  filled from logger's recent records.
+	def RefreshLog(self, event=None):
+		self.LogInode = None
+		self.RecordIndex = 0
 
-				Logger.Warn(__name__, u'Error refreshing log window. Details below:\n\n{}'.format(tb_error))
+		self.DspLog.Clear()
+		self.UpdateLog()
 
 
 	## Changes the file to be loaded & displayed
@@ -256,6 +353,9 @@ class LogWindow(wx.Dialog):
 		self.RefreshLog()
 		self.SetTitle()
 
+		if self.IsShown():
+			self.StartPolling()
+
 
 	## Updates the window's title using path of log file
 	def SetTitle(self):
@@ -269,10 +369,116 @@ class LogWindow(wx.Dialog):
 		self.RefreshLog()
 		self.Show(True)
 
-		if not self.LogPollThread.IsActive():
-			Logger.Debug(__name__, u'Starting log polling thread ...')
+		self.StartPolling()
 
-			self.LogPollThread.Start()
 
-		else:
+	## Starts watching log file for changes
+	def StartPolling(self):
+		self.Active = True
+
+		# Logger notifies of new records
+		if self.IsSessionLog():
+			self.StopWatching()
+
+			return
+
+		if self.Watcher:
+			self.Watcher.SetDirectories((os.path.dirname(self.LogFile.GetPath()),))
+
+			if not self.Watcher.IsRunning():
+				Logger.Debug(__name__, u'Watching log directory ...')
+
+				self.Watcher.Start()
+
+			return
+
+		if self.LogPollThread and self.LogPollThread.is_alive() and not self.LogPollStop.is_set():
 			Logger.Debug(__name__, u'Log polling thread is already started')
+
+			return
+
+		Logger.Debug(__name__, u'Starting log polling thread ...')
+
+		# A thread that is still stopping exits on its own, so new one gets its own stop event
+		self.LogPollStop = threading.Event()
+		self.LogPollThread = Thread(self.PollLogFile, self.LogPollStop)
+		self.LogPollThread.daemon = True
+		self.LogPollThread.Start()
+
+
+	## Stops updating log
+	def StopPolling(self):
+		self.Active = False
+		self.StopWatching()
+
+
+	## Stops watching log file for changes
+	def StopWatching(self):
+		if self.Watcher:
+			self.Watcher.Stop()
+
+		self.LogPollStop.set()
+
+
+	## Appends lines written to log file since it was last read
+	#
+	#  If the log file was replaced or truncated (e.g. rotated), the display is
+	#  cleared & the file is read again. Log of current session is read from
+	#  logger's recent records without file access.
+	def UpdateLog(self, event=None):
+		if self.IsSessionLog():
+			self.RecordsPending = False
+
+			records = Logger.GetRecords(self.RecordIndex)
+			if records:
+				self.RecordIndex = records[-1].Index + 1
+
+				self.AppendLog(u''.join([u'{}\n'.format(R.Format()) for R in records]))
+
+			return
+
+		log_path = self.LogFile.GetPath()
+
+		try:
+			f_stat = os.stat(log_path)
+
+		except OSError:
+			return
+
+		if f_stat.st_ino != self.LogInode or f_stat.st_size < self.LogOffset:
+			self.LogInode = f_stat.st_ino
+			self.LogOffset = max(0, f_stat.st_size - LOG_WINDOW_MAX_SIZE)
+			self.LogSkipLine = self.LogOffset > 0
+
+			self.DspLog.Clear()
+
+		if f_stat.st_size <= self.LogOffset:
+			return
+
+		try:
+			FILE_BUFFER = open(log_path, u'rb')
+
+			try:
+				FILE_BUFFER.seek(self.LogOffset)
+				data = FILE_BUFFER.read(f_stat.st_size - self.LogOffset)
+
+			finally:
+				FILE_BUFFER.close()
+
+		except IOError:
+			return
+
+		# A line that is still being written is read when it is complete
+		data_end = data.rfind(b'\n') + 1
+		if not data_end:
+			return
+
+		self.LogOffset += data_end
+		data = data[:data_end]
+
+		if self.LogSkipLine:
+			data = data[data.find(b'\n') + 1:]
+			self.LogSkipLine = False
+
+		if data:
+			self.AppendLog(data.decode(u'utf-8', u'replace'))
@@ -11,18 +11,28 @@ import os, traceback, wx
 from dbr.colors			import COLOR_executable
 from dbr.colors			import COLOR_link
 from dbr.colors			import COLOR_warn
+from dbr.event			import DirectoryListedEvent
+from dbr.event			import EVT_DIRECTORY_LISTED
+from dbr.event			import EVT_SEARCH_INDEX_READY
+from dbr.event			import EVT_TREE_ITEM_TYPES
+from dbr.event			import SearchIndexReadyEvent
+from dbr.event			import TreeItemTypesEvent
 from dbr.functions		import MouseInsideWindow
 from dbr.image			import GetCursor
 from dbr.imagelist		import sm_DirectoryImageList as ImageList
 from dbr.language		import GT
 from dbr.log			import Logger
+from fileio.scan		import DirectoryCache
+from fileio.scan		import scandir
 from globals.devices	import GetMountedStorageDevices
 from globals.execute	import ExecuteCommand
 from globals.execute	import GetExecutable
 from globals.ident		import menuid
-from globals.mime		import GetFileMimeType
+from globals.mime		import GetFileImageType
 from globals.paths		import ConcatPaths
 from globals.paths		import PATH_home
+from globals.search		import FilenameIndex
+from globals.threads	import Thread
 from ui.dialog			import ConfirmationDialog
 from ui.dialog			import ShowErrorDialog
 from ui.layout			import BoxSizer
@@ -30,6 +40,80 @@ from ui.panel			import BorderedPanel
 from wiz.helper			import GetMainWindow
 
 
+## Listings of directories shared by all ui.tree.DirectoryTree instances
+listing_cache = DirectoryCache()
+
+
+## Reads entries of a directory for caching
+#
+#  All entries, including hidden ones, are read so that filters can be
+#  changed without listing the directory again. Permissions are not read,
+#  because changing them does not change the directory's modification
+#  time & cached values would be out of date.
+#
+#  \param dirPath
+#	Directory to list
+#  \return
+#	\b \e List of (label, path, is_dir, is_file, is_link) tuples
+def ReadDirectory(dirPath):
+	if scandir:
+		return [(E.name, E.path, E.is_dir(), E.is_file(), E.is_symlink(),) for E in scandir(dirPath)]
+
+	entries = []
+
+	for LABEL in os.listdir(dirPath):
+		child_path = ConcatPaths((dirPath, LABEL))
+
+		entries.append((LABEL, child_path, os.path.isdir(child_path), os.path.isfile(child_path),
+				os.path.islink(child_path),))
+
+	return entries
+
+
+## Lists readable directories & files in a directory
+#
+#  Called from background thread by ui.tree.DirectoryTree.Expand. Listings
+#  are cached & only read again if directory has changed. Permissions are
+#  checked every time, so they are current when items are shown.
+#
+#  \param dirPath
+#	Directory to list
+#  \param excludePattern
+#	\b \e List of prefixes of names to exclude
+#  \param showHidden
+#	If \b \e True, names beginning with '.' are not excluded
+#  \return
+#	Sorted \b \e lists of directories & files as (label, path, is_link, is_executable) tuples
+def ListDirectory(dirPath, excludePattern, showHidden=False):
+	dirs = []
+	files = []
+
+	for LABEL, PATH, IS_DIR, IS_FILE, IS_LINK in listing_cache.Get(dirPath, ReadDirectory):
+		# Ignore filtered items
+		filtered = False
+		for FILTER in excludePattern:
+			if FILTER == u'.' and showHidden:
+				pass
+			elif LABEL.startswith(FILTER):
+				filtered = True
+				break
+
+		if filtered:
+			continue
+
+		# Filtered items are skipped first so their permissions are not checked
+		if not (IS_DIR or IS_FILE) or not os.access(PATH, os.R_OK):
+			continue
+
+		if IS_DIR:
+			dirs.append((LABEL, PATH, IS_LINK, False,))
+
+		else:
+			files.append((LABEL, PATH, IS_LINK, os.access(PATH, os.X_OK),))
+
+	return sorted(dirs), sorted(files)
+
+
 ## A wxcustom tree item
 #
 #  \param item
@@ -37,7 +121,7 @@ from wiz.helper			import GetMainWindow
 #  \param path
 #	\b \e string : The filename path to be associated with this instance
 class PathItem:
-	def __init__(self, item, path, label=None):
+	def __init__(self, item, path, label=None, fileType=None):
 		if path == None:
 			# So that calls to os.path.exists(PathItem.Path) do not raise exception
 			path = wx.EmptyString
@@ -49,47 +133,16 @@ class PathItem:
 		self.Type = None
 
 		if self.Path:
-			self.Type = GetFileMimeType(self.Path)
-
-			executables_binary = (
-				u'x-executable',
-				)
+			# Type may already be known, e.g. from listing parent directory
+			if fileType:
+				self.SetType(fileType)
 
-			executables_text = (
-				u'x-python',
-				u'x-shellscript',
-				)
-
-			# Don't use MIME type 'inode' for directories (symlinks are inodes)
-			if os.path.isdir(self.Path):
-				self.Type = u'folder'
-
-			elif self.Type.startswith(u'image'):
-				self.Type = u'image'
-
-			elif self.Type.startswith(u'audio'):
-				self.Type = u'audio'
-
-			elif self.Type.startswith(u'video'):
-				self.Type = u'video'
+			# Directories are not checked by contents (symlinks to directories are also folders)
+			elif os.path.isdir(self.Path):
+				self.SetType(u'folder')
 
 			else:
-				# Exctract second part of MIME type
-				self.Type = self.Type.split(u'/')[-1]
-
-				if self.Type in executables_binary:
-					self.Type = u'executable-binary'
-
-				elif self.Type in executables_text:
-					self.Type = u'executable-script'
-
-			self.ImageIndex = ImageList.GetImageIndex(self.Type)
-
-			# Use generic 'file' image as default
-			if self.ImageIndex == ImageList.GetImageIndex(u'failsafe'):
-				self.ImageIndex = ImageList.GetImageIndex(u'file')
-
-			Logger.Debug(__name__, u'PathItem type: {} ({})'.format(self.Type, self.Path))
+				self.SetType(GetFileImageType(self.Path))
 
 
 	## TODO: Doxygen
@@ -166,6 +219,51 @@ class PathItem:
 		return self.Children == items
 
 
+	## Sets item type & image
+	#
+	#  \param fileType
+	#	Image type (e.g. 'folder' or 'executable-binary') or MIME type string
+	def SetType(self, fileType):
+		executables_binary = (
+			u'x-executable',
+			)
+
+		executables_text = (
+			u'x-python',
+			u'x-shellscript',
+			)
+
+		if not fileType:
+			fileType = u'file'
+
+		if fileType.startswith(u'image'):
+			self.Type = u'image'
+
+		elif fileType.startswith(u'audio'):
+			self.Type = u'audio'
+
+		elif fileType.startswith(u'video'):
+			self.Type = u'video'
+
+		else:
+			# Exctract second part of MIME type
+			self.Type = fileType.split(u'/')[-1]
+
+			if self.Type in executables_binary:
+				self.Type = u'executable-binary'
+
+			elif self.Type in executables_text:
+				self.Type = u'executable-script'
+
+		self.ImageIndex = ImageList.GetImageIndex(self.Type)
+
+		# Use generic 'file' image as default
+		if self.ImageIndex == ImageList.GetImageIndex(u'failsafe'):
+			self.ImageIndex = ImageList.GetImageIndex(u'file')
+
+		Logger.Debug(__name__, u'PathItem type: {} ({})', args=(self.Type, self.Path))
+
+
 	## TODO: Doxygen
 	def SetItem(self, item, path):
 		self.Item = item
@@ -198,6 +296,18 @@ class DirectoryTree(wx.TreeCtrl):
 		# NOTE: Use individual items children???
 		self.item_list = []
 
+		## Directories being listed in background mapped to state of their expansion
+		self.loading = {}
+
+		## Path to expand down to as directories finish loading
+		self.expand_path = None
+
+		## Path to select when expanding down to it has finished
+		self.select_path = None
+
+		## Number of children appended at once while expanding
+		self.chunk_size = 200
+
 		self.root_item = self.AddRoot(GT(u'System'), ImageList.GetImageIndex(u'computer'))
 
 		self.COLOR_default = self.GetItemBackgroundColour(self.root_item)
@@ -257,6 +367,9 @@ class DirectoryTree(wx.TreeCtrl):
 		self.Bind(wx.EVT_TREE_BEGIN_DRAG, self.OnDragBegin)
 		self.Bind(wx.EVT_LEFT_UP, self.OnDragEnd)
 
+		EVT_DIRECTORY_LISTED(self, wx.ID_ANY, self.OnDirectoryListed)
+		EVT_TREE_ITEM_TYPES(self, wx.ID_ANY, self.OnItemTypes)
+
 		# *** Post-layout/event actions *** #
 
 		self.InitMountItems()
@@ -288,7 +401,12 @@ class DirectoryTree(wx.TreeCtrl):
 
 
 	## Override inherited method to return custom PathItem instances
-	def AppendItem(self, parent, label, path, image=-1, selImage=-1, expImage=-1, data=None):
+	#
+	#  \param fileInfo
+	#	Optional (file_type, is_link, is_executable) tuple so that filesystem
+	#	does not need to be checked, file_type being 'folder' or 'file'
+	def AppendItem(self, parent, label, path, image=-1, selImage=-1, expImage=-1, data=None,
+			fileInfo=None):
 		if isinstance(parent, PathItem):
 			parent = parent.GetBaseItem()
 
@@ -297,17 +415,27 @@ class DirectoryTree(wx.TreeCtrl):
 		if expImage >= 0:
 			self.SetItemImage(base_item, expImage, wx.TreeItemIcon_Expanded)
 
-		tree_item = PathItem(base_item, path, label)
+		if fileInfo:
+			file_type, is_link, is_exe = fileInfo
+			is_dir = file_type == u'folder'
 
-		if os.path.isdir(path):
+		else:
+			file_type = None
+			is_dir = os.path.isdir(path)
+			is_link = os.path.islink(path)
+			is_exe = not is_dir and os.access(path, os.X_OK)
+
+		tree_item = PathItem(base_item, path, label, file_type)
+
+		if is_dir:
 			# ???: Does this cause PathItem instance to be overwritten with wx.TreeItemId ...
 			#	  or other errors?
 			self.SetItemHasChildren(tree_item)
 
-		elif os.access(path, os.X_OK):
+		elif is_exe:
 			self.SetItemTextColour(base_item, COLOR_executable)
 
-		if os.path.islink(path):
+		if is_link:
 			self.SetItemTextColour(base_item, COLOR_link)
 
 		self.item_list.append(tree_item)
@@ -315,24 +443,143 @@ class DirectoryTree(wx.TreeCtrl):
 		return tree_item
 
 
+	## Appends next chunk of listed children to an expanding item
+	#
+	#  Chunks are appended in separate event loop iterations so the
+	#  interface stays responsive for large directories.
+	#
+	#  \param item
+	#	\b \e PathItem being expanded
+	#  \param state
+	#	\b \e Dictionary state of expansion
+	def AppendChildren(self, item, state):
+		# Tree may have been destroyed or expansion cancelled before call
+		if not self or self.loading.get(item) is not state:
+			return
+
+		entries = state[u'entries']
+		start = state[u'appended']
+		chunk = entries[start:start+self.chunk_size]
+
+		self.Freeze()
+
+		for LABEL, PATH, IS_LINK, IS_EXE, IS_DIR in chunk:
+			if IS_DIR:
+				child = self.AppendItem(item, LABEL, PATH, fileInfo=(u'folder', IS_LINK, False,))
+				self.SetItemImage(child, ImageList.GetImageIndex(u'folder'), wx.TreeItemIcon_Normal)
+				self.SetItemImage(child, ImageList.GetImageIndex(u'folder-open'), wx.TreeItemIcon_Expanded)
+
+			else:
+				child = self.AppendItem(item, LABEL, PATH, fileInfo=(u'file', IS_LINK, IS_EXE,))
+				self.SetItemImage(child, child.ImageIndex, wx.TreeItemIcon_Normal)
+
+				state[u'files'].append(child)
+
+			item.AddChild(child)
+
+		self.Thaw()
+
+		state[u'appended'] += len(chunk)
+
+		if state[u'appended'] < len(entries):
+			wx.CallAfter(self.AppendChildren, item, state)
+
+			return
+
+		wx.TreeCtrl.Delete(self, state[u'placeholder'])
+
+		# File icons are refined after all children are shown since files must be read
+		state[u'stage'] = u'types'
+		Thread(self.LoadTypes, item, state).Start()
+
+		self.ContinueExpandPath(item)
+
+
 	## Make sure image list cannot be changed
 	def AssignImageList(self):
 		return wx.TreeCtrl.AssignImageList(self, ImageList)
 
 
+	## Stops background expansion of items
+	#
+	#  Children that were partially added are removed so that the
+	#  directory is listed again the next time it is expanded.
+	#
+	#  \param item
+	#	\b \e PathItem to stop expanding, along with its descendants. If
+	#	\b \e None, all expansions are stopped & tree is not changed.
+	def CancelExpand(self, item=None):
+		cancelled = []
+
+		for ITEM in self.loading:
+			# Same path may be listed under more than one mounted item
+			if item == None or self.IsDescendant(ITEM, item):
+				cancelled.append(ITEM)
+
+		# Descendants are removed before their parents
+		for ITEM in sorted(cancelled, key=PathItem.GetPath, reverse=True):
+			state = self.loading.pop(ITEM)
+			state[u'cancelled'] = True
+
+			Logger.Debug(__name__, u'Cancelled expanding: {}', args=(ITEM.Path,))
+
+			if item != None and state[u'stage'] != u'types':
+				removed = set(ITEM.GetChildren())
+
+				# Also deletes placeholder item
+				self.DeleteChildren(ITEM.GetBaseItem())
+				self.item_list = [I for I in self.item_list if I not in removed]
+
+				ITEM.RemoveChildren()
+
+
 	## Override inherited method to avoid TypeError
 	def Collapse(self, item):
 		if isinstance(item, PathItem):
+			self.CancelExpand(item)
+
 			item = item.GetBaseItem()
 
 		return wx.TreeCtrl.Collapse(self, item)
 
 
+	## Expands items down to a path after directories on the way are loaded
+	#
+	#  \param item
+	#	\b \e PathItem whose children have been loaded
+	def ContinueExpandPath(self, item):
+		target = self.expand_path
+
+		if not target or not isinstance(item, PathItem):
+			return
+
+		for CHILD in item.GetChildren():
+			if target == CHILD.Path or target.startswith(CHILD.Path.rstrip(u'/') + u'/'):
+				if target == CHILD.Path:
+					self.expand_path = None
+
+					if self.select_path == CHILD.Path:
+						self.select_path = None
+						self.SelectPathItem(CHILD)
+
+				Logger.Debug(__name__, u'Expanding path: {}', args=(CHILD.Path,))
+
+				self.Expand(CHILD)
+
+				return
+
+		# Path not found in tree
+		self.expand_path = None
+		self.select_path = None
+
+
 	## Override inherited method to delete item & base item
 	#
 	#  TODO: Test if PathItem is actually removed from memory
 	def Delete(self, item):
 		if item:
+			self.CancelExpand(item)
+
 			deleted = wx.TreeCtrl.Delete(self, item.GetBaseItem())
 
 			item_index = 0
@@ -356,6 +603,10 @@ class DirectoryTree(wx.TreeCtrl):
 	#
 	#  FIXME: Need to make sure PathItem instances are removed from memory
 	def DeleteAllItems(self):
+		self.CancelExpand()
+		self.expand_path = None
+		self.select_path = None
+
 		self.DeleteChildren(self.root_item)
 
 		# ???: Redundant
@@ -382,6 +633,10 @@ class DirectoryTree(wx.TreeCtrl):
 
 	## Override inherited method so children are filled out
 	#
+	#  Directories are listed in a background thread. A placeholder child
+	#  is shown until the listing is done, then children are appended in
+	#  chunks & file icons are refined afterwards.
+	#
 	#  NOTE: Only items representing directories should expand
 	#  FIXME: Change icon when expanded/collapsed
 	def Expand(self, item):
@@ -389,85 +644,54 @@ class DirectoryTree(wx.TreeCtrl):
 			if item.IsFile():
 				return False
 
-			dirs = []
-			files = []
-
-			if not self.ItemHasChildren(item):
-				# FIXME: Should use regular expressions for filter
-				item_path = item.GetPath()
-
-				try:
-					for LABEL in os.listdir(item_path):
-						# Ignore filtered items
-						filtered = False
-						for FILTER in self.exclude_pattern:
-							if FILTER == u'.' and self.IsHiddenShown():
-								pass
-							elif LABEL.startswith(FILTER):
-								filtered = True
-								break
-
-						if not filtered:
-							child_path = ConcatPaths((item_path, LABEL))
-
-							if os.path.isdir(child_path) and os.access(child_path, os.R_OK):
-								dirs.append((LABEL, child_path,))
+			if item in self.loading:
+				pass
 
-							elif os.path.isfile(child_path) and os.access(child_path, os.R_OK):
-								files.append((LABEL, child_path,))
+			elif not self.ItemHasChildren(item):
+				state = {
+					u'cancelled': False,
+					u'stage': u'listing',
+					u'placeholder': wx.TreeCtrl.AppendItem(self, item.GetBaseItem(), GT(u'Loading ...')),
+					u'entries': [],
+					u'appended': 0,
+					u'files': [],
+					}
 
-					# Sort directories first
-					for DIR, PATH in sorted(dirs):
-						child = self.AppendItem(item, DIR, PATH)
-						self.SetItemImage(child, ImageList.GetImageIndex(u'folder'), wx.TreeItemIcon_Normal)
-						self.SetItemImage(child, ImageList.GetImageIndex(u'folder-open'), wx.TreeItemIcon_Expanded)
+				self.loading[item] = state
 
-						item.AddChild(child)
+				Thread(self.LoadChildren, item, state, self.exclude_pattern, self.IsHiddenShown()).Start()
 
-					for FILE, PATH in sorted(files):
-						child = self.AppendItem(item, FILE, PATH)
-						self.SetItemImage(child, child.ImageIndex, wx.TreeItemIcon_Normal)
+			else:
+				self.ContinueExpandPath(item)
 
-						item.AddChild(child)
+			item = item.GetBaseItem()
 
-				except OSError:
-					Logger.Warn(__name__, u'No such file or directory: {}'.format(item_path))
+		# Make sure parent items are expanded
+		parent = item
+		while parent != self.root_item:
+			parent = wx.TreeCtrl.GetItemParent(self, parent)
 
-		# Recursively expand parent items
-		parent = self.GetItemParent(item)
-		if parent:
-			self.Expand(parent)
+			if not parent.IsOk():
+				break
 
-		if isinstance(item, PathItem):
-			item = item.GetBaseItem()
+			if not wx.TreeCtrl.IsExpanded(self, parent):
+				wx.TreeCtrl.Expand(self, parent)
 
 		return wx.TreeCtrl.Expand(self, item)
 
 
 	## Expands a mounted item all the way down path
 	#
+	#  Items are expanded as their parent directories finish loading.
+	#
 	#  \param mount_item
 	#	Mounted \b \e PathItem to be expanded
 	#  \param path
 	#	Path to follow
 	def ExpandPath(self, mount_item, path):
-		self.Expand(mount_item)
-
-		children = self.GetItemChildren(mount_item)
-		while children:
-			in_path = False
+		self.expand_path = path
 
-			for CHILD in children:
-				in_path = CHILD.Path in path
-				if in_path:
-					Logger.Debug(__name__, u'Expanding path: {}'.format(CHILD.Path))
-
-					self.Expand(CHILD)
-					children = self.GetItemChildren(CHILD)
-					break
-
-			if not in_path:
-				break
+		self.Expand(mount_item)
 
 
 	## TODO: Doxygen
@@ -622,6 +846,54 @@ class DirectoryTree(wx.TreeCtrl):
 		return tuple(selected)
 
 
+	## Lists children of an item
+	#
+	#  Called from background thread, posts listing to tree.
+	#
+	#  \param item
+	#	\b \e PathItem being expanded
+	#  \param state
+	#	\b \e Dictionary state of expansion
+	#  \param excludePattern
+	#	\see ui.tree.ListDirectory
+	#  \param showHidden
+	#	\see ui.tree.ListDirectory
+	def LoadChildren(self, item, state, excludePattern, showHidden):
+		dirs = []
+		files = []
+
+		try:
+			dirs, files = ListDirectory(item.GetPath(), excludePattern, showHidden)
+
+		except OSError:
+			Logger.Warn(__name__, u'No such file or directory: {}'.format(item.GetPath()))
+
+		if not state[u'cancelled']:
+			wx.PostEvent(self, DirectoryListedEvent(0, item=item, state=state, dirs=dirs, files=files))
+
+
+	## Retrieves image types of files added to an expanded item
+	#
+	#  Called from background thread, posts types to tree.
+	#
+	#  \param item
+	#	\b \e PathItem that was expanded
+	#  \param state
+	#	\b \e Dictionary state of expansion
+	def LoadTypes(self, item, state):
+		files = list(state[u'files'])
+		types = []
+
+		for F in files:
+			if state[u'cancelled']:
+				return
+
+			types.append(GetFileImageType(F.Path))
+
+		if not state[u'cancelled']:
+			wx.PostEvent(self, TreeItemTypesEvent(0, item=item, state=state, types=list(zip(files, types))))
+
+
 	## Expands the user's home directory
 	def InitDirectoryLayout(self):
 		if self.mount_list:
@@ -667,6 +939,27 @@ class DirectoryTree(wx.TreeCtrl):
 				Logger.Debug(__name__, u'PathItem instance for "{}" directory already exists'.format(DEV.MountPoint))
 
 
+	## Checks if an item is found under another item in the tree
+	#
+	#  \param item
+	#	\b \e PathItem to check
+	#  \param ancestor
+	#	\b \e PathItem to check against
+	#  \return
+	#	\b \e True if 'item' is 'ancestor' or one of its descendants
+	def IsDescendant(self, item, ancestor):
+		ancestor = ancestor.GetBaseItem()
+		tree_item = item.GetBaseItem()
+
+		while tree_item.IsOk() and tree_item != self.root_item:
+			if tree_item == ancestor:
+				return True
+
+			tree_item = wx.TreeCtrl.GetItemParent(self, tree_item)
+
+		return False
+
+
 	## TODO: Doxygen
 	def IsExpanded(self, item):
 		if isinstance(item, PathItem):
@@ -794,6 +1087,22 @@ class DirectoryTree(wx.TreeCtrl):
 			Logger.Debug(__name__, u'No items were selected')
 
 
+	## Starts appending children of a directory that was listed in background
+	def OnDirectoryListed(self, event=None):
+		if event and self.loading.get(event.item) is event.state:
+			state = event.state
+			state[u'stage'] = u'appending'
+
+			# Directories are sorted first
+			for LABEL, PATH, IS_LINK, IS_EXE in event.dirs:
+				state[u'entries'].append((LABEL, PATH, IS_LINK, IS_EXE, True,))
+
+			for LABEL, PATH, IS_LINK, IS_EXE in event.files:
+				state[u'entries'].append((LABEL, PATH, IS_LINK, IS_EXE, False,))
+
+			self.AppendChildren(event.item, state)
+
+
 	## TODO: Doxygen
 	def OnDoubleClick(self, event=None):
 		mouse_event = False
@@ -941,6 +1250,20 @@ class DirectoryTree(wx.TreeCtrl):
 		return self.Expand(item)
 
 
+	## Updates icons of files after their types are retrieved in background
+	def OnItemTypes(self, event=None):
+		if event and self.loading.get(event.item) is event.state:
+			self.loading.pop(event.item)
+
+			self.Freeze()
+
+			for CHILD, FILE_TYPE in event.types:
+				CHILD.SetType(FILE_TYPE)
+				self.SetItemImage(CHILD, CHILD.ImageIndex, wx.TreeItemIcon_Normal)
+
+			self.Thaw()
+
+
 	## Catch mouse left down event for custom selection behavior
 	#
 	#  Resets selection to only currently selected item if modifiers are not present.
@@ -1150,6 +1473,50 @@ class DirectoryTree(wx.TreeCtrl):
 		self.current_path = path
 
 
+	## Selects a single item & scrolls it into view
+	#
+	#  \param item
+	#	\b \e PathItem to select
+	def SelectPathItem(self, item):
+		base_item = item.GetBaseItem()
+
+		self.UnselectAll()
+		wx.TreeCtrl.SelectItem(self, base_item)
+		self.EnsureVisible(base_item)
+
+
+	## Expands tree down to a path & selects it
+	#
+	#  The path is followed from the deepest mount item that contains it.
+	#
+	#  \param path
+	#	Absolute path of file or directory
+	#  \return
+	#	\b \e True if path is under a mount item
+	def ShowPath(self, path):
+		mount_item = None
+
+		for MOUNT in self.mount_list:
+			if path == MOUNT.Path or path.startswith(MOUNT.Path.rstrip(u'/') + u'/'):
+				if not mount_item or len(MOUNT.Path) > len(mount_item.Path):
+					mount_item = MOUNT
+
+		if not mount_item:
+			Logger.Debug(__name__, u'No mount item contains path: {}'.format(path))
+
+			return False
+
+		if path == mount_item.Path:
+			self.SelectPathItem(mount_item)
+
+			return True
+
+		self.select_path = path
+		self.ExpandPath(mount_item, path)
+
+		return True
+
+
 	## Sets the visible cursor on the Files page dependent on drag-&-drop state
 	#
 	#  FIXME: Does not work for wx 2.8
@@ -1176,6 +1543,8 @@ class DirectoryTree(wx.TreeCtrl):
 
 
 ## Directory tree with a nicer border
+#
+#  A search box above the tree finds files by name under the selected mount item.
 class DirectoryTreePanel(BorderedPanel):
 	def __init__(self, parent, w_id=wx.ID_ANY, pos=wx.DefaultPosition, size=wx.DefaultSize,
 			style=wx.TAB_TRAVERSAL, name=u'DirTreePnl'):
@@ -1186,10 +1555,35 @@ class DirectoryTreePanel(BorderedPanel):
 		# Give easy access of instance to parent
 		parent.DirTree = self.DirTree
 
+		self.ti_search = wx.SearchCtrl(self, style=wx.TE_PROCESS_ENTER)
+		self.ti_search.SetToolTip(wx.ToolTip(GT(u'Find files by beginning of name')))
+
+		self.lst_results = wx.ListBox(self, style=wx.LB_SINGLE)
+		self.lst_results.Hide()
+
+		## Index of names under selected mount item
+		self.SearchIndex = FilenameIndex()
+
+		## Paths listed in results
+		self.SearchResults = []
+
+		# *** Event Handling *** #
+
+		self.ti_search.Bind(wx.EVT_TEXT, self.OnSearch)
+		self.ti_search.Bind(wx.EVT_TEXT_ENTER, self.OnSearchEnter)
+		self.ti_search.Bind(wx.EVT_SEARCHCTRL_CANCEL_BTN, self.OnSearchCancel)
+		self.lst_results.Bind(wx.EVT_LISTBOX, self.OnSelectResult)
+
+		EVT_SEARCH_INDEX_READY(self, wx.ID_ANY, self.OnSearch)
+
+		self.Bind(wx.EVT_WINDOW_DESTROY, self.OnDestroy)
+
 		# *** Layout *** #
 
 		lyt_main = BoxSizer(wx.VERTICAL)
-		lyt_main.Add(self.DirTree, 1, wx.EXPAND)
+		lyt_main.Add(self.ti_search, 0, wx.EXPAND)
+		lyt_main.Add(self.lst_results, 1, wx.EXPAND)
+		lyt_main.Add(self.DirTree, 2, wx.EXPAND)
 
 		self.SetAutoLayout(True)
 		self.SetSizer(lyt_main)
@@ -1199,3 +1593,103 @@ class DirectoryTreePanel(BorderedPanel):
 	## Retrieve DirectoryTree instance so methods can be called from within other objects
 	def GetDirectoryTree(self):
 		return self.DirTree
+
+
+	## Retrieves directory to search in
+	#
+	#  \return
+	#	Path of selected mount item or user's home directory
+	def GetSearchRoot(self):
+		mount_item = self.DirTree.GetSelectedMountItem()
+
+		if mount_item:
+			return mount_item.Path
+
+		return PATH_home
+
+
+	## Stops building search index when panel is destroyed
+	def OnDestroy(self, event=None):
+		if event and event.GetEventObject() == self:
+			self.SearchIndex.Cancel()
+
+		if event:
+			event.Skip()
+
+
+	## Posts event from index thread when search index is complete
+	#
+	#  Builds that were replaced by a newer one are ignored.
+	def OnIndexReady(self, index, build):
+		if index is self.SearchIndex and index.IsCurrent(build):
+			wx.PostEvent(self, SearchIndexReadyEvent(0))
+
+
+	## Updates results as search text is typed
+	#
+	#  The index is built, or rebuilt, when the mount item or hidden file
+	#  visibility has changed.
+	def OnSearch(self, event=None):
+		text = self.ti_search.GetValue().strip()
+
+		if not text:
+			self.SetResults(())
+			return
+
+		root = self.GetSearchRoot()
+		show_hidden = self.DirTree.IsHiddenShown()
+
+		if root != self.SearchIndex.Root or show_hidden != self.SearchIndex.ShowHidden:
+			Logger.Debug(__name__, u'Indexing file names: {}'.format(root))
+
+			self.SearchIndex.Build(root, show_hidden, self.OnIndexReady)
+
+		self.SetResults(self.SearchIndex.Search(text))
+
+
+	## Clears search text & hides results
+	def OnSearchCancel(self, event=None):
+		self.ti_search.Clear()
+		self.SetResults(())
+
+
+	## Shows first result when enter is pressed in search box
+	def OnSearchEnter(self, event=None):
+		if self.SearchResults:
+			self.lst_results.SetSelection(0)
+			self.DirTree.ShowPath(self.SearchResults[0])
+
+
+	## Expands tree to selected result
+	def OnSelectResult(self, event=None):
+		selected = self.lst_results.GetSelection()
+
+		if selected != wx.NOT_FOUND and selected < len(self.SearchResults):
+			self.DirTree.ShowPath(self.SearchResults[selected])
+
+
+	## Lists search results
+	#
+	#  \param results
+	#	\b \e List of absolute paths
+	def SetResults(self, results):
+		results = list(results)
+
+		if results == self.SearchResults and self.lst_results.IsShown() == bool(results):
+			return
+
+		self.SearchResults = results
+
+		root = self.SearchIndex.Root
+		labels = []
+
+		for PATH in results:
+			if root and PATH.startswith(root.rstrip(u'/') + u'/'):
+				PATH = PATH[len(root.rstrip(u'/')) + 1:]
+
+			labels.append(PATH)
+
+		self.lst_results.Set(labels)
+		self.lst_results.Show(bool(results))
+
+		self.Layout()
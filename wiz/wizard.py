@@ -11,8 +11,10 @@
 import traceback, wx
 
 from dbr.event			import ChangePageEvent
+from dbr.event			import PageConstructedEvent
 from dbr.language		import GT
 from dbr.log			import Logger
+from fileio.journal		import GetFingerprint
 from globals.ident		import btnid
 from globals.ident		import chkid
 from globals.ident		import inputid
@@ -51,7 +53,7 @@ class Wizard(wx.Panel):
 
 		testing = u'alpha' in GetTestList()
 
-		# List of pages available in the wizard
+		# List of pages available in the wizard (WizardPage or PageProxy instances)
 		self.Pages = []
 
 		self.PagesIds = {}
@@ -135,11 +137,17 @@ class Wizard(wx.Panel):
 	#
 	#  \param page
 	#	Must either be a wiz.wizard.WizardPage instance or the string suffix of the page's module
-	def AddPage(self, page):
+	#  \param pageId
+	#	If set, page is the string suffix of the page's module & the page is
+	#	not constructed until it is first displayed or accessed
+	def AddPage(self, page, pageId=None):
 		err_msg = None
 		err_det = None
 
-		if not isinstance(page, WizardPage):
+		if pageId != None and not isinstance(page, (WizardPage, PageProxy)):
+			page = PageProxy(self, page, pageId)
+
+		elif not isinstance(page, (WizardPage, PageProxy)):
 			try:
 				pagemod = u'wizbin.{}'.format(page)
 				page = mimport(pagemod).Page(self)
@@ -151,8 +159,12 @@ class Wizard(wx.Panel):
 		lyt_main = self.GetSizer()
 
 		if not err_msg:
+			if isinstance(page, PageProxy):
+				if page in self.Pages:
+					err_msg = u'page is already added to wizard'
+
 			# Must already be child
-			if not isinstance(page, WizardPage):
+			elif not isinstance(page, WizardPage):
 				err_msg = u'not WizardPage instance'
 
 			elif page not in self.GetChildren():
@@ -174,7 +186,10 @@ class Wizard(wx.Panel):
 
 		main_window = GetMainWindow()
 
-		lyt_main.Add(page, 1, wx.EXPAND)
+		# Proxies add page to layout when it is constructed
+		if not isinstance(page, PageProxy):
+			lyt_main.Add(page, 1, wx.EXPAND)
+
 		self.Pages.append(page)
 
 		# Add to page menu
@@ -218,7 +233,11 @@ class Wizard(wx.Panel):
 	## Deletes all pages from the wizard
 	def ClearPages(self):
 		for page in self.Pages:
-			self.GetSizer().Remove(page)
+			if isinstance(page, PageProxy):
+				page = page.Page
+
+			if page:
+				self.GetSizer().Remove(page)
 
 		self.Pages = []
 
@@ -283,8 +302,11 @@ class Wizard(wx.Panel):
 	#	Path to target directory
 	def ExportPages(self, pageList, outDir):
 		for P in pageList:
+			if isinstance(P, PageProxy):
+				P = P.GetPage()
+
 			# Support using list of IDs instead of WizardPage instances
-			if not isinstance(P, WizardPage):
+			elif not isinstance(P, WizardPage):
 				P = self.GetPage(P)
 
 			P.Export(outDir)
@@ -305,6 +327,9 @@ class Wizard(wx.Panel):
 	def GetCurrentPage(self):
 		for page in self.Pages:
 			if page.IsShown():
+				if isinstance(page, PageProxy):
+					return page.GetPage()
+
 				return page
 
 
@@ -320,6 +345,8 @@ class Wizard(wx.Panel):
 
 	## Retrieves a page by ID
 	#
+	#  Pages that have not been constructed yet are constructed.
+	#
 	#  \param pageId
 	#	<b><i>Integer</i></b> ID of desired page
 	#  \return
@@ -327,6 +354,9 @@ class Wizard(wx.Panel):
 	def GetPage(self, pageId):
 		for P in self.Pages:
 			if P.GetId() == pageId:
+				if isinstance(P, PageProxy):
+					return P.GetPage()
+
 				return P
 
 		Logger.Warn(__name__, u'Page with ID {} has not been constructed'.format(pageId))
@@ -360,8 +390,10 @@ class Wizard(wx.Panel):
 		else:
 			self.ShowPage(self.Pages[showPage].Id)
 
+		# Proxies initialize pages when they are constructed
 		for PAGE in self.Pages:
-			PAGE.InitPage()
+			if isinstance(PAGE, WizardPage):
+				PAGE.InitPage()
 
 		self.Layout()
 
@@ -380,6 +412,21 @@ class Wizard(wx.Panel):
 		return self.SetPages(pages)
 
 
+	## Checks if a page has been constructed
+	#
+	#  \param pageId
+	#	<b><i>Integer</i></b> ID of page
+	#  \return
+	#	<b><i>False</i></b> if page is a wiz.wizard.PageProxy that has not
+	#	constructed its page or if ID not found
+	def IsPageConstructed(self, pageId):
+		for P in self.Pages:
+			if P.GetId() == pageId:
+				return not isinstance(P, PageProxy) or P.IsConstructed()
+
+		return False
+
+
 	## Handles event emitted by 'help' button
 	#
 	#  Shows a help dialog for currently displayed page
@@ -397,13 +444,22 @@ class Wizard(wx.Panel):
 	#  \param pageId
 	#	<b><i>Integer</i></b> ID of the page to be removed
 	def RemovePage(self, pageId):
-		page = self.GetPage(pageId)
+		page = None
+
+		# Pages are not constructed only to be removed
+		for P in self.Pages:
+			if P.GetId() == pageId:
+				page = P
+				break
 
 		if page in self.Pages:
 			self.Pages.pop(self.Pages.index(page))
 
+		if isinstance(page, PageProxy):
+			page = page.Page
+
 		lyt_main = self.GetSizer()
-		if page in lyt_main.GetChildWindows():
+		if page and page in lyt_main.GetChildWindows():
 			lyt_main.Remove(page)
 
 		self.Layout()
@@ -434,24 +490,26 @@ class Wizard(wx.Panel):
 
 	## Sets up the wizard for 'binary' mode
 	#
+	#  Pages are constructed when they are first displayed or accessed.
+	#
 	#  \param startPage
 	#	<b><i>Integer</i></b> index of page to be initially displayed
 	def SetModeBin(self, startPage=1):
 		self.Reset()
 
-		mods = [
-			u'control',
-			u'depends',
-			u'files',
-			u'scripts',
-			u'changelog',
-			u'copyright',
-			u'launchers',
-			u'build',
-			]
+		mods = (
+			(u'control', pgid.CONTROL),
+			(u'depends', pgid.DEPENDS),
+			(u'files', pgid.FILES),
+			(u'scripts', pgid.SCRIPTS),
+			(u'changelog', pgid.CHANGELOG),
+			(u'copyright', pgid.COPYRIGHT),
+			(u'launchers', pgid.MENU),
+			(u'build', pgid.BUILD),
+			)
 
-		for M in mods:
-			self.AddPage(M)
+		for M, PGID in mods:
+			self.AddPage(M, PGID)
 
 		self.Initialize(startPage)
 
@@ -554,6 +612,116 @@ class Wizard(wx.Panel):
 		wx.PostEvent(GetMainWindow(), ChangePageEvent(0))
 
 
+## Stands in for a wizard page until it is first displayed or accessed
+#
+#  The page's module is imported & the page constructed only when needed.
+#  Attributes not defined by the proxy are retrieved from the constructed
+#  page, so project I/O (e.g. GetSaveData & Set) constructs it on demand.
+class PageProxy:
+	## Constructor
+	#
+	#  \param wizard
+	#	wiz.wizard.Wizard instance that is parent of page
+	#  \param module
+	#	String suffix of the page's module
+	#  \param pageId
+	#	Identifier of the page
+	def __init__(self, wizard, module, pageId):
+		self.Wizard = wizard
+		self.Module = module
+		self.Id = pageId
+
+		## Constructed wiz.wizard.WizardPage instance
+		self.Page = None
+
+
+	## Retrieves attributes of constructed page
+	def __getattr__(self, name):
+		# Special methods are looked up for comparisons & truth tests
+		if name.startswith(u'__'):
+			raise AttributeError(name)
+
+		return getattr(self.GetPage(), name)
+
+
+	## Retrieves the page's ID without constructing it
+	def GetId(self):
+		return self.Id
+
+
+	## Retrieves the page's label without constructing it
+	def GetLabel(self):
+		if self.Id in pgid.Labels:
+			return pgid.Labels[self.Id]
+
+		return self.GetName()
+
+
+	## Retrieves the page's name without constructing it
+	def GetName(self):
+		return page_ids[self.Id]
+
+
+	## Retrieves the page, constructing it if necessary
+	#
+	#  Posts a 'page constructed' event to the main window after the page is
+	#  constructed & initialized.
+	#
+	#  \return
+	#	wiz.wizard.WizardPage instance
+	def GetPage(self):
+		if self.Page == None:
+			Logger.Debug(__name__, u'Constructing page: {}', args=(self.Module,))
+
+			self.Page = mimport(u'wizbin.{}'.format(self.Module)).Page(self.Wizard)
+			self.Wizard.GetSizer().Add(self.Page, 1, wx.EXPAND)
+			self.Page.InitPage()
+
+			# Processed immediately, so saved state is set before fields are changed
+			self.Wizard.GetEventHandler().ProcessEvent(PageConstructedEvent(self.Id))
+
+		return self.Page
+
+
+	## Hides the page if it has been constructed
+	def Hide(self):
+		if self.Page != None:
+			return self.Page.Hide()
+
+		return False
+
+
+	## Checks if the page has been constructed
+	def IsConstructed(self):
+		return self.Page != None
+
+
+	## Checks if the page is constructed & its fields are being populated in background
+	def IsLoading(self):
+		return self.Page != None and self.Page.IsLoading()
+
+
+	## Checks if the page is constructed & shown
+	def IsShown(self):
+		return self.Page != None and self.Page.IsShown()
+
+
+	## Resets the page's fields if it has been constructed
+	#
+	#  Pages that have not been constructed already have default settings.
+	def Reset(self):
+		if self.Page != None:
+			self.Page.Reset()
+
+
+	## Shows the page, constructing it if necessary
+	def Show(self, show=True):
+		if not show:
+			return self.Hide()
+
+		return self.GetPage().Show()
+
+
 ## Inherited class for wizard pages
 class WizardPage(ScrolledPanel):
 	## Constructor
@@ -583,6 +751,9 @@ class WizardPage(ScrolledPanel):
 		# Is added to prebuild check list
 		self.prebuild_check = True
 
+		## Save revision & fingerprint of save data when it was last generated
+		self.SaveFingerprint = None
+
 
 	## Retrieves the page's field's data
 	def Get(self):
@@ -633,6 +804,37 @@ class WizardPage(ScrolledPanel):
 		return tuple(required_fields)
 
 
+	## Retrieves fingerprint of the page's save data
+	#
+	#  The fingerprint is cached while the page's save revision does not
+	#  change, so pages that track revisions are not serialized again.
+	#
+	#  \return
+	#	\b \e String fingerprint
+	def GetSaveFingerprint(self):
+		revision = self.GetSaveRevision()
+
+		if revision != None and self.SaveFingerprint and self.SaveFingerprint[0] == revision:
+			return self.SaveFingerprint[1]
+
+		fingerprint = GetFingerprint(self.GetSaveData())
+		self.SaveFingerprint = (revision, fingerprint,)
+
+		return fingerprint
+
+
+	## Retrieves a value that changes whenever the page's save data changes
+	#
+	#  Pages that can track changes cheaply (e.g. a counter incremented on
+	#  edits) override this so that unchanged save data does not need to be
+	#  generated & compared.
+	#
+	#  \return
+	#	\b \e None if changes are not tracked
+	def GetSaveRevision(self):
+		return None
+
+
 	## Reads & parses page data from a formatted text file
 	#
 	#  \param filename
@@ -651,6 +853,11 @@ class WizardPage(ScrolledPanel):
 		return False
 
 
+	## Checks if the page's fields are still being populated in background
+	def IsLoading(self):
+		return False
+
+
 	## Checks the page's fields for exporting
 	#
 	#  \return
@@ -249,7 +249,7 @@ class Page(WizardPage):
 				task_eval = u'{} / {}'.format(current_task, task_count)
 
 				if message:
-					Logger.Debug(__name__, u'{} ({})'.format(message, task_eval))
+					Logger.Debug(__name__, u'{} ({})', args=(message, task_eval))
 
 					wx.Yield()
 					build_progress.Update(current_task, message)
@@ -272,24 +272,24 @@ class Page(WizardPage):
 
 					if os.path.isdir(f_src):
 						if os.path.islink(f_src) and no_follow_link:
-							Logger.Debug(__name__, u'Adding directory symbolic link to stage: {}'.format(f_tgt))
+							Logger.Debug(__name__, u'Adding directory symbolic link to stage: {}', args=(f_tgt,))
 
 							os.symlink(os.readlink(f_src), f_tgt)
 						else:
-							Logger.Debug(__name__, u'Adding directory to stage: {}'.format(f_tgt))
+							Logger.Debug(__name__, u'Adding directory to stage: {}', args=(f_tgt,))
 
 							shutil.copytree(f_src, f_tgt)
 							os.chmod(f_tgt, 0o0755)
 					elif os.path.isfile(f_src):
 						if os.path.islink(f_src) and no_follow_link:
-							Logger.Debug(__name__, u'Adding file symbolic link to stage: {}'.format(f_tgt))
+							Logger.Debug(__name__, u'Adding file symbolic link to stage: {}', args=(f_tgt,))
 
 							os.symlink(os.readlink(f_src), f_tgt)
 						else:
 							if exe:
-								Logger.Debug(__name__, u'Adding executable to stage: {}'.format(f_tgt))
+								Logger.Debug(__name__, u'Adding executable to stage: {}', args=(f_tgt,))
 							else:
-								Logger.Debug(__name__, u'Adding file to stage: {}'.format(f_tgt))
+								Logger.Debug(__name__, u'Adding file to stage: {}', args=(f_tgt,))
 
 							shutil.copy(f_src, f_tgt)
 
@@ -342,7 +342,7 @@ class Page(WizardPage):
 							F = ConcatPaths((ROOT, F))
 
 							if FileUnstripped(F):
-								Logger.Debug(__name__, u'Unstripped file: {}'.format(F))
+								Logger.Debug(__name__, u'Unstripped file: {}', args=(F,))
 
 								# FIXME: Strip command should be set as class member?
 								ExecuteCommand(GetExecutable(u'strip'), F)
@@ -955,7 +955,7 @@ class Page(WizardPage):
 				# Remove old overrides
 				self.lint_overrides = []
 				for L in overrides_dialog.GetCheckedLabels():
-					Logger.Debug(__name__, GT(u'Adding Lintian override: {}').format(L))
+					Logger.Debug(__name__, lambda: GT(u'Adding Lintian override: {}').format(L))
 
 					self.lint_overrides.append(L)
 
@@ -8,9 +8,13 @@
 
 import os, traceback, wx
 
+from dbr.event			import EVT_FILES_COLLECTED
+from dbr.event			import EVT_INSTALL_COLLISIONS
+from dbr.event			import FilesCollectedEvent
 from dbr.language		import GT
 from dbr.log			import Logger
 from fileio.fileio		import ReadFile
+from fileio.scan		import CollectFiles
 from globals.bitmaps	import ICON_ERROR
 from globals.bitmaps	import ICON_EXCLAMATION
 from globals.errorcodes	import dbrerrno
@@ -19,7 +23,9 @@ from globals.ident		import chkid
 from globals.ident		import inputid
 from globals.ident		import pgid
 from globals.paths		import ConcatPaths
+from globals.projectfile	import TextManifest
 from globals.strings	import TextIsEmpty
+from globals.threads	import Thread
 from globals.tooltips	import SetPageToolTips
 from input.filelist		import FileListESS
 from input.filelist		import columns
@@ -31,7 +37,6 @@ from ui.dialog			import DetailedMessageDialog
 from ui.dialog			import GetDirDialog
 from ui.dialog			import ShowDialog
 from ui.dialog			import ShowErrorDialog
-from ui.dialog			import ShowMessageDialog
 from ui.layout			import BoxSizer
 from ui.panel			import BorderedPanel
 from ui.progress		import PD_DEFAULT_STYLE
@@ -114,6 +119,9 @@ class Page(WizardPage):
 		# Display area for files added to list
 		self.lst_files = FileListESS(self, inputid.LIST, name=u'filelist')
 
+		## State of files being collected in background by wizbin.files.Page.LoadPaths
+		self.CollectState = None
+
 		# *** Event Handling *** #
 
 		# create an event to enable/disable custom widget
@@ -130,6 +138,12 @@ class Page(WizardPage):
 		self.btn_browse.Bind(wx.EVT_BUTTON, self.OnBrowse)
 		btn_refresh.Bind(wx.EVT_BUTTON, self.OnRefreshFileList)
 
+		# Collisions of files inside directories are found in background
+		EVT_INSTALL_COLLISIONS(self.lst_files, wx.ID_ANY, self.OnInstallCollisions)
+
+		# Files to add are collected in background
+		EVT_FILES_COLLECTED(self, wx.ID_ANY, self.OnFilesCollected)
+
 		# ???: Not sure what these do
 		wx.EVT_KEY_DOWN(self.ti_target, self.GetDestValue)
 		wx.EVT_KEY_UP(self.ti_target, self.CheckDest)
@@ -232,30 +246,51 @@ class Page(WizardPage):
 					style=PD_DEFAULT_STYLE|wx.PD_CAN_ABORT)
 			progress.Show()
 
-		completed = 0
+		records = []
 		for D in sorted(dirs):
 			for F in sorted(dirs[D]):
-				if progress and progress.WasCancelled():
-					progress.Destroy()
-					return False
+				records.append((F, D, target, False))
 
-				if progress:
-					wx.Yield()
-					progress.Update(completed, GT(u'Adding file {}').format(F))
+		def update_progress(completed):
+			if progress.WasCancelled():
+				return False
 
-				self.lst_files.AddFile(F, D, target)
+			wx.Yield()
+			progress.Update(completed, GT(u'Adding file {}').format(records[completed-1][0]))
 
-				completed += 1
+		collisions = self.lst_files.InstallIndex.GetCollisions()
+
+		self.lst_files.AddFiles(records, update_progress if progress else None)
+
+		collisions = sorted(self.lst_files.InstallIndex.GetCollisions() - collisions)
 
 		if progress:
+			cancelled = progress.WasCancelled()
+
 			wx.Yield()
-			progress.Update(completed)
+			progress.Update(fileCount)
 
 			progress.Destroy()
 
+			if cancelled:
+				return False
+
+		if collisions:
+			self.ShowCollisions(collisions)
+
 		return True
 
 
+	## Stops collecting files in background & closes progress dialog
+	def CancelCollecting(self):
+		state = self.CollectState
+		self.CollectState = None
+
+		if state:
+			state[u'cancelled'] = True
+			state[u'dialog'].Destroy()
+
+
 	## TODO: Doxygen
 	def CheckDest(self, event=None):
 		if TextIsEmpty(self.ti_target.GetValue()):
@@ -270,6 +305,36 @@ class Page(WizardPage):
 			event.Skip()
 
 
+	## Collects files to be added to list
+	#
+	#  Called from background thread. Batches of files are posted to the
+	#  page, followed by an event with 'done' set when collecting has ended.
+	#
+	#  \param state
+	#	\b \e Dictionary state of collecting
+	#  \see fileio.scan.CollectFiles
+	def CollectPaths(self, state, paths, preserveTop, individually):
+		def post_batch(batch):
+			if state[u'cancelled']:
+				return False
+
+			wx.PostEvent(self, FilesCollectedEvent(0, state=state, batch=batch, done=False))
+
+			return True
+
+		error = None
+
+		try:
+			CollectFiles(paths, preserveTop, individually, post_batch,
+					aborted=lambda: state[u'cancelled'])
+
+		except:
+			error = traceback.format_exc()
+
+		if not state[u'cancelled']:
+			wx.PostEvent(self, FilesCollectedEvent(0, state=state, batch=None, done=True, error=error))
+
+
 	## Retrieves information on files to be packaged
 	#
 	#  \return
@@ -303,10 +368,12 @@ class Page(WizardPage):
 
 	## Retrieves number of files in list
 	#
+	#  Files that are still being loaded in background are included.
+	#
 	#  \return
 	#	<b><i>Integer</i></b> count of items in file list
 	def GetFileCount(self):
-		return self.lst_files.GetItemCount()
+		return self.lst_files.GetItemCount() + self.lst_files.GetPendingCount()
 
 
 	## Retrieves the file list object used by this page
@@ -322,6 +389,9 @@ class Page(WizardPage):
 	#  \return
 	#	List formatted text
 	def GetSaveData(self):
+		# All project files must be listed before saving
+		self.lst_files.FinishLoading()
+
 		file_list = []
 		item_count = self.lst_files.GetItemCount()
 
@@ -334,7 +404,7 @@ class Page(WizardPage):
 				absolute_filename = ConcatPaths((source, filename))
 
 				# Populate list with tuples of ('src', 'file', 'dest')
-				if self.lst_files.GetItemTextColour(count) == (255, 0, 0):
+				if self.lst_files.IsExecutable(count):
 					# Mark file as executable
 					file_list.append((u'{}*'.format(absolute_filename), filename, target))
 
@@ -357,6 +427,13 @@ class Page(WizardPage):
 			return u'<<FILES>>\n0\n<</FILES>>'
 
 
+	## Retrieves revision of file list
+	#
+	#  \see wiz.wizard.WizardPage.GetSaveRevision
+	def GetSaveRevision(self):
+		return self.lst_files.Revision
+
+
 	## Retrieves the target output directory
 	#
 	#  FIXME: Duplicate of wizbin.files.Page.GetDestValue?
@@ -428,21 +505,31 @@ class Page(WizardPage):
 		return 0
 
 
+	## Checks if project files are being added to the list in background
+	def IsLoading(self):
+		return self.lst_files.IsLoading()
+
+
 	## Checks if the page is ready for export/build
 	#
 	#  \return
 	#	<b><i>True</i></b> if the file list (self.lst_files) is not empty
 	def IsOkay(self):
-		return not self.lst_files.IsEmpty()
+		return not self.lst_files.IsEmpty() or self.lst_files.IsLoading()
 
 
 	## Reads files & directories & preps for loading into list
 	#
+	#  Files are collected in a background thread while a progress dialog
+	#  is shown. Batches are posted with dbr.event.FilesCollectedEvent &
+	#  files are added to list when collecting is done.
+	#
 	#  \param pathsList
 	#	<b><i>List/Tuple</i></b> of <b><i>string</i></b> values representing
 	#	files & directories to be added
 	#  \return
-	#	Value of wizbin.files.Page.AddPaths, or <b><i>False</i></b> in case of error
+	#	<b><i>True</i></b> if files are being collected, or <b><i>False</i></b> in case of error
+	#  \see wizbin.files.Page.OnFilesCollected
 	def LoadPaths(self, pathsList):
 		if isinstance(pathsList, tuple):
 			pathsList = list(pathsList)
@@ -450,118 +537,110 @@ class Page(WizardPage):
 		if not pathsList or not isinstance(pathsList, list):
 			return False
 
-		file_list = []
-		dir_list = {}
+		# Only one set of paths is collected at a time
+		if self.CollectState:
+			self.CancelCollecting()
 
 		prep = ProgressDialog(GetMainWindow(), GT(u'Processing Files'), GT(u'Scanning files ...'),
 				style=wx.PD_APP_MODAL|wx.PD_AUTO_HIDE|wx.PD_CAN_ABORT)
 
-		# Only update the gauge every N files (hack until I figure out timer)
-		update_interval = 450
-		count = 0
-
 		prep.Show()
 
-		if not self.chk_preserve_top.GetValue():
-			for INDEX in reversed(range(len(pathsList))):
-				path = pathsList[INDEX]
-				if os.path.isdir(path):
-					# Remove top-level directory from list
-					pathsList.pop(INDEX)
+		state = {
+			u'cancelled': False,
+			u'dialog': prep,
+			u'dirs': {},
+			u'count': 0,
+			}
 
-					insert_index = INDEX
-					for P in os.listdir(path):
-						pathsList.insert(insert_index, ConcatPaths((path, P)))
-						insert_index += 1
+		self.CollectState = state
 
-		try:
-			for P in pathsList:
-				if prep.WasCancelled():
-					prep.Destroy()
-					return False
+		Thread(self.CollectPaths, state, pathsList, self.chk_preserve_top.GetValue(),
+				self.chk_individuals.GetValue()).Start()
 
-				count += 1
-				if count >= update_interval:
-					wx.Yield()
-					prep.Pulse()
-					count = 0
+		return True
 
-				if not self.chk_individuals.GetValue() or os.path.isfile(P):
-					file_list.append(P)
-					continue
 
-				if os.path.isdir(P):
-					parent_dir = os.path.dirname(P)
+	## Handles event emitted by 'browse' button
+	#
+	#  Opens a directory dialog to select a custom output target
+	def OnBrowse(self, event=None):
+		dia = GetDirDialog(GetMainWindow(), GT(u'Choose Target Directory'))
+		if ShowDialog(dia):
+			self.ti_target.SetValue(dia.GetPath())
 
-					if parent_dir not in dir_list:
-						dir_list[parent_dir] = []
 
-					for ROOT, DIRS, FILES in os.walk(P):
-						if prep.WasCancelled():
-							prep.Destroy()
-							return False
+	## Handles event emitted by 'clear' button
+	#
+	#  Displays confirmation dialog to clear list if not empty
+	#
+	#  TODO: Rename to OnClearList?
+	def OnClearFileList(self, event=None):
+		if self.lst_files.GetItemCount():
+			if ConfirmationDialog(GetMainWindow(), GT(u'Confirm'),
+						GT(u'Clear all files?')).Confirmed():
+				self.lst_files.DeleteAllItems()
+
 
-						wx.Yield()
-						prep.SetMessage(GT(u'Scanning directory {} ...').format(ROOT))
+	## Adds files to list from file manager drop
+	#
+	#  Note that this method should not be renamed as 'OnDropFiles'
+	#  is the implicit handler for wx.FileDropTarget (<- correct class???)
+	#
+	#  \param fileList
+	#	<b><i>List</i></b> of files dropped from file manager
+	#  \return
+	#	Value of wizbin.files.Page.LoadPaths
+	def OnDropFiles(self, fileList):
+		return self.LoadPaths(fileList)
 
-						count += 1
-						if count >= update_interval:
-							wx.Yield()
-							prep.Pulse()
-							count = 0
 
-						for F in FILES:
-							if prep.WasCancelled():
-								prep.Destroy()
-								return False
+	## Merges a batch of files collected in background & adds them to list when done
+	#
+	#  \see wizbin.files.Page.CollectPaths
+	def OnFilesCollected(self, event=None):
+		if not event:
+			return
 
-							count += 1
-							if count >= update_interval:
-								wx.Yield()
-								prep.Pulse()
-								count = 0
+		state = event.state
 
-							# os.path.dirname preserves top level directory
-							ROOT = ROOT.replace(os.path.dirname(P), u'').strip(u'/')
-							F = u'{}/{}'.format(ROOT, F).strip(u'/')
+		# Collecting was cancelled or replaced
+		if state is not self.CollectState:
+			return
 
-							if F not in dir_list[parent_dir]:
-								dir_list[parent_dir].append(F)
+		dir_list = state[u'dirs']
 
-		except:
-			prep.Destroy()
+		if event.batch:
+			for D in event.batch:
+				if D not in dir_list:
+					dir_list[D] = set()
 
-			ShowErrorDialog(GT(u'Could not retrieve file list'), traceback.format_exc())
+				dir_list[D].update(event.batch[D])
+				state[u'count'] += len(event.batch[D])
 
-			return False
+		prep = state[u'dialog']
 
-		wx.Yield()
-		prep.Pulse(GT(u'Counting Files'))
+		if not event.done:
+			prep.Pulse(GT(u'Scanning files ({}) ...').format(state[u'count']))
 
-		file_count = len(file_list)
+		if prep.WasCancelled():
+			# Scanner thread exits on its own at next file or directory
+			self.CancelCollecting()
 
-		count = 0
-		for D in dir_list:
-			for F in dir_list[D]:
-				file_count += 1
+			return
 
-				count += 1
-				if count >= update_interval:
-					wx.Yield()
-					prep.Pulse()
-					count = 0
+		if not event.done:
+			return
 
+		self.CollectState = None
 		prep.Destroy()
 
-		# Add files to directory list
-		for F in file_list:
-			f_name = os.path.basename(F)
-			f_dir = os.path.dirname(F)
+		if event.error:
+			ShowErrorDialog(GT(u'Could not retrieve file list'), event.error)
 
-			if f_dir not in dir_list:
-				dir_list[f_dir] = []
+			return
 
-			dir_list[f_dir].append(f_name)
+		file_count = state[u'count']
 
 		if file_count > warning_threshhold:
 			count_warnmsg = GT(u'Importing {} files'.format(file_count))
@@ -569,43 +648,27 @@ class Page(WizardPage):
 			count_warnmsg = u'{}\n{}'.format(count_warnmsg, GT(u'Are you sure you want to continue?'))
 
 			if not ConfirmationDialog(GetMainWindow(), text=count_warnmsg).Confirmed():
-				return False
+				return
 
-		return self.AddPaths(dir_list, file_count, showDialog=file_count >= efficiency_threshold)
+		self.AddPaths(dir_list, file_count, showDialog=file_count >= efficiency_threshold)
 
 
-	## Handles event emitted by 'browse' button
+	## Shows files that were not found after project files are loaded
 	#
-	#  Opens a directory dialog to select a custom output target
-	def OnBrowse(self, event=None):
-		dia = GetDirDialog(GetMainWindow(), GT(u'Choose Target Directory'))
-		if ShowDialog(dia):
-			self.ti_target.SetValue(dia.GetPath())
+	#  \param missing_files
+	#	\b \e List of absolute paths of missing files
+	def OnFilesLoaded(self, missing_files):
+		for F in missing_files:
+			Logger.Warn(__name__, GT(u'File not found: {}').format(F))
 
+		Logger.Debug(__name__, u'Missing file count: {}'.format(len(missing_files)))
 
-	## Handles event emitted by 'clear' button
-	#
-	#  Displays confirmation dialog to clear list if not empty
-	#
-	#  TODO: Rename to OnClearList?
-	def OnClearFileList(self, event=None):
-		if self.lst_files.GetItemCount():
-			if ConfirmationDialog(GetMainWindow(), GT(u'Confirm'),
-						GT(u'Clear all files?')).Confirmed():
-				self.lst_files.DeleteAllItems()
-
-
-	## Adds files to list from file manager drop
-	#
-	#  Note that this method should not be renamed as 'OnDropFiles'
-	#  is the implicit handler for wx.FileDropTarget (<- correct class???)
-	#
-	#  \param fileList
-	#	<b><i>List</i></b> of files dropped from file manager
-	#  \return
-	#	Value of wizbin.files.Page.LoadPaths
-	def OnDropFiles(self, fileList):
-		return self.LoadPaths(fileList)
+		# If files are missing show a message
+		if missing_files:
+			alert = DetailedMessageDialog(GetMainWindow(), GT(u'Missing Files'),
+					ICON_EXCLAMATION, GT(u'Could not locate the following files:'),
+					u'\n'.join(missing_files))
+			alert.ShowModal()
 
 
 	## Handles files & directories added from ui.tree.DirectoryTreePanel object
@@ -617,14 +680,20 @@ class Page(WizardPage):
 		return self.LoadPaths(self.DirTree.GetSelectedPaths())
 
 
+	## Shows install paths found colliding after directories were indexed in background
+	def OnInstallCollisions(self, event=None):
+		if event:
+			self.ShowCollisions(event.collisions)
+
+
 	## Updates files' status in the file list
 	#
-	#  Refreshes files' executable & available status
+	#  Refreshes files' executable & available status in the background
 	#
 	#  \return
-	#	Value of self.lst_files.RefreshFileList
+	#	Value of self.lst_files.RefreshFileListBackground
 	def OnRefreshFileList(self, event=None):
-		return self.lst_files.RefreshFileList()
+		return self.lst_files.RefreshFileListBackground()
 
 
 	## Handles event emitted by 'remove' button
@@ -679,75 +748,37 @@ class Page(WizardPage):
 	#  \return
 	#	<b><i>True</i></b> if the data was imported correctly
 	def Set(self, data):
-		# Clear files list
-		self.lst_files.DeleteAllItems()
-		files_data = data.split(u'\n')
-		if int(files_data[0]):
-			# Get file count from list minus first item "1"
-			files_total = len(files_data)
-
-			# Store missing files here
-			missing_files = []
-
-			progress = None
-
-			if files_total >= efficiency_threshold:
-				progress = ProgressDialog(GetMainWindow(), GT(u'Adding Files'), maximum=files_total,
-						style=PD_DEFAULT_STYLE|wx.PD_CAN_ABORT)
-
-				wx.Yield()
-				progress.Show()
-
-			current_file = files_total
-			while current_file > 1:
-				if progress and progress.WasCancelled():
-					progress.Destroy()
-
-					# Project continues opening even if file import is cancelled
-					msg = (
-						GT(u'File import did not complete.'),
-						GT(u'Project files may be missing in file list.'),
-						)
+		return self.SetManifest(TextManifest(data))
 
-					ShowMessageDialog(u'\n'.join(msg), GT(u'Import Cancelled'))
 
-					return False
-
-				current_file -= 1
-				executable = False
-
-				file_info = files_data[current_file].split(u' -> ')
-				absolute_filename = file_info[0]
-
-				if absolute_filename[-1] == u'*':
-					# Set executable flag and remove "*"
-					executable = True
-					absolute_filename = absolute_filename[:-1]
-
-				filename = file_info[1]
-				source_dir = absolute_filename[:len(absolute_filename) - len(filename)]
-				target_dir = file_info[2]
-
-				if not self.lst_files.AddFile(filename, source_dir, target_dir, executable):
-					Logger.Warn(__name__, GT(u'File not found: {}').format(absolute_filename))
-					missing_files.append(absolute_filename)
-
-				if progress:
-					update_value = files_total - current_file
-
-					wx.Yield()
-					progress.Update(update_value+1, GT(u'Imported file {} of {}').format(update_value, files_total))
+	## Sets the file list from a project manifest
+	#
+	#  Files are added to the list by a background loader so the wizard
+	#  can be used while a project with many files is opened. The manifest
+	#  is parsed in batches as they are read. Missing files are reported
+	#  when loading finishes.
+	#
+	#  \param manifest
+	#	globals.projectfile.FileManifest instance
+	#  \return
+	#	<b><i>True</i></b> if the data was imported correctly
+	def SetManifest(self, manifest):
+		# Clear files list
+		self.lst_files.DeleteAllItems()
+		if manifest.IsEnabled():
+			Logger.Debug(__name__, u'Loading {} files in background'.format(len(manifest)))
 
-			if progress:
-				progress.Destroy()
+			# Files are added in reverse order of saved data
+			self.lst_files.LoadFilesBackground(manifest.Reversed(), self.OnFilesLoaded)
 
-			Logger.Debug(__name__, u'Missing file count: {}'.format(len(missing_files)))
+			return True
 
-			# If files are missing show a message
-			if missing_files:
-				alert = DetailedMessageDialog(GetMainWindow(), GT(u'Missing Files'),
-						ICON_EXCLAMATION, GT(u'Could not locate the following files:'),
-						u'\n'.join(missing_files))
-				alert.ShowModal()
 
-			return True
+	## Shows a dialog listing install paths that have more than one source
+	#
+	#  \param collisions
+	#	\b \e List of install paths
+	def ShowCollisions(self, collisions):
+		DetailedMessageDialog(GetMainWindow(), GT(u'Warning'), ICON_EXCLAMATION,
+				GT(u'More than one file will be installed to the following paths:'),
+				u'\n'.join(collisions)).ShowModal()
@@ -16,8 +16,11 @@ from globals.ident		import btnid
 from globals.ident		import chkid
 from globals.ident		import inputid
 from globals.ident		import pgid
+from globals.installpaths	import GetDirectoryEntries
 from globals.paths		import ConcatPaths
+from globals.projectfile	import ProjectSections
 from globals.strings	import TextIsEmpty
+from globals.threads	import Thread
 from globals.tooltips	import SetPageToolTips
 from input.filelist		import BasicFileList
 from input.markdown		import MarkdownDialog
@@ -118,6 +121,9 @@ class Page(WizardPage):
 		self.Executables = BasicFileList(pnl_autolink, size=(200, 200), hlExe=True,
 				name=u'al list')
 
+		## State of nested executables being read in background
+		self.ImportState = None
+
 		# Auto-Link import, generate and remove buttons
 		btn_al_import = CreateButton(pnl_autolink, btnid.IMPORT)
 		btn_al_remove = CreateButton(pnl_autolink, btnid.REMOVE)
@@ -247,7 +253,17 @@ class Page(WizardPage):
 		return u'<<SCRIPTS>>\n{}\n<</SCRIPTS>>'.format(u'\n'.join(data))
 
 
+	## Stops adding nested executables that are being read in background
+	def CancelImport(self):
+		if self.ImportState:
+			self.ImportState[u'cancelled'] = True
+			self.ImportState = None
+
+
 	## Imports executables from files page for Auto-Link
+	#
+	#  Executables inside listed directories are added when their contents
+	#  have been read in background.
 	def ImportExes(self, event=None):
 		event_id = event.GetId()
 		if event_id == btnid.IMPORT:
@@ -255,8 +271,15 @@ class Page(WizardPage):
 			self.Executables.Reset()
 
 			file_list = GetField(pgid.FILES, inputid.LIST)
+
+			# Project files may still be loading
+			file_list.FinishLoading()
+
 			exe_list = file_list.GetExecutables(False)
 
+			# Install paths of top-level executables
+			exe_targets = set()
+
 			for EXE in exe_list:
 				INDEX = file_list.GetIndex(EXE)
 
@@ -269,37 +292,24 @@ class Page(WizardPage):
 
 				self.Executables.Add(FileItem(file_name, ConcatPaths(file_target, file_name), ignore_timestamp=True))
 
-			# retrieve nested executables
-			# FIXME: symlinks may cause problems here
+				for SOURCE, INSTALL, REL in file_list.InstallIndex.GetEntries(EXE):
+					exe_targets.add(INSTALL)
+
+			# Contents of directories are read in background
+			directories = []
 			for FITEM in file_list.GetFileItems():
 				if FITEM.IsDirectory():
-					# recurse into subdirectories
-					toplevel = FITEM.GetPath()
-					for ROOT, DIRS, FILES in os.walk(toplevel):
-						for FILE in FILES:
-							fullpath = ConcatPaths(ROOT, FILE)
-							DIR = os.path.dirname(fullpath[len(toplevel):]).strip(u'/')
-							relpath = ConcatPaths(FITEM.GetBasename(), DIR, FILE).strip(u'/')
-
-							if os.path.isfile(fullpath) and os.access(fullpath, os.X_OK):
-								fulltarget = ConcatPaths(FITEM.GetTarget(), relpath)
-
-								# check if item is already added to list
-								duplicate = False
-								for EXE in exe_list:
-									existingtarget = ConcatPaths(EXE.GetTarget(), file_list.GetFilename(EXE))
-									if fulltarget == existingtarget:
-										duplicate = True
-										break
-
-								if duplicate:
-									Logger.Warn(__name__, u'Not adding executable with duplicate target: {}'.format(fulltarget))
-									continue
-
-								Logger.Debug(__name__, u'Adding nested executable: {}'.format(relpath))
-								self.Executables.Add(
-										FileItem(relpath, ConcatPaths(FITEM.GetTarget(), relpath),
-												ignore_timestamp=True))
+					directories.append((FITEM, FITEM.GetPath(), FITEM.GetTarget(),))
+
+			self.CancelImport()
+
+			if directories:
+				self.ImportState = {
+					u'cancelled': False,
+					u'targets': exe_targets,
+					}
+
+				Thread(self.ReadNestedExecutables, self.ImportState, directories).Start()
 
 		elif event_id in (btnid.REMOVE, wx.WXK_DELETE):
 			self.Executables.RemoveSelected()
@@ -431,6 +441,36 @@ class Page(WizardPage):
 		ShowDialog(al_help)
 
 
+	## Adds nested executables read in background to Auto-Link list
+	#
+	#  \param state
+	#	\b \e Dictionary state of the import
+	#  \param results
+	#	\b \e List of (FileItem, source, target, entries, executables) tuples
+	def OnNestedExecutablesRead(self, state, results):
+		# Page may have been destroyed before call
+		if not self or state is not self.ImportState or state[u'cancelled']:
+			return
+
+		self.ImportState = None
+
+		file_list = GetField(pgid.FILES, inputid.LIST)
+		exe_targets = state[u'targets']
+
+		for ITEM, SOURCE, TARGET, ENTRIES, EXECUTABLES in results:
+			# Directory contents may have changed since it was added to list
+			file_list.SetDirectoryEntries(ITEM, SOURCE, TARGET, ENTRIES)
+
+			for INSTALL, REL in EXECUTABLES:
+				# check if item is already added to list
+				if INSTALL in exe_targets:
+					Logger.Warn(__name__, u'Not adding executable with duplicate target: {}'.format(INSTALL))
+					continue
+
+				Logger.Debug(__name__, u'Adding nested executable: {}'.format(REL))
+				self.Executables.Add(FileItem(REL, INSTALL, ignore_timestamp=True))
+
+
 	## TODO: Doxygen
 	def OnToggleScripts(self, event=None):
 		Logger.Debug(__name__, u'Toggling scripts')
@@ -439,6 +479,34 @@ class Page(WizardPage):
 			DS.Enable(DS.IsChecked())
 
 
+	## Reads contents of directories & finds executables inside them
+	#
+	#  Called from background thread, must not access the interface.
+	#
+	#  \param state
+	#	\b \e Dictionary state of the import
+	#  \param directories
+	#	\b \e List of (FileItem, source, target) tuples of listed directories
+	def ReadNestedExecutables(self, state, directories):
+		results = []
+
+		# FIXME: symlinks may cause problems here
+		for ITEM, SOURCE, TARGET in directories:
+			if state[u'cancelled']:
+				return
+
+			entries = GetDirectoryEntries(SOURCE, TARGET)
+			executables = []
+
+			for S, INSTALL, REL in entries:
+				if os.path.isfile(S) and os.access(S, os.X_OK):
+					executables.append((INSTALL, REL,))
+
+			results.append((ITEM, SOURCE, TARGET, entries, executables,))
+
+		wx.CallAfter(self.OnNestedExecutablesRead, state, results)
+
+
 	## Resets all fields on page to default values
 	def Reset(self):
 		for DS, CHK, RB in self.script_objects:
@@ -450,6 +518,7 @@ class Page(WizardPage):
 		self.ScriptSelect(None)
 
 		self.ti_autolink.Reset()
+		self.CancelImport()
 		self.Executables.Reset()
 
 
@@ -475,20 +544,22 @@ class Page(WizardPage):
 		chk_prerm = self.script_objects[2][1]
 		chk_postrm = self.script_objects[3][1]
 
+		sections = ProjectSections(data)
+
 		preinst = (
-			data.split(u'<<PREINST>>\n')[1].split(u'\n<</PREINST>>')[0].split(u'\n'),
+			sections.Get(u'PREINST', u'0').split(u'\n'),
 			chk_preinst,
 			)
 		postinst = (
-			data.split(u'<<POSTINST>>\n')[1].split(u'\n<</POSTINST>>')[0].split(u'\n'),
+			sections.Get(u'POSTINST', u'0').split(u'\n'),
 			chk_postinst,
 			)
 		prerm = (
-			data.split(u'<<PRERM>>\n')[1].split(u'\n<</PRERM>>')[0].split(u'\n'),
+			sections.Get(u'PRERM', u'0').split(u'\n'),
 			chk_prerm,
 			)
 		postrm = (
-			data.split(u'<<POSTRM>>\n')[1].split(u'\n<</POSTRM>>')[0].split(u'\n'),
+			sections.Get(u'POSTRM', u'0').split(u'\n'),
 			chk_postrm,
 			)
 